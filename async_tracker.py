@@ -0,0 +1,880 @@
+#!/usr/bin/env python3
+"""
+Asyncio engine for GitHub Version Tracker.
+
+Provides AsyncGitHubVersionTracker, a coroutine-based sibling of
+GitHubVersionTracker that runs every GitHub, npm and PyPI request on a single
+event loop. A per-host semaphore bounds the number of in-flight requests, so
+thousands of requests across many users can be scheduled without a thread
+per request.
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional, Any, Tuple, Iterable, AsyncIterator
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from response_cache import ResponseCache, CachedResponse, make_cache_key
+from repo_state import RepoStateStore
+from registry_client import RegistryClient, RegistryBodyReader, REGISTRY_CHUNK_SIZE
+from rate_limiter import RateLimitScheduler, RateLimitExceeded, resource_for_url, MAX_RATE_LIMIT_RETRIES
+from transport import TransportPolicy, CircuitOpenError, classify_status
+from single_flight import SingleFlight, request_key
+from version_tracker import (
+    VersionTrackerBase,
+    ReleaseInfo,
+    PackageInfo,
+    RepoResult,
+    RepoFilter,
+    PYTHON_MANIFEST_FILES,
+    GITHUB_API_HOST,
+    GRAPHQL_URL,
+    GRAPHQL_BATCH_SIZE,
+    RELEASE_NOTES_LENGTH,
+    NDJSON_PACKAGE_BATCH,
+)
+
+# Async engine defaults
+DEFAULT_LIMIT_PER_HOST = 20  # Concurrent in-flight requests per host
+
+class AsyncGitHubVersionTracker(VersionTrackerBase):
+    """
+    Asyncio version of GitHubVersionTracker.
+    
+    Exposes the same methods as GitHubVersionTracker as coroutines and shares
+    its payload parsing and report rendering, so both engines produce
+    identical results.
+    
+    Attributes:
+        token (Optional[str]): GitHub personal access token for authentication
+        headers (dict): HTTP headers for GitHub API requests
+        limit_per_host (int): Maximum in-flight requests per host
+        backend (str): API backend used for release lookups ('rest' or 'graphql')
+        response_cache (Optional[ResponseCache]): ETag/Last-Modified cache for conditional requests
+        rate_limiter (RateLimitScheduler): Scheduler pacing requests by the remaining API budget
+        state_store (Optional[RepoStateStore]): Stored per-repository results for incremental refreshes
+        registry_client (RegistryClient): Deduplicating npm/PyPI metadata cache
+        transport (TransportPolicy): Timeouts, retries and per-host circuit breakers
+        single_flight (SingleFlight): Coalescing of identical in-flight GET requests
+        console (Console): Rich console for formatted output
+    
+    Example:
+        >>> async def run():
+        ...     async with AsyncGitHubVersionTracker(token="your_token") as tracker:
+        ...         await tracker.generate_report("fabriziosalmi", output_format="rich")
+        >>> asyncio.run(run())
+    """
+    
+    def __init__(self, token: Optional[str] = None,
+                 limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True,
+                 rate_limiter: Optional[RateLimitScheduler] = None,
+                 tokens: Optional[List[str]] = None,
+                 state_store: Optional[RepoStateStore] = None,
+                 registry_client: Optional[RegistryClient] = None,
+                 release_notes_length: Optional[int] = RELEASE_NOTES_LENGTH,
+                 transport: Optional[TransportPolicy] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 backend: str = 'rest'):
+        """
+        Initialize the async tracker.
+        
+        Args:
+            token: Optional GitHub personal access token for higher API rate limits.
+            limit_per_host: Maximum number of concurrent requests per host.
+            session: Optional aiohttp.ClientSession to share between trackers.
+                     When omitted a session is created on first use and closed
+                     by close().
+            response_cache: Optional ResponseCache to share between trackers.
+                            When omitted an in-memory cache is created.
+            use_cache: If False, disables conditional requests and caching.
+            rate_limiter: Optional RateLimitScheduler to share between trackers
+                          (including threaded ones). When omitted a scheduler
+                          is created.
+            tokens: Optional additional tokens rotated by remaining quota.
+            state_store: Optional RepoStateStore; unchanged repositories reuse
+                         their stored result (incremental refresh).
+            registry_client: Optional RegistryClient caching npm and PyPI
+                             lookups. When omitted a client is created.
+            release_notes_length: Characters of release notes kept per
+                                  release (None keeps them in full).
+            transport: Optional TransportPolicy to share between trackers
+                       (including threaded ones). When omitted a policy is
+                       created.
+            single_flight: Optional SingleFlight; concurrent identical GET
+                           requests share one in-flight request. When
+                           omitted one is created.
+            backend: 'rest' (default) or 'graphql'. The GraphQL backend fetches
+                     latest releases and repository metadata for up to 100
+                     repositories per query and requires a token.
+        """
+        super().__init__(token, tokens, release_notes_length)
+        
+        self.limit_per_host = max(1, limit_per_host)
+        self.backend = self._select_backend(backend)
+        self._session = session
+        self._owns_session = session is None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.response_cache = None
+        if use_cache:
+            self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimitScheduler()
+        self.state_store = state_store
+        self.registry_client = registry_client if registry_client is not None else RegistryClient()
+        self.transport = transport if transport is not None else TransportPolicy()
+        self.single_flight = single_flight if single_flight is not None else SingleFlight()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session, creating it inside the running event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    connect=self.transport.connect_timeout,
+                    sock_read=self.transport.read_timeout
+                )
+            )
+            self._owns_session = True
+        return self._session
+    
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent requests to the URL's host."""
+        host = urlsplit(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit_per_host)
+            self._semaphores[host] = semaphore
+        return semaphore
+    
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                   params: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        """
+        Perform a GET request and decode its JSON body.
+        
+        Args:
+            url: Absolute URL to fetch
+            headers: Optional request headers
+            params: Optional query string parameters
+        
+        Returns:
+            Tuple of (status code, decoded JSON body or None if status is not 200)
+        """
+        status, _, payload = await self._fetch(url, headers, params)
+        self._record_lookup(url, status)
+        return status, payload
+    
+    async def _fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                     params: Optional[Dict[str, Any]] = None,
+                     body_reader: Optional[RegistryBodyReader] = None) -> Tuple[int, Any, Any]:
+        """
+        Perform a GET request and decode its JSON body, keeping the response headers.
+        
+        Fresh cached responses are returned without a request; stale ones
+        are revalidated conditionally and on 304 Not Modified the cached
+        body is returned with a 200 status. Concurrent calls for the same URL
+        and credentials share one request; each decodes its own copy of the
+        body.
+        
+        Args:
+            url: Absolute URL to fetch
+            headers: Optional request headers
+            params: Optional query string parameters
+            body_reader: Optional reader for registry documents; the body is
+                         only read as far as needed and replaced (and cached)
+                         by its compact form
+        
+        Returns:
+            Tuple of (status code, response headers, decoded JSON body or
+            None if status is not 200)
+        """
+        cache_key = None
+        cached = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key(url, params, headers)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                if self.response_cache.is_fresh(url, cached):
+                    self.response_cache.record(hit=True)
+                    self.transport.metrics.record_cache_hit(url)
+                    return 200, cached.headers, json.loads(cached.body)
+                headers = {**(headers or {}), **cached.conditional_headers()}
+        
+        status, response_headers, body = await self.single_flight.do_async(
+            request_key(url, params, headers), lambda: self._send(url, headers, params, body_reader)
+        )
+        
+        if status == 304 and cached is not None:
+            self.response_cache.record(hit=True)
+            self.transport.metrics.record_cache_hit(url)
+            self.response_cache.refresh(cache_key, cached)
+            return 200, cached.headers, json.loads(cached.body)
+        
+        if self.response_cache is not None:
+            self.response_cache.record(hit=False)
+        
+        if status != 200:
+            return status, response_headers, None
+        
+        if cache_key is not None:
+            entry = CachedResponse.from_headers(body, response_headers)
+            if self.response_cache.should_store(url, entry):
+                self.response_cache.set(cache_key, entry)
+        
+        return status, response_headers, json.loads(body)
+    
+    async def _send(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    params: Optional[Dict[str, Any]] = None,
+                    body_reader: Optional[RegistryBodyReader] = None,
+                    method: str = 'GET', json_body: Optional[Any] = None) -> Tuple[int, Any, bytes]:
+        """
+        Send a request within the per-host limit, respecting GitHub rate limits.
+        
+        GitHub API requests are paced by the rate-limit scheduler, sent with
+        the pooled token that has the most remaining quota, and pause
+        (without blocking the event loop) when every token is exhausted or a
+        secondary rate limit is hit. Timeouts, retries and circuit breaking
+        apply to every request (see _request()).
+        
+        Args:
+            url: Absolute URL to fetch
+            headers: Optional request headers
+            params: Optional query string parameters
+            body_reader: Optional reader the body of a 200 response is streamed through
+            method: HTTP method
+            json_body: Optional JSON request body (e.g. a GraphQL query)
+        
+        Returns:
+            Tuple of (status code, response headers, raw body)
+        
+        Raises:
+            RateLimitExceeded: If the required pause exceeds the scheduler's max_wait
+            CircuitOpenError: If the host's circuit is open
+        """
+        session = self._get_session()
+        is_github = urlsplit(url).netloc == GITHUB_API_HOST
+        resource = resource_for_url(url)
+        
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            request_headers = headers
+            if is_github:
+                token_id, delay = self.rate_limiter.acquire(self.token_ids, resource)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                request_headers = self._with_token(token_id, headers)
+            
+            status, response_headers, body = await self._request(
+                session, url, request_headers, params, body_reader, retry_rate_limited=not is_github,
+                method=method, json_body=json_body
+            )
+            
+            if not is_github:
+                break
+            
+            text = body.decode('utf-8', 'replace') if status in (403, 429) else ''
+            wait = self.rate_limiter.update(token_id, resource, status, response_headers, text)
+            if wait is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            
+            self._message_console().print(f"[yellow]GitHub rate limit reached, pausing {wait:.0f}s...[/yellow]")
+            await asyncio.sleep(wait)
+        
+        return status, response_headers, body
+    
+    async def _request(self, session: aiohttp.ClientSession, url: str,
+                       headers: Optional[Dict[str, str]], params: Optional[Dict[str, Any]],
+                       body_reader: Optional[RegistryBodyReader],
+                       retry_rate_limited: bool = True, method: str = 'GET',
+                       json_body: Optional[Any] = None) -> Tuple[int, Any, bytes]:
+        """
+        Send a request under the transport policy (see GitHubVersionTracker._request()).
+        
+        Returns:
+            Tuple of (status code, response headers, raw body)
+        
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            aiohttp.ClientError: If the last attempt failed to connect
+            asyncio.TimeoutError: If the last attempt timed out
+        """
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        
+        attempt = 0
+        while True:
+            self.transport.before_request(host)
+            status, response_headers, body, error = 0, None, b'', None
+            size, start = 0, None
+            try:
+                async with self._host_semaphore(url):
+                    # Time spent waiting for the per-host limit is not latency
+                    start = loop.time()
+                    async with session.request(method, url, headers=headers, params=params,
+                                               json=json_body) as response:
+                        status, response_headers = response.status, response.headers
+                        if body_reader is not None and status == 200:
+                            # Stop downloading once the reader has what it needs
+                            body_reader.reset()
+                            async for chunk in response.content.iter_chunked(REGISTRY_CHUNK_SIZE):
+                                size += len(chunk)
+                                if body_reader.feed(chunk):
+                                    break
+                            body = body_reader.body()
+                        else:
+                            body = await response.read()
+                            size = len(body)
+                outcome = classify_status(status)
+            except asyncio.TimeoutError as e:
+                error, outcome = e, 'timeout'
+            except aiohttp.ClientError as e:
+                error, outcome = e, 'connection_error'
+            except BaseException:
+                # Cancelled or failed while reading: free the circuit's probe slot
+                self.transport.abandon_request(host)
+                raise
+            
+            if start is not None:
+                latency = loop.time() - start
+                self.transport.metrics.record_request(url, str(status) if error is None else outcome, latency, size)
+            
+            retry_after = response_headers.get('Retry-After') if response_headers is not None else None
+            delay = self.transport.after_request(host, method, outcome, attempt, retry_after, retry_rate_limited)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return status, response_headers, body
+            
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _post(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    json_body: Optional[Any] = None) -> Tuple[int, Any]:
+        """
+        Perform an uncached POST request and decode its JSON body.
+        
+        Args:
+            url: Absolute URL to post to
+            headers: Optional request headers
+            json_body: JSON request body
+        
+        Returns:
+            Tuple of (status code, decoded JSON body or None if status is not 200)
+        """
+        status, _, body = await self._send(url, headers, method='POST', json_body=json_body)
+        return status, json.loads(body) if status == 200 else None
+    
+    async def close(self) -> None:
+        """Close the HTTP session if it is owned by this tracker, the response cache and the state store."""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+        self._session = None
+        if self.response_cache is not None:
+            self.response_cache.close()
+        if self.state_store is not None:
+            self.state_store.close()
+    
+    async def __aenter__(self) -> 'AsyncGitHubVersionTracker':
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def get_user_repos(self, username: str, include_forks: bool = False,
+                             repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """
+        Get all repositories for a GitHub user.
+        
+        Args:
+            username: GitHub username to fetch repositories for
+            include_forks: If True, includes forked repositories. Default is False.
+            repo_filter: Optional RepoFilter dropping archived, empty or
+                         inactive repositories from the listing.
+        
+        Returns:
+            List of repository dictionaries. Returns empty list if user not
+            found or on error.
+        """
+        url = f"https://api.github.com/users/{username}/repos"
+        return await self._list_repos(url, include_forks, repo_filter)
+    
+    async def get_org_repos(self, org: str, include_forks: bool = False, repo_type: Optional[str] = None,
+                            repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """
+        Get all repositories of a GitHub organization (see GitHubVersionTracker.get_org_repos()).
+        
+        Args:
+            org: Organization login
+            include_forks: If True, includes forked repositories. Default is False.
+            repo_type: Optional type= filter, one of ORG_REPO_TYPES
+            repo_filter: Optional RepoFilter dropping archived, empty or
+                         inactive repositories from the listing.
+        
+        Returns:
+            List of repository dictionaries. Returns empty list if the
+            organization is not found or on error.
+        """
+        url = f"https://api.github.com/orgs/{org}/repos"
+        return await self._list_repos(url, include_forks, repo_filter, self._org_repo_type(include_forks, repo_type))
+    
+    async def _account_repos(self, account: str, include_forks: bool = False, org: bool = False,
+                             repo_type: Optional[str] = None,
+                             repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """List the repositories of a report's user or organization."""
+        if org:
+            return await self.get_org_repos(account, include_forks, repo_type, repo_filter)
+        return await self.get_user_repos(account, include_forks, repo_filter)
+    
+    async def _list_repos(self, url: str, include_forks: bool, repo_filter: Optional[RepoFilter] = None,
+                          repo_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a repository listing.
+        
+        The pages after the first (known from its Link header) are fetched
+        concurrently and concatenated in page order. If a page fails, the
+        pages before it are returned.
+        """
+        first_page = await self._fetch_repo_page(url, 1, include_forks, repo_filter, repo_type)
+        if first_page is None:
+            return []
+        
+        page_repos, last_page = first_page
+        repos = list(page_repos)
+        
+        pages = await asyncio.gather(
+            *(self._fetch_repo_page(url, page, include_forks, repo_filter, repo_type)
+              for page in range(2, last_page + 1))
+        )
+        for result in pages:
+            if result is None:
+                break
+            repos.extend(result[0])
+        
+        return repos
+    
+    async def _fetch_repo_page(self, url: str, page: int, include_forks: bool,
+                               repo_filter: Optional[RepoFilter] = None,
+                               repo_type: Optional[str] = None) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Fetch one listing page; returns (repositories, last page number) or None on error."""
+        try:
+            status, headers, page_repos = await self._fetch(url, headers=self.headers,
+                                                            params=self._repo_page_params(page, repo_type))
+        except (RateLimitExceeded, CircuitOpenError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._message_console().print(f"[red]Error fetching repositories: {e}[/red]")
+            return None
+        
+        if status != 200:
+            self._message_console().print(f"[red]Error fetching repositories: {status}[/red]")
+            return None
+        
+        return self._listing_repos(page_repos, include_forks, repo_filter), self._last_page(headers.get('Link'))
+    
+    async def get_latest_release(self, repo_owner: str, repo_name: str,
+                                 repo_meta: Optional[Dict[str, Any]] = None) -> Optional[ReleaseInfo]:
+        """
+        Get the latest release information for a repository.
+        
+        Args:
+            repo_owner: Repository owner's GitHub username
+            repo_name: Name of the repository
+            repo_meta: Optional repository dictionary already known to the caller;
+                       when given, the /repos/{owner}/{repo} request is skipped.
+        
+        Returns:
+            ReleaseInfo object, or None if no release exists.
+        """
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        
+        status, release_data = await self._get(url, headers=self.headers)
+        
+        if status != 200:
+            return None
+        
+        # Get repository info, unless the caller already has it
+        if repo_meta is not None:
+            repo_info = repo_meta
+        else:
+            repo_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+            _, repo_info = await self._get(repo_url, headers=self.headers)
+        
+        return self._build_release_info(repo_owner, repo_name, release_data, repo_info or {})
+    
+    async def get_latest_releases(self, repos: List[Dict[str, Any]]) -> Dict[str, Optional[ReleaseInfo]]:
+        """
+        Get latest releases for many repositories using batched GraphQL queries.
+        
+        Batches of up to GRAPHQL_BATCH_SIZE repositories are queried
+        concurrently (see GitHubVersionTracker.get_latest_releases()).
+        
+        Returns:
+            Dictionary mapping "owner/name" to ReleaseInfo (or None when the
+            repository has no release). Repositories from batches that failed
+            are omitted so callers can fall back to get_latest_release().
+        """
+        repo_names = [(repo['owner']['login'], repo['name']) for repo in repos]
+        
+        async def fetch(batch: List[Tuple[str, str]]) -> Dict[str, Optional[ReleaseInfo]]:
+            query, variables = self._build_graphql_release_query(batch)
+            status, payload = await self._post(GRAPHQL_URL, headers=self.headers,
+                                               json_body={'query': query, 'variables': variables})
+            
+            if status != 200:
+                self._message_console().print(f"[yellow]GraphQL batch failed ({status}), using REST fallback.[/yellow]")
+                return {}
+            
+            data = payload.get('data') or {}
+            # Repositories that are not accessible are left to REST
+            return {
+                f"{repo_owner}/{repo_name}": self._graphql_release_info(repo_owner, repo_name, data[f"r{index}"])
+                for index, (repo_owner, repo_name) in enumerate(batch)
+                if data.get(f"r{index}") is not None
+            }
+        
+        batches = await asyncio.gather(*(
+            fetch(repo_names[start:start + GRAPHQL_BATCH_SIZE])
+            for start in range(0, len(repo_names), GRAPHQL_BATCH_SIZE)
+        ))
+        return {name: release for batch in batches for name, release in batch.items()}
+    
+    async def get_release_notes(self, repo_owner: str, repo_name: str) -> Optional[str]:
+        """
+        Get the full notes of a repository's latest release.
+        
+        Returns:
+            Release notes (markdown), or None if the repository has no release
+        """
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        
+        status, release_data = await self._get(url, headers=self.headers)
+        
+        if status != 200:
+            return None
+        
+        return release_data.get('body') or ''
+    
+    async def get_packages(self, repo_owner: str, repo_name: str,
+                           repo_meta: Optional[Dict[str, Any]] = None,
+                           root_files: Optional[Iterable[str]] = None) -> List[PackageInfo]:
+        """
+        Get published packages for a repository.
+        
+        The repository root is listed with a single git tree request, then
+        the manifests present in it are fetched concurrently.
+        
+        Args:
+            repo_owner: Repository owner's GitHub username
+            repo_name: Name of the repository
+            repo_meta: Optional repository dictionary from get_user_repos()
+            root_files: Optional file names in the repository root, if already known
+        
+        Returns:
+            List of PackageInfo objects for detected packages.
+        """
+        base_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents"
+        
+        if root_files is None:
+            status, tree = await self._get(self._tree_url(repo_owner, repo_name, repo_meta), headers=self.headers)
+            manifest_files = self._manifest_files(self._root_files(status, tree))
+        else:
+            manifest_files = self._manifest_files(set(root_files))
+        
+        # Fetch the present manifests concurrently
+        responses = await asyncio.gather(
+            *(self._get(f"{base_url}/{file}", headers=self.headers) for file in manifest_files)
+        )
+        manifests = dict(zip(manifest_files, responses))
+        
+        packages = []
+        
+        # Check for npm packages
+        status, payload = manifests.get('package.json', (None, None))
+        if status == 200:
+            try:
+                package_name = self._extract_package_name('package.json', self._decode_content(payload))
+                
+                if package_name:
+                    npm_data = await self._registry_lookup('npm', package_name)
+                    
+                    if npm_data is not None:
+                        packages.append(self._npm_package_info(repo_owner, repo_name, package_name, npm_data))
+            except Exception:
+                pass
+        
+        # Check for Python packages (first manifest found wins)
+        for file in PYTHON_MANIFEST_FILES:
+            status, payload = manifests.get(file, (None, None))
+            if status != 200:
+                continue
+            
+            try:
+                package_name = self._extract_package_name(file, self._decode_content(payload))
+                pypi_data = None
+                
+                if package_name:
+                    pypi_data = await self._registry_lookup('pypi', package_name)
+                
+                packages.append(self._python_package_info(repo_owner, repo_name, package_name, pypi_data))
+            except Exception:
+                # Fallback on any error
+                packages.append(self._python_package_info(repo_owner, repo_name))
+            break
+        
+        return packages
+    
+    async def _registry_lookup(self, ecosystem: str, package_name: str) -> Optional[Dict[str, Any]]:
+        """Look up package metadata through the deduplicating registry client (see GitHubVersionTracker)."""
+        async def fetch(url: str) -> Tuple[int, Any]:
+            status, _, payload = await self._fetch(url, body_reader=RegistryBodyReader(ecosystem))
+            return status, payload
+        
+        try:
+            metadata = await self.registry_client.lookup_async(ecosystem, package_name, fetch)
+        except Exception:
+            self._mark_incomplete(self.registry_client.url_for(ecosystem, package_name))
+            raise
+        
+        self._check_registry_answer(ecosystem, package_name, metadata)
+        return metadata
+    
+    async def fill_package_downloads(self, packages: List[PackageInfo]) -> None:
+        """Fill in the download counts of packages in one batched pass (see GitHubVersionTracker)."""
+        targets = self._download_targets(packages)
+        published = [target for target in targets if target is not None]
+        if not published:
+            return
+        
+        async def fetch(url: str) -> Tuple[int, Any]:
+            try:
+                return await self._get(url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError):
+                return 0, None
+        
+        counts = await self.registry_client.download_counts_async(published, fetch)
+        self._apply_downloads(packages, targets, counts)
+    
+    async def process_repo(self, repo: Dict[str, Any],
+                           prefetched_releases: Optional[Dict[str, Optional[ReleaseInfo]]] = None
+                           ) -> Tuple[Optional[ReleaseInfo], List[PackageInfo]]:
+        """
+        Get the latest release and published packages for a single repository.
+        
+        Errors are isolated to the repository and reported as an empty result.
+        Results whose GitHub answers were all definitive are saved to the
+        state store, if one is set.
+        
+        Args:
+            repo: Repository dictionary as returned by get_user_repos()
+            prefetched_releases: Optional releases from get_latest_releases();
+                                 the REST lookup is skipped for repositories
+                                 found in it.
+        
+        Returns:
+            Tuple of (ReleaseInfo or None, list of PackageInfo)
+        """
+        repo_owner = repo['owner']['login']
+        repo_name = repo['name']
+        full_name = f"{repo_owner}/{repo_name}"
+        
+        try:
+            # gather() copies this task's context, so both lookups report to the same list
+            with self._tracking_lookups() as incomplete:
+                if prefetched_releases and full_name in prefetched_releases:
+                    release = prefetched_releases[full_name]
+                    packages = await self.get_packages(repo_owner, repo_name, repo_meta=repo)
+                else:
+                    release, packages = await asyncio.gather(
+                        self.get_latest_release(repo_owner, repo_name, repo_meta=repo),
+                        self.get_packages(repo_owner, repo_name, repo_meta=repo)
+                    )
+        except Exception as e:
+            self._message_console().print(f"[yellow]Skipping {repo_owner}/{repo_name}: {e}[/yellow]")
+            return None, []
+        
+        if self.state_store is not None and not incomplete:
+            self.state_store.save(repo, self._state_record(release, packages))
+        
+        return release, packages
+    
+    async def process_repos(self, repos: List[Dict[str, Any]]) -> List[Tuple[Optional[ReleaseInfo], List[PackageInfo]]]:
+        """
+        Process all repositories concurrently.
+        
+        Concurrency is bounded by the per-host semaphores, not by the number
+        of repositories. Results are returned in input order.
+        """
+        return [(result.release, result.packages) async for result in self.iter_process_repos(repos, ordered=True)]
+    
+    async def iter_process_repos(self, repos: List[Dict[str, Any]],
+                                 ordered: bool = False) -> AsyncIterator[RepoResult]:
+        """
+        Process all repositories concurrently, yielding each result as it is ready.
+        
+        With a state store, unchanged repositories reuse their stored result.
+        With the GraphQL backend, releases of the others are prefetched in
+        batches first.
+        
+        Args:
+            repos: Repository dictionaries as returned by get_user_repos()
+            ordered: If True, results are yielded in input order; otherwise
+                     in completion order.
+        
+        Yields:
+            RepoResult for every repository
+        """
+        stored = {}
+        if self.state_store is not None:
+            for index, repo in enumerate(repos):
+                record = self.state_store.lookup(repo)
+                if record is not None:
+                    stored[index] = record
+        
+        prefetched_releases = None
+        changed = [repo for index, repo in enumerate(repos) if index not in stored]
+        if self.backend == 'graphql' and changed:
+            prefetched_releases = await self.get_latest_releases(changed)
+        
+        async def process(index: int, repo: Dict[str, Any]) -> RepoResult:
+            if index in stored:
+                release, packages = self._result_from_state(repo, stored[index])
+            else:
+                release, packages = await self.process_repo(repo, prefetched_releases)
+            return self._repo_result(index, repo, release, packages)
+        
+        tasks = [asyncio.ensure_future(process(index, repo)) for index, repo in enumerate(repos)]
+        pending = set(tasks)
+        try:
+            if ordered:
+                for task in tasks:
+                    yield await task
+            else:
+                # Only unfinished tasks are kept, so yielded results can be freed
+                tasks.clear()
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+        finally:
+            # Stop outstanding work if the consumer stops early
+            for task in pending:
+                task.cancel()
+    
+    async def iter_repo_results(self, username: str, include_forks: bool = False,
+                                ordered: bool = False, org: bool = False, repo_type: Optional[str] = None,
+                                repo_filter: Optional[RepoFilter] = None) -> AsyncIterator[RepoResult]:
+        """
+        Stream the release and packages of every repository of a user or organization.
+        
+        Takes the same arguments as GitHubVersionTracker.iter_repo_results().
+        
+        Example:
+            >>> async for result in tracker.iter_repo_results("fabriziosalmi"):
+            ...     print(result.repo_name, result.release)
+        """
+        repos = await self._account_repos(username, include_forks, org, repo_type, repo_filter)
+        async for result in self.iter_process_repos(repos, ordered=ordered):
+            yield result
+    
+    async def collect_report_data(self, repos: List[Dict[str, Any]]) -> Tuple[List[ReleaseInfo], List[PackageInfo]]:
+        """
+        Collect releases and packages for a list of repositories.
+        
+        Returns:
+            Tuple of (releases, packages) in repository order, with package
+            download counts filled in
+        """
+        releases, packages = self._collect_results(
+            [result async for result in self.iter_process_repos(repos, ordered=True)]
+        )
+        await self.fill_package_downloads(packages)
+        return releases, packages
+    
+    async def collect_users(self, usernames: List[str], include_forks: bool = False
+                            ) -> Dict[str, Tuple[List[Dict[str, Any]], List[ReleaseInfo], List[PackageInfo]]]:
+        """
+        Collect repositories, releases and packages for many users at once.
+        
+        All users share the same event loop and per-host limits. A failure
+        for one user does not affect the others; failed users are omitted
+        from the result.
+        
+        Args:
+            usernames: GitHub usernames to analyze
+            include_forks: If True, includes forked repositories
+        
+        Returns:
+            Dictionary mapping username to (repos, releases, packages)
+        """
+        async def collect(username: str):
+            repos = await self.get_user_repos(username, include_forks)
+            releases, packages = await self.collect_report_data(repos)
+            return repos, releases, packages
+        
+        results = await asyncio.gather(*(collect(u) for u in usernames), return_exceptions=True)
+        
+        collected = {}
+        for username, result in zip(usernames, results):
+            if isinstance(result, Exception):
+                self._message_console().print(f"[red]Error analyzing {username}: {result}[/red]")
+                continue
+            collected[username] = result
+        
+        return collected
+    
+    async def _stream_ndjson_report(self, results: AsyncIterator[RepoResult]) -> None:
+        """Display report as newline-delimited JSON while results arrive (see GitHubVersionTracker)."""
+        pending: List[PackageInfo] = []
+        summary = self._ndjson_summary()
+        
+        async for result in results:
+            self._write_ndjson_release(result.release, summary)
+            pending.extend(result.packages)
+            if len(pending) >= NDJSON_PACKAGE_BATCH:
+                await self.fill_package_downloads(pending)
+                self._write_ndjson_packages(pending, summary)
+        
+        if pending:
+            await self.fill_package_downloads(pending)
+            self._write_ndjson_packages(pending, summary)
+        
+        self._write_ndjson_summary(summary)
+    
+    async def generate_report(self, username: str, include_forks: bool = False, output_format: str = 'table',
+                              org: bool = False, repo_type: Optional[str] = None,
+                              repo_filter: Optional[RepoFilter] = None) -> None:
+        """
+        Generate and display a comprehensive version report.
+        
+        Args:
+            username: GitHub username (or organization, with org=True) to analyze
+            include_forks: If True, includes forked repositories. Default is False.
+            output_format: Output format - 'rich', 'table', 'json' or 'ndjson'. Default is 'table'.
+                          NDJSON lines are written as tasks finish; the other
+                          formats are rendered once every result is in.
+            org: If True, lists the repositories of the organization username.
+            repo_type: Optional type= filter of organization listings.
+            repo_filter: Optional RepoFilter skipping archived, empty or
+                         inactive repositories before they are processed.
+        """
+        console = self._report_console(output_format)
+        console.print(f"[bold blue]Fetching repositories for {username}...[/bold blue]")
+        
+        repos = await self._account_repos(username, include_forks, org, repo_type, repo_filter)
+        
+        if not repos:
+            console.print("[red]No repositories found or error occurred.[/red]")
+            return
+        
+        console.print(f"[green]Found {len(repos)} repositories. Checking for releases...[/green]")
+        
+        if output_format == 'ndjson':
+            # Written as tasks finish, like the threaded engine
+            await self._stream_ndjson_report(self.iter_process_repos(repos))
+            return
+        
+        results = [result async for result in self.iter_process_repos(repos, ordered=True)]
+        await self.fill_package_downloads([package for result in results for package in result.packages])
+        
+        # Display results
+        self._render_report(results, username, output_format, total=len(repos))
@@ -5,18 +5,66 @@ Advanced example showing batch processing and custom reporting.
 
 import os
 import json
+import asyncio
 from datetime import datetime
 from version_tracker import GitHubVersionTracker
+from response_cache import SQLiteResponseCache, DEFAULT_CACHE_DIR
+from rate_limiter import load_tokens
 
-def analyze_multiple_users(usernames: list, output_dir: str = "reports"):
-    """Analyze multiple GitHub users and save individual reports."""
+def collect_users_async(usernames: list, tokens: list = None, cache_dir: str = DEFAULT_CACHE_DIR) -> dict:
+    """
+    Collect data for all users concurrently with the asyncio engine.
+    
+    Every request for every user is scheduled on one event loop, bounded
+    only by the per-host limits of AsyncGitHubVersionTracker.
+    
+    Returns:
+        Dictionary mapping username to (repository count, releases, packages);
+        the repository listings themselves are not kept
+    """
+    # Imported here so the default engine does not require aiohttp
+    from async_tracker import AsyncGitHubVersionTracker
+    
+    async def collect():
+        async with AsyncGitHubVersionTracker(response_cache=SQLiteResponseCache(cache_dir), tokens=tokens) as tracker:
+            collected = await tracker.collect_users(usernames, include_forks=False)
+            return {
+                username: (len(repos), releases, packages)
+                for username, (repos, releases, packages) in collected.items()
+            }
+    
+    return asyncio.run(collect())
+
+def analyze_multiple_users(usernames: list, output_dir: str = "reports",
+                           tracker: GitHubVersionTracker = None, engine: str = "threads"):
+    """
+    Analyze multiple GitHub users and save individual reports.
+    
+    All users are analyzed with a single tracker so its pooled keep-alive
+    connections are reused for the whole batch. Pass an existing tracker
+    to share its connection pool with other callers.
+    
+    Args:
+        usernames: GitHub usernames to analyze
+        output_dir: Directory where reports are written
+        tracker: Optional GitHubVersionTracker to reuse ("threads" engine)
+        engine: "threads" processes users one after another with a thread
+                pool per user; "async" fetches all users concurrently on a
+                single event loop (recommended for large batches)
+    """
     
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
-    # Get GitHub token
-    token = os.getenv('GITHUB_TOKEN')
-    tracker = GitHubVersionTracker(token)
+    # Get GitHub tokens (GITHUB_TOKENS pool and/or GITHUB_TOKEN) and the cache location
+    tokens = load_tokens()
+    cache_dir = os.getenv('VERSION_TRACKER_CACHE_DIR', DEFAULT_CACHE_DIR)
+    
+    if engine == "async":
+        print(f"⚡ Fetching {len(usernames)} users concurrently (async engine)...")
+        collected = collect_users_async(usernames, tokens, cache_dir)
+    elif tracker is None:
+        tracker = GitHubVersionTracker(response_cache=SQLiteResponseCache(cache_dir), tokens=tokens)
     
     all_reports = {}
     
@@ -24,34 +72,30 @@ def analyze_multiple_users(usernames: list, output_dir: str = "reports"):
         print(f"\n🔍 Analyzing {username}...")
         
         try:
-            # Get repositories
-            repos = tracker.get_user_repos(username, include_forks=False)
-            
-            releases = []
-            packages = []
-            
-            for repo in repos:
-                repo_owner = repo['owner']['login']
-                repo_name = repo['name']
-                
-                # Get latest release
-                release = tracker.get_latest_release(repo_owner, repo_name)
-                if release:
-                    releases.append(release)
+            if engine == "async":
+                if username not in collected:
+                    raise RuntimeError("no data collected")
+                repo_count, releases, packages = collected[username]
+            else:
+                # Get repositories
+                repos = tracker.get_user_repos(username, include_forks=False)
                 
-                # Get packages
-                repo_packages = tracker.get_packages(repo_owner, repo_name)
-                packages.extend(repo_packages)
+                # Get releases and packages (processed concurrently), then
+                # drop the listing: only its size is reported
+                releases, packages = tracker.collect_report_data(repos)
+                repo_count = len(repos)
+                del repos
             
             # Create report data
             report_data = {
                 "username": username,
                 "generated_at": datetime.now().isoformat(),
                 "summary": {
-                    "total_repositories": len(repos),
+                    "total_repositories": repo_count,
                     "total_releases": len(releases),
                     "total_packages": len(packages),
                     "total_downloads": sum(r.download_count for r in releases),
+                    "total_package_downloads": sum(p.downloads for p in packages),
                     "total_stars": sum(r.stars for r in releases),
                     "total_forks": sum(r.forks for r in releases),
                     "most_popular_language": get_most_popular_language(releases),
@@ -90,7 +134,7 @@ def analyze_multiple_users(usernames: list, output_dir: str = "reports"):
                 json.dump(report_data, f, indent=2)
             
             print(f"✅ Report saved: {filename}")
-            print(f"   Repositories: {len(repos)}, Releases: {len(releases)}, Packages: {len(packages)}")
+            print(f"   Repositories: {repo_count}, Releases: {len(releases)}, Packages: {len(packages)}")
             
         except Exception as e:
             print(f"❌ Error analyzing {username}: {e}")
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks of GitHub Version Tracker against the fake server.
+
+Runs the report paths users hit (generate_report() on the threaded and
+asyncio engines, the web app's get_github_stats() and the batch analyzer's
+analyze_multiple_users()) against synthetic accounts served by
+fake_server.py, so no network access or API quota is needed. Each run
+starts cold (fresh tracker and caches) and reports wall time, requests sent,
+bytes transferred and peak Python memory (tracemalloc).
+
+Results can be saved and compared against a baseline to catch performance
+regressions:
+
+    $ python benchmark.py --sizes 10,100,1000 --save baseline.json
+    $ python benchmark.py --sizes 10,100,1000 --compare baseline.json
+
+--startup instead checks the CLI start-up cost with `python -X importtime`:
+the import time of version_tracker against a budget, and that the renderers'
+dependencies (rich, tabulate) are not imported up front.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import redirect_stdout
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Callable
+
+import click
+import requests
+from tabulate import tabulate
+
+from fake_server import fake_session, FakeServerClientSession
+from version_tracker import GitHubVersionTracker, DEFAULT_MAX_WORKERS, slotted
+
+# Benchmark defaults
+DEFAULT_SIZES = '10,100,1000'  # Repositories of the synthetic accounts (up to 10,000 with --sizes)
+DEFAULT_TOLERANCE = 0.25  # Relative increase of a metric reported as a regression
+MIN_WALL_TIME_DELTA = 0.1  # Wall time differences below this are noise (seconds)
+SERVER_START_TIMEOUT = 10  # Seconds to wait for the fake server to start
+
+SCENARIOS = ('report-threads', 'report-async', 'web', 'batch')
+
+# Start-up check (--startup)
+STARTUP_MODULE = 'version_tracker'  # Module imported by every CLI run
+IMPORT_TIME_BUDGET_MS = 400  # Median import time allowed (milliseconds)
+IMPORT_TIME_RUNS = 5  # Interpreter starts measured; the median is reported
+LAZY_MODULES = ('rich', 'tabulate', 'asyncio')  # Only imported by the code paths that use them
+
+# Metrics compared against a baseline
+COMPARED_METRICS = ('wall_time', 'requests', 'bytes_transferred', 'peak_memory')
+
+@slotted
+@dataclass
+class BenchmarkResult:
+    """Measurements of one scenario run."""
+    scenario: str
+    repos: int
+    wall_time: float
+    requests: int
+    bytes_transferred: int
+    peak_memory: int
+    errors: int
+
+def start_server(latency: float, error_rate: float, rate_limit: int) -> subprocess.Popen:
+    """
+    Start fake_server.py in a subprocess, so its memory is not measured.
+    
+    Args:
+        latency: Seconds added to every response
+        error_rate: Fraction of requests answered with 502
+        rate_limit: GitHub requests allowed per rate-limit window
+    
+    Returns:
+        Server process; its first output line is the server URL
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_server.py')
+    return subprocess.Popen(
+        [sys.executable, script, '--port', '0', '--latency', str(latency),
+         '--error-rate', str(error_rate), '--rate-limit', str(rate_limit)],
+        stdout=subprocess.PIPE, text=True
+    )
+
+def server_stats(server_url: str, reset: bool = False) -> Dict[str, Any]:
+    """Return (or reset) the request counters of the fake server."""
+    if reset:
+        requests.post(f"{server_url}/_fake/reset", timeout=SERVER_START_TIMEOUT)
+        return {}
+    return requests.get(f"{server_url}/_fake/stats", timeout=SERVER_START_TIMEOUT).json()
+
+def _report_threads(server_url: str, username: str, jobs: int, workdir: str) -> None:
+    with GitHubVersionTracker(session=fake_session(server_url), max_workers=jobs) as tracker:
+        tracker.generate_report(username, output_format='json')
+
+def _report_async(server_url: str, username: str, jobs: int, workdir: str) -> None:
+    # Imported here so the threaded scenarios do not require aiohttp
+    from async_tracker import AsyncGitHubVersionTracker
+    
+    async def run():
+        # The tracker does not close sessions it was given
+        session = FakeServerClientSession(server_url)
+        try:
+            async with AsyncGitHubVersionTracker(session=session) as tracker:
+                await tracker.generate_report(username, output_format='json')
+        finally:
+            await session.close()
+    
+    asyncio.run(run())
+
+def _web(server_url: str, username: str, jobs: int, workdir: str) -> None:
+    # The web app builds its trackers itself: give them a fresh cache
+    # directory and route the session of this run's tracker to the server
+    os.environ['VERSION_TRACKER_CACHE_DIR'] = workdir
+    import web_app
+    
+    token = f"benchmark-{uuid.uuid4().hex}"
+    tracker = web_app.get_tracker(token)
+    tracker.session = fake_session(server_url)
+    web_app.get_github_stats(username, token)
+
+def _batch(server_url: str, username: str, jobs: int, workdir: str) -> None:
+    from batch_analyzer import analyze_multiple_users
+    
+    with GitHubVersionTracker(session=fake_session(server_url), max_workers=jobs) as tracker:
+        analyze_multiple_users([username], output_dir=workdir, tracker=tracker)
+
+SCENARIO_RUNNERS: Dict[str, Callable[[str, str, int, str], None]] = {
+    'report-threads': _report_threads,
+    'report-async': _report_async,
+    'web': _web,
+    'batch': _batch
+}
+
+def run_scenario(scenario: str, repos: int, server_url: str, jobs: int = DEFAULT_MAX_WORKERS,
+                 trace_memory: bool = True) -> BenchmarkResult:
+    """
+    Run one scenario against a synthetic account and measure it.
+    
+    Args:
+        scenario: One of SCENARIOS
+        repos: Repositories of the synthetic account
+        server_url: Base URL of a running fake server
+        jobs: Repositories processed in parallel (threaded scenarios)
+        trace_memory: If False, skips tracemalloc (which slows Python down)
+                      and reports a peak memory of 0
+    
+    Returns:
+        BenchmarkResult of the run
+    """
+    username = f"{scenario}-{repos}"
+    server_stats(server_url, reset=True)
+    
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull:
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            with redirect_stdout(devnull):
+                SCENARIO_RUNNERS[scenario](server_url, username, jobs, workdir)
+        finally:
+            wall_time = time.perf_counter() - start
+            peak_memory = 0
+            if trace_memory:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+    
+    stats = server_stats(server_url)
+    return BenchmarkResult(
+        scenario=scenario,
+        repos=repos,
+        wall_time=round(wall_time, 3),
+        requests=stats['requests'],
+        bytes_transferred=stats['bytes_sent'],
+        peak_memory=peak_memory,
+        errors=stats['errors']
+    )
+
+def measure_import_time(module: str = STARTUP_MODULE, runs: int = IMPORT_TIME_RUNS) -> Dict[str, Any]:
+    """
+    Measure the import time of a module in fresh interpreters (-X importtime).
+    
+    Args:
+        module: Module to import
+        runs: Interpreter starts to measure
+    
+    Returns:
+        Dictionary with the median import time in milliseconds and the
+        LAZY_MODULES imported along with the module
+    """
+    times = []
+    imported = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            if name.strip() == module and not name[1:].startswith(' '):
+                times.append(int(cumulative) / 1000)
+            imported.add(name.strip().split('.')[0])
+    
+    return {
+        'module': module,
+        'import_time_ms': round(statistics.median(times), 1),
+        'eager_modules': sorted(imported.intersection(LAZY_MODULES))
+    }
+
+def find_regressions(results: List[BenchmarkResult], baseline: List[Dict[str, Any]],
+                     tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare results against a saved baseline.
+    
+    Args:
+        results: Results of this run
+        baseline: Results loaded from a file written with --save
+        tolerance: Relative increase of a metric reported as a regression
+    
+    Returns:
+        Human-readable description of every regressed metric
+    """
+    previous = {(entry['scenario'], entry['repos']): entry for entry in baseline}
+    regressions = []
+    
+    for result in results:
+        entry = previous.get((result.scenario, result.repos))
+        if entry is None:
+            continue
+        for metric in COMPARED_METRICS:
+            value, before = getattr(result, metric), entry.get(metric) or 0
+            if not before or value <= before * (1 + tolerance):
+                continue
+            if metric == 'wall_time' and value - before < MIN_WALL_TIME_DELTA:
+                continue
+            regressions.append(f"{result.scenario} ({result.repos} repos): {metric} "
+                               f"{before:,} -> {value:,} (+{(value / before - 1) * 100:.0f}%)")
+    
+    return regressions
+
+def _result_rows(results: List[BenchmarkResult]) -> List[List[Any]]:
+    """Format results as table rows."""
+    return [
+        [
+            result.scenario,
+            f"{result.repos:,}",
+            f"{result.wall_time:.2f}",
+            f"{result.requests:,}",
+            f"{result.requests / result.wall_time:,.0f}" if result.wall_time else "-",
+            f"{result.bytes_transferred / 1024 / 1024:.2f}",
+            f"{result.peak_memory / 1024 / 1024:.1f}" if result.peak_memory else "-",
+            result.errors
+        ]
+        for result in results
+    ]
+
+@click.command()
+@click.option('--sizes', default=DEFAULT_SIZES, show_default=True,
+              help='Comma-separated repository counts of the synthetic accounts')
+@click.option('--scenario', 'scenarios', type=click.Choice(SCENARIOS), multiple=True,
+              help='Scenario to run (repeatable, default: all)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True,
+              help='Repositories processed in parallel (threaded scenarios)')
+@click.option('--latency', type=float, default=0.0, show_default=True, help='Seconds added to every response')
+@click.option('--error-rate', type=float, default=0.0, show_default=True,
+              help='Fraction of requests answered with 502')
+@click.option('--rate-limit', type=int, default=1000000, show_default=True,
+              help='GitHub requests allowed per rate-limit window')
+@click.option('--server', 'server_url', help='Use a running fake server instead of starting one')
+@click.option('--no-trace-memory', is_flag=True, help='Skip peak memory measurement (faster, cleaner timings)')
+@click.option('--save', type=click.Path(dir_okay=False), help='Save results as JSON')
+@click.option('--compare', type=click.Path(exists=True, dir_okay=False),
+              help='Baseline JSON file (from --save); exits with status 1 on regressions')
+@click.option('--tolerance', type=float, default=DEFAULT_TOLERANCE, show_default=True,
+              help='Relative increase of a metric reported as a regression')
+@click.option('--startup', is_flag=True,
+              help='Only check the CLI start-up cost (-X importtime); exits with status 1 over budget')
+@click.option('--import-budget', type=float, default=IMPORT_TIME_BUDGET_MS, show_default=True,
+              help=f'Median import time of {STARTUP_MODULE} allowed by --startup (milliseconds)')
+def main(sizes: str, scenarios: tuple, jobs: int, latency: float, error_rate: float, rate_limit: int,
+         server_url: Optional[str], no_trace_memory: bool, save: str, compare: str, tolerance: float,
+         startup: bool, import_budget: float):
+    """Benchmark reports against synthetic accounts served by the fake server."""
+    if startup:
+        result = measure_import_time()
+        print(f"import {result['module']}: {result['import_time_ms']:.1f} ms "
+              f"(median of {IMPORT_TIME_RUNS}, budget {import_budget:.0f} ms)")
+        failed = result['import_time_ms'] > import_budget
+        if result['eager_modules']:
+            print(f"Imported up front: {', '.join(result['eager_modules'])}")
+            failed = True
+        sys.exit(1 if failed else 0)
+    
+    repo_counts = [int(size) for size in sizes.split(',') if size.strip()]
+    scenarios = scenarios or SCENARIOS
+    
+    process = None
+    if server_url is None:
+        process = start_server(latency, error_rate, rate_limit)
+        server_url = process.stdout.readline().strip()
+    
+    results = []
+    try:
+        for repos in repo_counts:
+            for scenario in scenarios:
+                click.echo(f"Running {scenario} with {repos:,} repositories...", err=True)
+                results.append(run_scenario(scenario, repos, server_url, jobs, not no_trace_memory))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    
+    headers = ["Scenario", "Repos", "Wall (s)", "Requests", "Req/s", "Transferred (MB)", "Peak memory (MB)", "Errors"]
+    print(tabulate(_result_rows(results), headers=headers, tablefmt="grid"))
+    
+    if save:
+        with open(save, 'w') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+        print(f"Results saved to {save}")
+    
+    if compare:
+        with open(compare) as f:
+            regressions = find_regressions(results, json.load(f), tolerance)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {compare}")
+
+if __name__ == "__main__":
+    main()
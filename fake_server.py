@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+"""
+Hermetic stand-in for the GitHub, npm and PyPI APIs used by the tracker.
+
+Serves synthetic accounts over plain HTTP so reports can be run and measured
+without network access or API quota. Every host the tracker talks to is
+emulated under a path prefix (http://127.0.0.1:PORT/api.github.com/...,
+.../registry.npmjs.org/..., .../pypi.org/...), and FakeServerAdapter (for
+requests) or FakeServerClientSession (for aiohttp) route the tracker's
+absolute URLs there, so the code under test runs unchanged.
+
+Accounts are generated on the fly from the username: a trailing number sets
+the repository count ("bench-1000" has 1,000 repositories), any other name
+gets DEFAULT_ACCOUNT_SIZE. Latency, error rate and the GitHub rate-limit
+budget are configurable, and request, byte and error counters are served at
+/_fake/stats.
+
+Example:
+    $ python fake_server.py --port 8787 --latency 0.02
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import click
+import requests
+from requests.adapters import HTTPAdapter
+
+# Emulated hosts, served under a path prefix of the same name
+FAKE_HOSTS = ('api.github.com', 'registry.npmjs.org', 'pypi.org', 'api.npmjs.org', 'pypistats.org')
+
+# Synthetic account defaults
+DEFAULT_ACCOUNT_SIZE = 10  # Repositories of an account whose name does not end in a number
+MAX_PAGE_SIZE = 100  # Largest per_page GitHub accepts
+RELEASE_NOTES_SIZE = 2000  # Characters of generated release notes
+PYPI_RELEASE_COUNT = 40  # Releases listed in generated PyPI documents
+
+# Server defaults
+DEFAULT_RATE_LIMIT = 1000000  # GitHub requests per rate-limit window
+DEFAULT_RATE_LIMIT_WINDOW = 3600  # Length of a rate-limit window (seconds)
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', None]
+
+def rewrite_url(base_url: str, url: str) -> str:
+    """
+    Return the fake server URL of an absolute URL on an emulated host.
+    
+    Args:
+        base_url: Base URL of the fake server (http://127.0.0.1:PORT)
+        url: Absolute URL the tracker requested
+    
+    Returns:
+        URL routed to the fake server, or url unchanged if its host is not emulated
+    """
+    parts = urlsplit(url)
+    if parts.netloc not in FAKE_HOSTS:
+        return url
+    query = f"?{parts.query}" if parts.query else ''
+    return f"{base_url}/{parts.netloc}{parts.path}{query}"
+
+def account_size(username: str) -> int:
+    """Return the repository count of a synthetic account."""
+    match = re.search(r'(\d+)$', username)
+    return int(match.group(1)) if match else DEFAULT_ACCOUNT_SIZE
+
+class FakeAccount:
+    """
+    Deterministic synthetic account.
+    
+    Repository i is a fork every tenth repository, has a release seven times
+    out of ten and publishes an npm package (i % 4 == 0) or a Python package
+    (i % 4 == 1: pyproject.toml, i % 4 == 2: setup.py); every twentieth
+    package is unknown to its registry.
+    """
+    
+    def __init__(self, username: str):
+        """
+        Initialize the account.
+        
+        Args:
+            username: Account name; a trailing number sets the repository count
+        """
+        self.username = username
+        self.size = account_size(username)
+    
+    def repo_name(self, index: int) -> str:
+        """Return the name of repository index."""
+        return f"repo-{index:05d}"
+    
+    def index_of(self, name: str) -> Optional[int]:
+        """Return the index of a repository name, or None if it does not exist."""
+        match = re.fullmatch(r'repo-(\d+)', name)
+        if match is None or int(match.group(1)) >= self.size:
+            return None
+        return int(match.group(1))
+    
+    def is_fork(self, index: int) -> bool:
+        """Return whether repository index is a fork."""
+        return index % 10 == 9
+    
+    def package_name(self, index: int) -> str:
+        """Return the name of the package published from repository index."""
+        return f"{self.username.lower()}-pkg-{index}"
+    
+    def repo(self, index: int) -> Dict[str, Any]:
+        """Return the repository document of a listing or /repos/{owner}/{name}."""
+        name = self.repo_name(index)
+        pushed_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1700000000 - index * 3600))
+        return {
+            'id': index + 1,
+            'name': name,
+            'full_name': f"{self.username}/{name}",
+            'owner': {'login': self.username, 'id': 1, 'type': 'User'},
+            'private': False,
+            'html_url': f"https://github.com/{self.username}/{name}",
+            'description': f"Synthetic repository {index}",
+            'fork': self.is_fork(index),
+            'archived': index % 50 == 49,
+            'size': index % 500,
+            'language': LANGUAGES[index % len(LANGUAGES)],
+            'stargazers_count': (index * 37) % 1000,
+            'watchers_count': (index * 37) % 1000,
+            'forks_count': (index * 11) % 100,
+            'open_issues_count': index % 7,
+            'default_branch': 'main',
+            'topics': ['synthetic', 'benchmark'],
+            'created_at': '2020-01-01T00:00:00Z',
+            'pushed_at': pushed_at,
+            'updated_at': pushed_at
+        }
+    
+    def release(self, index: int) -> Optional[Dict[str, Any]]:
+        """Return the latest release of a repository, or None if it has none."""
+        if index % 10 >= 7:
+            return None
+        tag = f"v1.{index % 20}.{index % 7}"
+        return {
+            'tag_name': tag,
+            'name': f"Release {tag}",
+            'html_url': f"https://github.com/{self.username}/{self.repo_name(index)}/releases/tag/{tag}",
+            'published_at': '2024-06-01T12:00:00Z',
+            'prerelease': index % 13 == 0,
+            'body': ("- Synthetic change\n" * (RELEASE_NOTES_SIZE // 19 + 1))[:RELEASE_NOTES_SIZE],
+            'assets': [{'name': f"asset-{n}.tar.gz", 'download_count': index * (n + 1)} for n in range(3)]
+        }
+    
+    def manifests(self, index: int) -> Dict[str, str]:
+        """Return the package manifests in the repository root with their content."""
+        name = self.package_name(index)
+        kind = index % 4
+        if kind == 0:
+            return {'package.json': json.dumps({'name': name, 'version': '1.0.0'})}
+        if kind == 1:
+            return {'pyproject.toml': f'[project]\nname = "{name}"\nversion = "1.0.0"\n'}
+        if kind == 2:
+            return {'setup.py': f"from setuptools import setup\nsetup(name='{name}', version='1.0.0')\n"}
+        return {}
+    
+    def tree(self, index: int) -> Dict[str, Any]:
+        """Return the git tree of the repository root."""
+        files = ['README.md', 'LICENSE', '.gitignore', *self.manifests(index)]
+        return {
+            'sha': hashlib.sha1(self.repo_name(index).encode()).hexdigest(),
+            'tree': [{'path': path, 'type': 'blob', 'mode': '100644'} for path in files] +
+                    [{'path': 'src', 'type': 'tree', 'mode': '040000'}],
+            'truncated': False
+        }
+    
+    @staticmethod
+    def published_index(name: str) -> Optional[int]:
+        """Return the repository index of a published package name, or None if it is unknown."""
+        match = re.search(r'-pkg-(\d+)$', name)
+        if match is None or int(match.group(1)) % 20 == 4:
+            return None
+        return int(match.group(1))
+
+class FakeServer:
+    """
+    Threaded HTTP server emulating the GitHub, npm and PyPI endpoints.
+    
+    Attributes:
+        latency (float): Seconds added to every response
+        error_rate (float): Fraction of requests answered with 502
+        rate_limit (int): GitHub requests allowed per window
+        url (str): Base URL once started
+    
+    Example:
+        >>> with FakeServer(latency=0.01) as server:
+        ...     tracker = GitHubVersionTracker(session=fake_session(server.url))
+        ...     tracker.generate_report("bench-100", output_format="json")
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: int = DEFAULT_RATE_LIMIT,
+                 rate_limit_window: int = DEFAULT_RATE_LIMIT_WINDOW, seed: int = 0):
+        """
+        Initialize the server (call start() to serve).
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds added to every response
+            error_rate: Fraction of requests answered with 502 Bad Gateway
+            rate_limit: GitHub requests allowed per window; exhausted budgets
+                        are answered with 403 like GitHub
+            rate_limit_window: Length of a rate-limit window in seconds
+            seed: Seed of the error injection
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._remaining = rate_limit
+        self.reset_stats()
+        
+        server = self
+        
+        class Handler(FakeRequestHandler):
+            fake = server
+        
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.url = f"http://{host}:{self._httpd.server_address[1]}"
+    
+    def start(self) -> 'FakeServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+    
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def __enter__(self) -> 'FakeServer':
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def reset_stats(self) -> None:
+        """Reset the request counters."""
+        with self._lock:
+            self.stats = {'requests': 0, 'bytes_sent': 0, 'errors': 0, 'not_modified': 0,
+                          'rate_limited': 0, 'by_host': {}}
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the request counters."""
+        with self._lock:
+            return {**self.stats, 'by_host': dict(self.stats['by_host'])}
+    
+    def record(self, host: str, status: int, size: int) -> None:
+        """Count a response to an emulated host."""
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['bytes_sent'] += size
+            self.stats['by_host'][host] = self.stats['by_host'].get(host, 0) + 1
+            if status >= 500:
+                self.stats['errors'] += 1
+            elif status == 304:
+                self.stats['not_modified'] += 1
+            elif status in (403, 429):
+                self.stats['rate_limited'] += 1
+    
+    def inject_error(self) -> bool:
+        """Return True if this request should fail."""
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+    
+    def rate_limit_headers(self, spend: bool) -> Dict[str, str]:
+        """Return the X-RateLimit-* headers of a GitHub response, spending one request if asked."""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start = now
+                self._remaining = self.rate_limit
+            if spend and self._remaining > 0:
+                self._remaining -= 1
+            return {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(self._remaining),
+                'X-RateLimit-Reset': str(int(self._window_start + self.rate_limit_window)),
+                'X-RateLimit-Resource': 'core'
+            }
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    """Routes /{host}/{path} requests to the emulated endpoints."""
+    
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this every keep-alive
+    # response waits for a delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+    fake: FakeServer = None
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep benchmark output quiet."""
+    
+    def do_GET(self) -> None:
+        self.request_body = b''
+        self._handle()
+    
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        self.request_body = self.rfile.read(length)
+        self._handle()
+    
+    def _handle(self) -> None:
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        
+        if host == '_fake':
+            self._control(path)
+            return
+        if host not in FAKE_HOSTS:
+            self._send(host, 404, {'message': 'Unknown host'})
+            return
+        
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        if self.fake.inject_error():
+            self._send(host, 502, {'message': 'Bad Gateway'})
+            return
+        
+        if host == 'api.github.com':
+            rate_headers = self.fake.rate_limit_headers(spend=False)
+            if rate_headers['X-RateLimit-Remaining'] == '0':
+                self._send(host, 403, {'message': 'API rate limit exceeded'}, rate_headers)
+                return
+        
+        status, payload, extra_headers = self._route(host, path, query)
+        if host == 'api.github.com':
+            # Conditional requests answered with 304 are free, like on GitHub
+            body = json.dumps(payload).encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+            if status == 200 and self.headers.get('If-None-Match') == etag:
+                self._send(host, 304, None, {**self.fake.rate_limit_headers(spend=False), 'ETag': etag})
+                return
+            extra_headers = {**extra_headers, **self.fake.rate_limit_headers(spend=True)}
+            if status == 200:
+                extra_headers['ETag'] = etag
+        self._send(host, status, payload, extra_headers)
+    
+    def _control(self, path: str) -> None:
+        """Serve the counters (/_fake/stats) and their reset (/_fake/reset)."""
+        if path == '/reset':
+            self.fake.reset_stats()
+            payload = {'reset': True}
+        elif path == '/stats':
+            payload = self.fake.snapshot()
+        else:
+            self._send(None, 404, {'message': 'Not Found'})
+            return
+        self._send(None, 200, payload)
+    
+    def _route(self, host: str, path: str, query: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        """Return (status, JSON payload, extra headers) of an emulated endpoint."""
+        segments = [unquote(segment) for segment in path.strip('/').split('/')]
+        not_found = (404, {'message': 'Not Found'}, {})
+        
+        if host == 'api.github.com':
+            if segments == ['rate_limit']:
+                core = self.fake.rate_limit_headers(spend=False)
+                rate = {'limit': int(core['X-RateLimit-Limit']), 'remaining': int(core['X-RateLimit-Remaining']),
+                        'reset': int(core['X-RateLimit-Reset'])}
+                return 200, {'resources': {'core': rate}, 'rate': rate}, {}
+            if segments == ['graphql']:
+                return self._graphql(json.loads(self.request_body or b'{}'))
+            if len(segments) == 3 and segments[0] in ('users', 'orgs') and segments[2] == 'repos':
+                return self._repo_page(segments[0], segments[1], query)
+            if len(segments) >= 3 and segments[0] == 'repos':
+                account = FakeAccount(segments[1])
+                index = account.index_of(segments[2])
+                if index is None:
+                    return not_found
+                rest = segments[3:]
+                if not rest:
+                    return 200, account.repo(index), {}
+                if rest == ['releases', 'latest']:
+                    release = account.release(index)
+                    return (200, release, {}) if release else not_found
+                if len(rest) == 3 and rest[:2] == ['git', 'trees']:
+                    return 200, account.tree(index), {}
+                if len(rest) == 2 and rest[0] == 'contents':
+                    content = account.manifests(index).get(rest[1])
+                    if content is None:
+                        return not_found
+                    encoded = base64.b64encode(content.encode()).decode()
+                    return 200, {'name': rest[1], 'path': rest[1], 'encoding': 'base64', 'content': encoded}, {}
+            return not_found
+        
+        if host == 'registry.npmjs.org':
+            # /-/package/{name}/dist-tags
+            if len(segments) >= 4 and segments[:2] == ['-', 'package'] and segments[-1] == 'dist-tags':
+                index = FakeAccount.published_index('/'.join(segments[2:-1]))
+                return (200, {'latest': f"2.{index % 10}.0"}, {}) if index is not None else not_found
+            return not_found
+        
+        if host == 'pypi.org':
+            # /pypi/{name}/json, "info" first like PyPI, then the (large) release file lists
+            if len(segments) == 3 and segments[0] == 'pypi' and segments[2] == 'json':
+                index = FakeAccount.published_index(segments[1])
+                if index is None:
+                    return not_found
+                version = f"3.{index % 10}.0"
+                releases = {
+                    f"0.{n}.0": [{'filename': f"{segments[1]}-0.{n}.0{suffix}", 'size': 1000 + n,
+                                  'digests': {'sha256': hashlib.sha256(f"{n}{suffix}".encode()).hexdigest()}}
+                                 for suffix in ('.tar.gz', '-py3-none-any.whl')]
+                    for n in range(PYPI_RELEASE_COUNT)
+                }
+                return 200, {'info': {'name': segments[1], 'version': version, 'summary': 'Synthetic package'},
+                             'last_serial': index, 'releases': releases, 'urls': []}, {}
+            return not_found
+        
+        if host == 'api.npmjs.org':
+            # /downloads/point/last-month/{names}
+            if len(segments) >= 4 and segments[:3] == ['downloads', 'point', 'last-month']:
+                names = '/'.join(segments[3:]).split(',')
+                counts = {name: FakeAccount.published_index(name) for name in names}
+                if len(names) == 1:
+                    index = counts[names[0]]
+                    if index is None:
+                        return not_found
+                    return 200, {'downloads': index * 100, 'package': names[0]}, {}
+                return 200, {name: ({'downloads': index * 100, 'package': name} if index is not None else None)
+                             for name, index in counts.items()}, {}
+            return not_found
+        
+        if host == 'pypistats.org':
+            # /api/packages/{name}/recent
+            if len(segments) == 4 and segments[:2] == ['api', 'packages'] and segments[3] == 'recent':
+                index = FakeAccount.published_index(segments[2])
+                if index is None:
+                    return not_found
+                return 200, {'data': {'last_day': index, 'last_week': index * 7, 'last_month': index * 30},
+                             'package': segments[2], 'type': 'recent_downloads'}, {}
+            return not_found
+        
+        return not_found
+    
+    def _repo_page(self, kind: str, username: str, query: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Return one page of a user ('users') or organization ('orgs') listing with its Link header.
+        
+        The type= filter of organization listings is honored for 'sources'
+        (no forks) and 'forks'; the other types list every repository.
+        """
+        account = FakeAccount(username)
+        per_page = min(int(query.get('per_page', 30)), MAX_PAGE_SIZE)
+        page = max(int(query.get('page', 1)), 1)
+        
+        indexes = range(account.size)
+        repo_type = query.get('type') if kind == 'orgs' else None
+        if repo_type in ('sources', 'forks'):
+            indexes = [index for index in indexes if account.is_fork(index) == (repo_type == 'forks')]
+        last_page = max((len(indexes) + per_page - 1) // per_page, 1)
+        
+        start = (page - 1) * per_page
+        repos = [account.repo(index) for index in indexes[start:start + per_page]]
+        
+        headers = {}
+        if last_page > 1:
+            type_param = f"type={repo_type}&" if repo_type else ''
+            url = f"https://api.github.com/{kind}/{username}/repos?{type_param}per_page={per_page}&page="
+            links = []
+            if page < last_page:
+                links.append(f'<{url}{page + 1}>; rel="next"')
+            links.append(f'<{url}{last_page}>; rel="last"')
+            headers['Link'] = ', '.join(links)
+        return 200, repos, headers
+    
+    def _graphql(self, payload: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Answer the tracker's batched release query (see version_tracker.GRAPHQL_RELEASE_FIELDS).
+        
+        Only the variables are read: alias rN is the repository named by the
+        variables oN (owner) and nN (name), or null if it does not exist.
+        """
+        variables = payload.get('variables') or {}
+        data = {}
+        index = 0
+        while f"o{index}" in variables:
+            account = FakeAccount(variables[f"o{index}"])
+            repo_index = account.index_of(variables[f"n{index}"])
+            node = None
+            if repo_index is not None:
+                repo = account.repo(repo_index)
+                release = account.release(repo_index)
+                node = {
+                    'stargazerCount': repo['stargazers_count'],
+                    'forkCount': repo['forks_count'],
+                    'primaryLanguage': {'name': repo['language']} if repo['language'] else None,
+                    'latestRelease': release and {
+                        'tagName': release['tag_name'],
+                        'publishedAt': release['published_at'],
+                        'isPrerelease': release['prerelease'],
+                        'url': release['html_url'],
+                        'description': release['body'],
+                        'releaseAssets': {'nodes': [{'downloadCount': asset['download_count']}
+                                                    for asset in release['assets']]}
+                    }
+                }
+            data[f"r{index}"] = node
+            index += 1
+        return 200, {'data': data}, {}
+    
+    def _send(self, host: Optional[str], status: int, payload: Any,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a JSON response and count it against its host."""
+        body = json.dumps(payload).encode() if payload is not None else b''
+        if host is not None:
+            # Counted before the client can see the response, so stats read after it include it
+            self.fake.record(host, status, len(body))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+class FakeServerAdapter(HTTPAdapter):
+    """
+    requests transport adapter routing requests for emulated hosts to a fake server.
+    
+    Example:
+        >>> session = requests.Session()
+        >>> session.mount('https://', FakeServerAdapter(server.url))
+    """
+    
+    def __init__(self, base_url: str, **kwargs):
+        """
+        Initialize the adapter.
+        
+        Args:
+            base_url: Base URL of the fake server
+            **kwargs: Extra arguments forwarded to HTTPAdapter (pool sizes, ...)
+        """
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        request.url = rewrite_url(self.base_url, request.url)
+        return super().send(request, **kwargs)
+
+def fake_session(base_url: str, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Return a requests.Session whose HTTPS requests go to the fake server.
+    
+    Args:
+        base_url: Base URL of the fake server
+        pool_maxsize: Keep-alive connections kept open to the server
+    
+    Returns:
+        Session to pass to GitHubVersionTracker(session=...)
+    """
+    session = requests.Session()
+    session.mount('https://', FakeServerAdapter(base_url, pool_maxsize=pool_maxsize))
+    return session
+
+class FakeServerClientSession:
+    """
+    Minimal aiohttp.ClientSession stand-in routing requests to a fake server.
+    
+    Exposes what AsyncGitHubVersionTracker uses (request(), closed, close()).
+    Create it inside the running event loop.
+    
+    Example:
+        >>> session = FakeServerClientSession(server.url)
+        >>> async with AsyncGitHubVersionTracker(session=session) as tracker:
+        ...     await tracker.generate_report("bench-100", output_format="json")
+        >>> await session.close()
+    """
+    
+    def __init__(self, base_url: str, **kwargs):
+        """
+        Initialize the session.
+        
+        Args:
+            base_url: Base URL of the fake server
+            **kwargs: Extra arguments forwarded to aiohttp.ClientSession
+        """
+        # Imported here so the threaded benchmarks do not require aiohttp
+        import aiohttp
+        
+        self.base_url = base_url.rstrip('/')
+        self._session = aiohttp.ClientSession(**kwargs)
+    
+    def request(self, method: str, url: str, **kwargs):
+        return self._session.request(method, rewrite_url(self.base_url, url), **kwargs)
+    
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+    
+    async def close(self) -> None:
+        await self._session.close()
+
+@click.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to listen on')
+@click.option('--port', type=int, default=8787, show_default=True, help='Port to listen on (0 picks a free port)')
+@click.option('--latency', type=float, default=0.0, show_default=True, help='Seconds added to every response')
+@click.option('--error-rate', type=float, default=0.0, show_default=True,
+              help='Fraction of requests answered with 502')
+@click.option('--rate-limit', type=int, default=DEFAULT_RATE_LIMIT, show_default=True,
+              help='GitHub requests allowed per rate-limit window')
+@click.option('--rate-limit-window', type=int, default=DEFAULT_RATE_LIMIT_WINDOW, show_default=True,
+              help='Length of a rate-limit window in seconds')
+@click.option('--seed', type=int, default=0, show_default=True, help='Seed of the error injection')
+def main(host: str, port: int, latency: float, error_rate: float, rate_limit: int,
+         rate_limit_window: int, seed: int):
+    """Serve synthetic GitHub, npm and PyPI data until interrupted."""
+    server = FakeServer(host, port, latency, error_rate, rate_limit, rate_limit_window, seed)
+    # The first line is read by benchmark.py to find the server
+    print(server.url, flush=True)
+    server.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Phase profiler for GitHub Version Tracker.
+
+Splits the time of a report into phases (repository listing, release
+lookups, manifest probing, registry lookups and output rendering), so a slow
+report shows whether the network, the registries or the rendering is to
+blame. Phases are timed per thread and exclusively: time spent in a registry
+lookup made while probing manifests counts for the registry lookups only.
+
+Optionally records a cProfile call profile of every thread (written as a
+pstats dump) and the peak Python memory use (tracemalloc).
+"""
+
+import functools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Callable, Iterator
+
+# Report phases, in the order they are listed
+PHASES = ('repo listing', 'release lookups', 'manifest probing', 'registry lookups', 'output rendering')
+
+# Allocation sites listed in the memory summary
+MEMORY_TOP_SITES = 5
+
+class PhaseStats:
+    """Call count and times of one phase."""
+    
+    __slots__ = ('calls', 'wall', 'cpu', 'active', 'since')
+    
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0  # Seconds during which at least one thread was in the phase
+        self.cpu = 0.0  # CPU seconds of all threads in the phase
+        self.active = 0  # Threads currently in the phase
+        self.since = 0.0
+
+class PhaseProfiler:
+    """
+    Thread-safe phase timer with optional call profiling and memory tracing.
+    
+    Wall time of a phase is the time during which at least one thread was in
+    it, so concurrent lookups are not counted twice; CPU time is summed over
+    threads. Phases overlap when threads work on different phases at once,
+    so their wall times can add up to more than the run.
+    
+    Attributes:
+        trace_memory (bool): Whether peak memory is measured (tracemalloc)
+        profile_calls (bool): Whether a cProfile call profile is recorded
+        wall_time (float): Seconds between start() and stop()
+        cpu_time (float): Process CPU seconds between start() and stop()
+    
+    Example:
+        >>> profiler = PhaseProfiler(profile_calls=True)
+        >>> tracker = GitHubVersionTracker(profiler=profiler)
+        >>> profiler.start()
+        >>> tracker.generate_report("fabriziosalmi", output_format="json")
+        >>> profiler.stop()
+        >>> print(profiler.format_report())
+        >>> profiler.dump_stats("report.pstats")
+    """
+    
+    def __init__(self, trace_memory: bool = True, profile_calls: bool = False):
+        """
+        Initialize the profiler.
+        
+        Args:
+            trace_memory: If True, measures peak Python memory with
+                          tracemalloc (which slows Python code down)
+            profile_calls: If True, records a cProfile call profile of
+                           every thread for dump_stats()
+        """
+        self.trace_memory = trace_memory
+        self.profile_calls = profile_calls
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._phases: Dict[str, PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: List[Any] = []
+        self._memory: Optional[Dict[str, Any]] = None
+        self._started = None
+    
+    def start(self) -> None:
+        """Start timing the run, tracing memory and profiling calls."""
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile_calls:
+            # Threads started from now on profile themselves (cProfile only
+            # sees the thread that enabled it before Python 3.12)
+            threading.setprofile(self._profile_thread)
+            self._profile_thread()
+        self._started = (time.perf_counter(), time.process_time())
+    
+    def stop(self) -> None:
+        """Stop the run and collect the memory summary."""
+        if self._started is None:
+            return
+        wall_start, cpu_start = self._started
+        self.wall_time = time.perf_counter() - wall_start
+        self.cpu_time = time.process_time() - cpu_start
+        self._started = None
+        
+        if self.profile_calls:
+            threading.setprofile(None)
+            for profile in self._profiles:
+                profile.disable()
+        
+        if self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot().filter_traces(
+                    [tracemalloc.Filter(False, tracemalloc.__file__)]
+                )
+                tracemalloc.stop()
+                self._memory = {
+                    'peak': peak,
+                    'current': current,
+                    'top': [
+                        {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", 'size': stat.size}
+                        for stat in snapshot.statistics('lineno')[:MEMORY_TOP_SITES]
+                    ]
+                }
+    
+    def _profile_thread(self, *args) -> None:
+        """Enable a call profile for the calling thread."""
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: the first profile already covers every thread
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._profiles.append(profile)
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed code as a phase of the calling thread.
+        
+        The phase the thread was in before is paused until this one ends.
+        
+        Args:
+            name: Phase name, usually one of PHASES
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        
+        now, cpu = time.perf_counter(), time.thread_time()
+        if stack:
+            self._leave(stack[-1], now, cpu)
+        entry = [name, cpu]
+        self._enter(name, now, new_call=True)
+        stack.append(entry)
+        try:
+            yield
+        finally:
+            now, cpu = time.perf_counter(), time.thread_time()
+            stack.pop()
+            self._leave(entry, now, cpu)
+            if stack:
+                stack[-1][1] = cpu
+                self._enter(stack[-1][0], now)
+    
+    def _enter(self, name: str, now: float, new_call: bool = False) -> None:
+        """Mark the calling thread as inside a phase."""
+        with self._lock:
+            stats = self._phases.get(name)
+            if stats is None:
+                stats = self._phases[name] = PhaseStats()
+            if new_call:
+                stats.calls += 1
+            if not stats.active:
+                stats.since = now
+            stats.active += 1
+    
+    def _leave(self, entry: List[Any], now: float, cpu: float) -> None:
+        """Mark the calling thread as outside a phase and add its times."""
+        name, cpu_start = entry
+        with self._lock:
+            stats = self._phases[name]
+            stats.cpu += cpu - cpu_start
+            stats.active -= 1
+            if not stats.active:
+                stats.wall += now - stats.since
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the results of the run.
+        
+        Returns:
+            Dictionary with the run's wall_time and cpu_time, the calls,
+            wall and cpu seconds of every phase (in PHASES order) and, with
+            trace_memory, the peak and current traced memory and the
+            largest allocation sites still held at the end
+        """
+        with self._lock:
+            names = [name for name in PHASES if name in self._phases]
+            names += sorted(name for name in self._phases if name not in PHASES)
+            phases = [
+                {
+                    'phase': name,
+                    'calls': self._phases[name].calls,
+                    'wall': round(self._phases[name].wall, 4),
+                    'cpu': round(self._phases[name].cpu, 4)
+                }
+                for name in names
+            ]
+        
+        summary = {'wall_time': round(self.wall_time, 4), 'cpu_time': round(self.cpu_time, 4), 'phases': phases}
+        if self._memory is not None:
+            summary['memory'] = self._memory
+        return summary
+    
+    def format_report(self) -> str:
+        """Format the summary as plain-text tables."""
+        from tabulate import tabulate
+        
+        summary = self.summary()
+        rows = [
+            [
+                phase['phase'],
+                f"{phase['calls']:,}",
+                f"{phase['wall']:.3f}",
+                f"{phase['wall'] / self.wall_time * 100:.0f}%" if self.wall_time else "-",
+                f"{phase['cpu']:.3f}"
+            ]
+            for phase in summary['phases']
+        ]
+        rows.append(["total run", "", f"{self.wall_time:.3f}", "100%", f"{self.cpu_time:.3f}"])
+        lines = ["PROFILE", tabulate(rows, headers=["Phase", "Calls", "Wall (s)", "Of run", "CPU (s)"],
+                                     tablefmt="grid")]
+        
+        memory = summary.get('memory')
+        if memory is not None:
+            lines.append(f"Peak memory: {memory['peak'] / 1024 / 1024:.1f} MB "
+                         f"(still held at the end: {memory['current'] / 1024 / 1024:.1f} MB)")
+            for site in memory['top']:
+                lines.append(f"  {site['size'] / 1024:,.0f} KB  {site['location']}")
+        
+        return "\n".join(lines)
+    
+    def dump_stats(self, path: str) -> None:
+        """
+        Write the merged call profile of every thread as a pstats file.
+        
+        Args:
+            path: Output file, readable with pstats or `python -m pstats`
+        
+        Raises:
+            ValueError: If no call profile was recorded
+        """
+        import pstats
+        
+        stats = None
+        for profile in self._profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        
+        if stats is None:
+            raise ValueError("No call profile was recorded (profile_calls=False?)")
+        stats.dump_stats(path)
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorate a tracker method so its calls are timed as a phase.
+    
+    The method runs undecorated when the tracker has no profiler.
+    
+    Args:
+        name: Phase name, usually one of PHASES
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
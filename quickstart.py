@@ -15,6 +15,7 @@ YOUR_GITHUB_USERNAME = "your-username-here"  # Replace with your GitHub username
 INCLUDE_FORKED_REPOS = False  # Set to True if you want to include forked repositories
 OUTPUT_FORMAT = "rich"  # Options: "rich", "table", "json"
 SAVE_TO_FILE = None  # Set to a filename like "my_report.txt" to save output
+MAX_WORKERS = 8  # Repositories processed in parallel (1 = sequential)
 
 def main():
     """
@@ -69,7 +70,7 @@ def main():
     print()
     
     # Create tracker
-    tracker = GitHubVersionTracker(github_token)
+    tracker = GitHubVersionTracker(github_token, max_workers=MAX_WORKERS)
     
     # Generate report
     print(f"📊 Generating report for {YOUR_GITHUB_USERNAME}...")
@@ -85,19 +86,7 @@ def main():
                     # (rich colors don't work well in text files)
                     sys.stdout = f
                     repos = tracker.get_user_repos(YOUR_GITHUB_USERNAME, INCLUDE_FORKED_REPOS)
-                    releases = []
-                    packages = []
-                    
-                    for repo in repos:
-                        repo_owner = repo['owner']['login']
-                        repo_name = repo['name']
-                        
-                        release = tracker.get_latest_release(repo_owner, repo_name)
-                        if release:
-                            releases.append(release)
-                        
-                        repo_packages = tracker.get_packages(repo_owner, repo_name)
-                        packages.extend(repo_packages)
+                    releases, packages = tracker.collect_report_data(repos)
                     
                     tracker._display_table_report(releases, packages)
                 else:
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+GitHub rate-limit scheduler for GitHub Version Tracker.
+
+Tracks the request budget reported by the X-RateLimit-* response headers for
+every token and API resource (core, graphql), paces requests when the budget
+runs low so it lasts until the reset, and tells callers how long to pause
+when the budget is exhausted or a secondary rate limit is hit, instead of
+letting requests fail.
+
+With a pool of tokens the scheduler picks, for every request, the token with
+the most remaining quota and takes exhausted tokens out of rotation until
+their reset.
+
+The scheduler only computes delays; the caller sleeps (time.sleep or
+asyncio.sleep), so it is shared by the threaded and asyncio trackers.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+# Scheduler defaults
+DEFAULT_PACE_BELOW = 0.1  # Start pacing when less than 10% of the budget remains
+DEFAULT_MAX_WAIT = 3600 + 60  # Longest pause accepted before giving up (seconds)
+SECONDARY_LIMIT_WAIT = 60  # Pause after a secondary rate limit without Retry-After
+RESET_MARGIN = 1  # Extra seconds waited past the reset time
+MAX_RATE_LIMIT_RETRIES = 3  # Retries of a rate-limited request
+
+class RateLimitExceeded(Exception):
+    """Raised when the rate limit would require pausing longer than allowed."""
+    
+    def __init__(self, resource: str, wait: float):
+        super().__init__(f"GitHub {resource} rate limit exhausted, next request possible in {wait:.0f}s")
+        self.resource = resource
+        self.wait = wait
+
+@dataclass
+class RateLimitBucket:
+    """Data class for the request budget of one token and API resource."""
+    token_id: str
+    resource: str
+    limit: int
+    remaining: int
+    reset_at: float
+    next_slot: float = 0.0
+
+def resource_for_url(url: str) -> str:
+    """Return the GitHub rate-limit resource a request URL is billed to."""
+    return 'graphql' if url.rstrip('/').endswith('/graphql') else 'core'
+
+def load_tokens(token: Optional[str] = None, token_file: Optional[str] = None) -> List[str]:
+    """
+    Collect the GitHub tokens available to the tracker.
+    
+    Tokens are gathered, in order and without duplicates, from the explicit
+    token, the token file (one token per line, '#' starts a comment), the
+    comma-separated GITHUB_TOKENS environment variable and GITHUB_TOKEN.
+    
+    Args:
+        token: Optional single token (e.g. from --token)
+        token_file: Optional path of a file listing tokens
+    
+    Returns:
+        List of tokens (empty for unauthenticated use)
+    """
+    tokens = [token]
+    
+    if token_file:
+        with open(os.path.expanduser(token_file)) as f:
+            tokens.extend(line.split('#', 1)[0].strip() for line in f)
+    
+    tokens.extend(os.getenv('GITHUB_TOKENS', '').split(','))
+    tokens.append(os.getenv('GITHUB_TOKEN'))
+    
+    return list(dict.fromkeys(t.strip() for t in tokens if t and t.strip()))
+
+def token_ids(tokens: List[str]) -> List[str]:
+    """Return the labels used for tokens in budgets and reports (never the secret)."""
+    return [f"token-{index}" for index in range(1, len(tokens) + 1)] or ['anonymous']
+
+class RateLimitScheduler:
+    """
+    Thread-safe request scheduler driven by GitHub rate-limit headers.
+    
+    Budgets are tracked per token and resource, so one scheduler can drive a
+    pool of tokens (see acquire()).
+    
+    Attributes:
+        pace_below (float): Fraction of the budget under which requests are
+                            spread evenly over the time left until the reset
+        max_wait (float): Longest pause accepted before RateLimitExceeded
+        paused_seconds (float): Total time requests were delayed
+        rate_limited_responses (int): Number of 403/429 rate-limit responses
+    
+    Example:
+        >>> scheduler = RateLimitScheduler(max_wait=120)
+        >>> tracker = GitHubVersionTracker(token="your_token", rate_limiter=scheduler)
+    """
+    
+    def __init__(self, pace_below: float = DEFAULT_PACE_BELOW, max_wait: float = DEFAULT_MAX_WAIT):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            pace_below: Fraction of the budget under which pacing starts
+            max_wait: Longest pause (seconds) accepted before giving up
+        """
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self.paused_seconds = 0.0
+        self.rate_limited_responses = 0
+        self._buckets: Dict[Tuple[str, str], RateLimitBucket] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, token_ids: List[str], resource: str) -> Tuple[str, float]:
+        """
+        Pick the token for the next request and reserve a slot on it.
+        
+        The token with the most remaining quota is chosen; tokens whose
+        budget is still unknown are tried first. Exhausted tokens are skipped
+        until their reset. If every token is exhausted, the one resetting
+        first is returned together with the delay until its reset.
+        
+        Args:
+            token_ids: Labels of the tokens in the pool
+            resource: Rate-limit resource ('core' or 'graphql')
+        
+        Returns:
+            Tuple of (chosen token label, delay in seconds before sending)
+        
+        Raises:
+            RateLimitExceeded: If the delay would exceed max_wait
+        """
+        with self._lock:
+            now = time.time()
+            best_id = None
+            best_remaining = -1.0
+            
+            for token_id in token_ids:
+                bucket = self._refresh(token_id, resource, now)
+                remaining = float('inf') if bucket is None else bucket.remaining
+                if remaining > 0 and remaining > best_remaining:
+                    best_id, best_remaining = token_id, remaining
+            
+            if best_id is None:
+                # Every token is exhausted: wait for the earliest reset
+                best_id = min(token_ids, key=lambda t: self._buckets[(t, resource)].reset_at)
+            
+            return best_id, self._reserve(best_id, resource, now)
+    
+    def reserve(self, token_id: str, resource: str) -> float:
+        """
+        Reserve a request slot on one token and return how long to wait before sending.
+        
+        Args:
+            token_id: Label of the token used for the request
+            resource: Rate-limit resource ('core' or 'graphql')
+        
+        Returns:
+            Delay in seconds (0 when the request can be sent right away)
+        
+        Raises:
+            RateLimitExceeded: If the delay would exceed max_wait
+        """
+        with self._lock:
+            now = time.time()
+            self._refresh(token_id, resource, now)
+            return self._reserve(token_id, resource, now)
+    
+    def _refresh(self, token_id: str, resource: str, now: float) -> Optional[RateLimitBucket]:
+        """Return a token's bucket, restoring its budget if the window has reset (lock held)."""
+        bucket = self._buckets.get((token_id, resource))
+        if bucket is not None and bucket.reset_at <= now:
+            # Window has reset, the next response will report the new budget
+            bucket.remaining = bucket.limit
+            bucket.reset_at = now + 3600
+            bucket.next_slot = 0.0
+        return bucket
+    
+    def _reserve(self, token_id: str, resource: str, now: float) -> float:
+        """Compute the delay for a request on a token and count it (lock held)."""
+        bucket = self._buckets.get((token_id, resource))
+        if bucket is None:
+            # Budget unknown until the first response
+            return 0.0
+        
+        delay = 0.0
+        if bucket.remaining <= 0:
+            delay = bucket.reset_at - now + RESET_MARGIN
+        elif bucket.remaining < bucket.limit * self.pace_below:
+            # Spread the remaining budget evenly until the reset
+            interval = (bucket.reset_at - now) / bucket.remaining
+            slot = max(now, bucket.next_slot)
+            bucket.next_slot = slot + interval
+            delay = slot - now
+        
+        if delay > self.max_wait:
+            raise RateLimitExceeded(resource, delay)
+        
+        bucket.remaining -= 1
+        self.paused_seconds += delay
+        return delay
+    
+    def update(self, token_id: str, resource: str, status_code: int,
+               headers: Any, body: str = '') -> Optional[float]:
+        """
+        Update the budget from a response and decide whether to retry it.
+        
+        Args:
+            token_id: Label of the token used for the request
+            resource: Rate-limit resource the request was billed to
+            status_code: HTTP status code of the response
+            headers: Case-insensitive mapping of response headers
+            body: Response body text, used to detect secondary rate limits
+        
+        Returns:
+            Seconds to wait before retrying, or None if the response is final
+        
+        Raises:
+            RateLimitExceeded: If the required wait exceeds max_wait
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        resource = headers.get('X-RateLimit-Resource') or resource
+        
+        with self._lock:
+            if remaining is not None:
+                try:
+                    limit = int(headers.get('X-RateLimit-Limit', 0))
+                    reset_at = float(headers.get('X-RateLimit-Reset', 0))
+                    remaining = int(remaining)
+                except ValueError:
+                    remaining = None
+                else:
+                    # The server count is authoritative: it corrects the local
+                    # estimate, e.g. for 304 responses that cost nothing
+                    bucket = self._buckets.get((token_id, resource))
+                    if bucket is None:
+                        self._buckets[(token_id, resource)] = RateLimitBucket(
+                            token_id, resource, limit, remaining, reset_at
+                        )
+                    else:
+                        bucket.limit = limit
+                        bucket.remaining = remaining
+                        bucket.reset_at = reset_at
+            
+            if status_code not in (403, 429):
+                return None
+            
+            wait = None
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None and retry_after.isdigit():
+                wait = float(retry_after)
+            elif remaining == 0:
+                wait = float(headers.get('X-RateLimit-Reset', 0)) - time.time() + RESET_MARGIN
+            elif 'secondary rate limit' in body.lower():
+                wait = float(SECONDARY_LIMIT_WAIT)
+            
+            if wait is None:
+                # A plain 403 (e.g. missing permissions), not a rate limit
+                return None
+            
+            self.rate_limited_responses += 1
+            wait = max(wait, 0.0)
+            if wait > self.max_wait:
+                raise RateLimitExceeded(resource, wait)
+            
+            self.paused_seconds += wait
+            return wait
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the current budget state for reports.
+        
+        Returns:
+            Dictionary with one entry per token and resource, plus the total
+            paused time and number of rate-limited responses
+        """
+        with self._lock:
+            buckets: List[Dict[str, Any]] = [
+                {
+                    'token': bucket.token_id,
+                    'resource': bucket.resource,
+                    'limit': bucket.limit,
+                    'remaining': max(bucket.remaining, 0),
+                    'reset_at': datetime.fromtimestamp(bucket.reset_at).isoformat(timespec='seconds')
+                }
+                for bucket in self._buckets.values()
+            ]
+            return {
+                'buckets': buckets,
+                'paused_seconds': round(self.paused_seconds, 1),
+                'rate_limited_responses': self.rate_limited_responses
+            }
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Package registry client for GitHub Version Tracker.
+
+Looks up npm and PyPI package metadata with an in-process cache keyed by
+(ecosystem, package name). Concurrent lookups of the same package share one
+request (single-flight), and packages the registry does not know are cached
+too (negative caching), so monorepos, forks and multi-user batch runs that
+resolve to the same names do not repeat the same downloads.
+
+The client does not perform HTTP itself: callers pass a fetch function, so
+the threaded and asyncio trackers share it with their own transport (and
+its conditional-request cache).
+
+Only the smallest documents that carry the latest version are downloaded:
+npm's dist-tags document instead of the full packument, and the leading
+"info" member of PyPI's JSON document, whose per-release file lists are
+never read (see RegistryBodyReader).
+
+Download counts are fetched in one batched pass per report: npm's bulk
+point endpoint answers up to 128 packages per request, while scoped npm
+packages and PyPI packages (pypistats.org has no bulk endpoint) fall back
+to one request per package.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable, Iterable
+from urllib.parse import quote
+
+# Registry cache defaults
+DEFAULT_REGISTRY_TTL = 60 * 60  # Lifetime of known package metadata (seconds)
+DEFAULT_NEGATIVE_TTL = 10 * 60  # Lifetime of "package not found" answers (seconds)
+DEFAULT_REGISTRY_MAX_ENTRIES = 4096  # Packages kept in memory (least recently used evicted)
+REGISTRY_CHUNK_SIZE = 16 * 1024  # Bytes read at a time from streamed registry documents
+
+# Metadata endpoint per ecosystem (smallest document carrying the latest version)
+REGISTRY_URLS = {
+    'npm': "https://registry.npmjs.org/-/package/{name}/dist-tags",
+    'pypi': "https://pypi.org/pypi/{name}/json"
+}
+
+# Download statistics endpoints (downloads over the last month)
+DOWNLOADS_URLS = {
+    'npm': "https://api.npmjs.org/downloads/point/last-month/{names}",
+    'pypi': "https://pypistats.org/api/packages/{name}/recent"
+}
+NPM_BULK_MAX_PACKAGES = 128  # Package names per npm bulk downloads request (scoped names are not supported)
+
+# Leading member of a registry document that holds everything reports use;
+# the rest of the document is not downloaded
+STREAMED_MEMBERS = {
+    'pypi': 'info'
+}
+
+# Start of a JSON object up to the value of its first member
+_LEADING_MEMBER = re.compile(r'\s*\{\s*"((?:[^"\\]|\\.)*)"\s*:\s*')
+_DECODER = json.JSONDecoder()
+
+def normalize_name(ecosystem: str, name: str) -> str:
+    """Return the canonical package name used as cache key (PEP 503 for PyPI)."""
+    if ecosystem == 'pypi':
+        return re.sub(r'[-_.]+', '-', name).lower()
+    return name
+
+def compact_metadata(ecosystem: str, document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep only the metadata fields reports use, so cached entries stay small.
+    
+    Args:
+        ecosystem: 'npm' or 'pypi'
+        document: Registry metadata document
+    
+    Returns:
+        Dictionary with the same shape as the registry document, restricted
+        to the latest version fields
+    """
+    if ecosystem == 'npm':
+        # Accepts a dist-tags document as well as a full or compact packument
+        tags = document.get('dist-tags', document)
+        return {'dist-tags': {'latest': tags.get('latest')}}
+    return {'info': {'version': document.get('info', {}).get('version')}}
+
+class RegistryBodyReader:
+    """
+    Incremental reader turning a registry response body into compact metadata.
+    
+    Chunks are fed as they arrive; feed() returns True as soon as the fields
+    reports use have been read, so the caller can stop downloading (for PyPI
+    after the leading "info" member, skipping the release file lists). The
+    compact body is what the response cache stores.
+    
+    Example:
+        >>> reader = RegistryBodyReader('pypi')
+        >>> for chunk in response.iter_content(REGISTRY_CHUNK_SIZE):
+        ...     if reader.feed(chunk):
+        ...         break
+        >>> body = reader.body()
+    """
+    
+    def __init__(self, ecosystem: str):
+        """
+        Initialize the reader.
+        
+        Args:
+            ecosystem: 'npm' or 'pypi'
+        """
+        self.ecosystem = ecosystem
+        self.reset()
+    
+    def reset(self) -> None:
+        """Discard everything fed so far, e.g. before the request is sent again."""
+        self.member = STREAMED_MEMBERS.get(self.ecosystem)
+        self._buffer = b''
+        self._document: Optional[Dict[str, Any]] = None
+    
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Add a chunk of the response body.
+        
+        Args:
+            chunk: Next bytes of the (decompressed) body
+        
+        Returns:
+            True if the needed fields are complete and reading can stop
+        """
+        self._buffer += chunk
+        if self.member is None:
+            return False
+        
+        # A multi-byte character cut at the end of the buffer is not needed yet
+        text = self._buffer.decode('utf-8', 'ignore')
+        match = _LEADING_MEMBER.match(text)
+        if match is None and ':' not in text:
+            # The first member name is not complete yet
+            return False
+        if match is None or match.group(1) != self.member:
+            # Unexpected layout: read the whole document
+            self.member = None
+            return False
+        
+        try:
+            value, _ = _DECODER.raw_decode(text, match.end())
+        except ValueError:
+            # The member is not complete yet
+            return False
+        
+        self._document = {self.member: value}
+        return True
+    
+    def body(self) -> bytes:
+        """
+        Return the compact metadata as a JSON body.
+        
+        Raises:
+            ValueError: If the body read so far is not a JSON document
+        """
+        document = self._document
+        if document is None:
+            document = json.loads(self._buffer)
+        return json.dumps(compact_metadata(self.ecosystem, document)).encode()
+
+def parse_downloads(ecosystem: str, names: List[str], document: Any) -> Dict[str, int]:
+    """
+    Extract download counts from a download statistics answer.
+    
+    Args:
+        ecosystem: 'npm' or 'pypi'
+        names: Package names the request was made for
+        document: Decoded JSON answer
+    
+    Returns:
+        Dictionary mapping package name to downloads over the last month;
+        packages missing from a bulk answer are left out
+    """
+    if not isinstance(document, dict):
+        return {}
+    if ecosystem == 'pypi':
+        return {names[0]: document.get('data', {}).get('last_month', 0)}
+    if len(names) == 1:
+        # Single-package answers are not keyed by name
+        return {names[0]: document.get('downloads', 0)}
+    return {name: entry.get('downloads', 0) for name, entry in document.items() if isinstance(entry, dict)}
+
+class RegistryClient:
+    """
+    Thread-safe registry metadata lookups with TTL/LRU and negative caching.
+    
+    Attributes:
+        ttl (int): Lifetime in seconds of known package metadata
+        negative_ttl (int): Lifetime in seconds of "not found" answers
+        max_entries (int): Maximum number of cached packages
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that required a request
+        coalesced (int): Lookups that waited for an identical in-flight request
+        download_requests (int): Download statistics requests sent
+    
+    Example:
+        >>> registry = RegistryClient(ttl=600)
+        >>> tracker = GitHubVersionTracker(token="your_token", registry_client=registry)
+    """
+    
+    def __init__(self, ttl: int = DEFAULT_REGISTRY_TTL, negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = DEFAULT_REGISTRY_MAX_ENTRIES):
+        """
+        Initialize the client.
+        
+        Args:
+            ttl: Lifetime in seconds of known package metadata
+            negative_ttl: Lifetime in seconds of "not found" answers
+            max_entries: Maximum number of cached packages
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.download_requests = 0
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[float, Any]]' = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._async_in_flight: Dict[Tuple[str, str], 'asyncio.Future'] = {}
+        self._lock = threading.Lock()
+    
+    def is_known(self, ecosystem: str, name: str) -> bool:
+        """Return True if a definitive answer (metadata or "not found") is cached for a package."""
+        with self._lock:
+            return self._peek((ecosystem, normalize_name(ecosystem, name))) is not None
+    
+    def url_for(self, ecosystem: str, name: str) -> str:
+        """Return the metadata URL of a package (scoped npm names are escaped)."""
+        return REGISTRY_URLS[ecosystem].format(name=quote(name, safe='@'))
+    
+    def lookup(self, ecosystem: str, name: str,
+               fetch: Callable[[str], Tuple[int, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Return the metadata of a package, fetching it at most once at a time.
+        
+        Args:
+            ecosystem: 'npm' or 'pypi'
+            name: Package name
+            fetch: Function taking a URL and returning (status code, decoded JSON)
+        
+        Returns:
+            Compact metadata dictionary, or None if the package is unknown or
+            the registry could not be reached
+        """
+        key = (ecosystem, normalize_name(ecosystem, name))
+        
+        with self._lock:
+            found, metadata = self._cached(key)
+            if found:
+                return metadata
+            
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        
+        if not is_owner:
+            # Another thread is fetching the same package
+            return future.result()
+        
+        try:
+            metadata = self._store(key, *fetch(self.url_for(ecosystem, name)))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(metadata)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        
+        return metadata
+    
+    async def lookup_async(self, ecosystem: str, name: str,
+                           fetch: Callable[[str], Awaitable[Tuple[int, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Coroutine version of lookup() for the asyncio tracker.
+        
+        Args:
+            ecosystem: 'npm' or 'pypi'
+            name: Package name
+            fetch: Coroutine function taking a URL and returning (status code, decoded JSON)
+        
+        Returns:
+            Compact metadata dictionary, or None if the package is unknown or
+            the registry could not be reached
+        """
+        # Imported here so the threaded tracker starts without asyncio
+        import asyncio
+        
+        key = (ecosystem, normalize_name(ecosystem, name))
+        
+        with self._lock:
+            found, metadata = self._cached(key)
+            if found:
+                return metadata
+            
+            future = self._async_in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._async_in_flight[key] = asyncio.get_running_loop().create_future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        
+        if not is_owner:
+            # Another task is fetching the same package
+            return await asyncio.shield(future)
+        
+        try:
+            metadata = self._store(key, *(await fetch(self.url_for(ecosystem, name))))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited failure is not reported by asyncio
+            future.exception()
+            raise
+        else:
+            future.set_result(metadata)
+        finally:
+            self._async_in_flight.pop(key, None)
+        
+        return metadata
+    
+    def download_counts(self, packages: Iterable[Tuple[str, str]],
+                        fetch: Callable[[str], Tuple[int, Any]],
+                        mapper: Callable = map) -> Dict[Tuple[str, str], int]:
+        """
+        Return the download counts of many packages in one batched pass.
+        
+        Counts are cached like metadata. Uncached npm packages are requested
+        in bulk; a bulk request that fails is retried one package at a time.
+        
+        Args:
+            packages: (ecosystem, name) pairs
+            fetch: Function taking a URL and returning (status code, decoded JSON)
+            mapper: map-like function used to send the requests, e.g. the
+                    map method of a thread pool to send them concurrently
+        
+        Returns:
+            Dictionary mapping (ecosystem, name) to downloads over the last
+            month, for the packages whose count is known
+        
+        Example:
+            >>> counts = registry.download_counts([('npm', 'react'), ('pypi', 'requests')], fetch)
+        """
+        packages = list(dict.fromkeys(packages))
+        batches = self._download_batches(packages)
+        
+        while batches:
+            answers = list(mapper(lambda batch: fetch(batch[1]), batches))
+            batches = self._store_downloads(batches, answers)
+        
+        return self._known_downloads(packages)
+    
+    async def download_counts_async(self, packages: Iterable[Tuple[str, str]],
+                                    fetch: Callable[[str], Awaitable[Tuple[int, Any]]]) -> Dict[Tuple[str, str], int]:
+        """Coroutine version of download_counts(); requests are sent concurrently."""
+        import asyncio
+        
+        packages = list(dict.fromkeys(packages))
+        batches = self._download_batches(packages)
+        
+        while batches:
+            answers = await asyncio.gather(*(fetch(url) for _, url, _ in batches))
+            batches = self._store_downloads(batches, answers)
+        
+        return self._known_downloads(packages)
+    
+    def _downloads_key(self, ecosystem: str, name: str) -> Tuple[str, str]:
+        """Return the cache key of a package's download count."""
+        return (f"{ecosystem}-downloads", normalize_name(ecosystem, name))
+    
+    def _download_batches(self, packages: List[Tuple[str, str]]) -> List[Tuple[str, str, List[str]]]:
+        """Plan the requests for uncached download counts as (ecosystem, url, names)."""
+        bulk = []
+        batches = []
+        
+        with self._lock:
+            uncached = [(ecosystem, name) for ecosystem, name in packages
+                        if self._peek(self._downloads_key(ecosystem, name)) is None]
+        
+        for ecosystem, name in uncached:
+            if ecosystem == 'npm' and not name.startswith('@'):
+                bulk.append(name)
+            else:
+                batches.append((ecosystem, self._downloads_url(ecosystem, [name]), [name]))
+        
+        for start in range(0, len(bulk), NPM_BULK_MAX_PACKAGES):
+            names = bulk[start:start + NPM_BULK_MAX_PACKAGES]
+            batches.append(('npm', self._downloads_url('npm', names), names))
+        
+        return batches
+    
+    def _downloads_url(self, ecosystem: str, names: List[str]) -> str:
+        """Return the download statistics URL for one package or an npm bulk request."""
+        if ecosystem == 'pypi':
+            return DOWNLOADS_URLS['pypi'].format(name=normalize_name('pypi', names[0]))
+        return DOWNLOADS_URLS['npm'].format(names=','.join(quote(name, safe='@/') for name in names))
+    
+    def _store_downloads(self, batches: List[Tuple[str, str, List[str]]],
+                         answers: List[Tuple[int, Any]]) -> List[Tuple[str, str, List[str]]]:
+        """Cache the counts of answered batches and return the single-package retries of failed bulk requests."""
+        retries = []
+        
+        with self._lock:
+            self.download_requests += len(batches)
+        
+        for (ecosystem, _, names), (status_code, document) in zip(batches, answers):
+            if status_code == 200:
+                for name, count in parse_downloads(ecosystem, names, document).items():
+                    self._put(self._downloads_key(ecosystem, name), count, self.ttl)
+            elif len(names) > 1:
+                # One bad name can fail a bulk request: fall back to single requests
+                retries.extend((ecosystem, self._downloads_url(ecosystem, [name]), [name]) for name in names)
+            elif status_code == 404:
+                self._put(self._downloads_key(ecosystem, names[0]), 0, self.negative_ttl)
+        
+        return retries
+    
+    def _known_downloads(self, packages: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """Return the cached download counts of packages."""
+        counts = {}
+        with self._lock:
+            for ecosystem, name in packages:
+                entry = self._entries.get(self._downloads_key(ecosystem, name))
+                if entry is not None:
+                    counts[(ecosystem, name)] = entry[1]
+        return counts
+    
+    def _peek(self, key: Tuple[str, str]) -> Optional[Tuple[float, Any]]:
+        """Return the fresh cache entry of a key, or None, without counting a hit (lock held)."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry
+    
+    def _cached(self, key: Tuple[str, str]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (found, metadata) for a fresh cache entry and count the hit (lock held)."""
+        entry = self._peek(key)
+        if entry is None:
+            return False, None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+    
+    def _store(self, key: Tuple[str, str], status_code: int, document: Any) -> Optional[Dict[str, Any]]:
+        """Cache a registry answer and return its compact metadata."""
+        if status_code == 200 and isinstance(document, dict):
+            metadata, lifetime = compact_metadata(key[0], document), self.ttl
+        elif status_code == 404:
+            metadata, lifetime = None, self.negative_ttl
+        else:
+            # Transient failures are not cached
+            return None
+        
+        self._put(key, metadata, lifetime)
+        return metadata
+    
+    def _put(self, key: Tuple[str, str], value: Any, lifetime: float) -> None:
+        """Insert a cache entry, evicting the least recently used ones beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (time.time() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached metadata."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
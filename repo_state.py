@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Per-repository state store for incremental refreshes.
+
+Remembers, for every processed repository, the pushed_at/updated_at
+timestamps of the listing it was processed from together with its result
+(latest release and published packages). On the next run, repositories whose
+timestamps did not change are served from the store and only the changed
+ones are queried again.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Any
+
+from response_cache import DEFAULT_CACHE_DIR, connect_database
+
+# State store defaults
+STATE_DB_NAME = 'repo_state.sqlite3'
+DEFAULT_MAX_STATE_AGE = 7 * 24 * 60 * 60  # Re-query unchanged repositories weekly (seconds)
+
+def repo_key(repo: Dict[str, Any]) -> str:
+    """Return the store key (owner/name) of a repository listing entry."""
+    return f"{repo['owner']['login']}/{repo['name']}"
+
+class RepoStateStore:
+    """
+    Persistent per-repository results keyed on pushed_at/updated_at.
+    
+    A stored result is reused while the repository's listing timestamps are
+    unchanged and the result is younger than max_age, which bounds the
+    staleness of data that can change without a push (e.g. a package
+    published to a registry from elsewhere).
+    
+    Attributes:
+        path (str): Path of the SQLite database file
+        max_age (int): Maximum age in seconds of a reusable result
+        hits (int): Number of repositories served from the store
+        misses (int): Number of repositories that had to be queried
+    
+    Example:
+        >>> store = RepoStateStore("~/.cache/github-version-tracker")
+        >>> tracker = GitHubVersionTracker(token="your_token", state_store=store)
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_age: int = DEFAULT_MAX_STATE_AGE):
+        """
+        Open (or create) the state store.
+        
+        Args:
+            cache_dir: Directory holding the state database
+            max_age: Maximum age in seconds of a reusable result
+        """
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        self.path = os.path.join(cache_dir, STATE_DB_NAME)
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = connect_database(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repo_state (
+                repo TEXT PRIMARY KEY,
+                pushed_at TEXT,
+                updated_at TEXT,
+                result TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+    
+    def lookup(self, repo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored result of a repository if it is still current.
+        
+        Args:
+            repo: Repository dictionary as returned by get_user_repos()
+        
+        Returns:
+            Stored result record, or None if the repository changed, is
+            unknown or its result is older than max_age
+        """
+        pushed_at = repo.get('pushed_at')
+        updated_at = repo.get('updated_at')
+        
+        with self._lock:
+            row = None
+            if pushed_at or updated_at:
+                row = self._conn.execute(
+                    "SELECT pushed_at, updated_at, result, stored_at FROM repo_state WHERE repo = ?",
+                    (repo_key(repo),)
+                ).fetchone()
+            
+            if row is None or (row[0], row[1]) != (pushed_at, updated_at) or time.time() - row[3] >= self.max_age:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+        
+        return json.loads(row[2])
+    
+    def save(self, repo: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Store the result of a repository with its current listing timestamps.
+        
+        Args:
+            repo: Repository dictionary as returned by get_user_repos()
+            result: JSON-serializable result record
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repo_state VALUES (?, ?, ?, ?, ?)",
+                (repo_key(repo), repo.get('pushed_at'), repo.get('updated_at'), json.dumps(result), time.time())
+            )
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Remove all stored results."""
+        with self._lock:
+            self._conn.execute("DELETE FROM repo_state")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM repo_state").fetchone()[0]
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+HTTP response cache for GitHub Version Tracker.
+
+Stores response bodies together with their ETag and Last-Modified validators
+so repeated requests can be revalidated with If-None-Match/If-Modified-Since.
+GitHub answers unchanged resources with 304 Not Modified, which does not
+count against the API rate limit, and the cached body is served instead.
+
+Entries younger than the TTL of their endpoint are served without any
+request. ResponseCache keeps entries in memory; SQLiteResponseCache persists
+them on disk so CLI runs and web restarts start warm.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlencode, urlsplit
+
+# Cache defaults
+DEFAULT_MAX_ENTRIES = 10000  # Responses kept in memory (least recently used evicted)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # Size bound of the on-disk cache (256 MB)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'github-version-tracker')
+CACHE_DB_NAME = 'responses.sqlite3'
+SQLITE_BUSY_TIMEOUT = 30.0  # Seconds a write waits for another connection's transaction
+ACCESS_FLUSH_BATCH = 256  # Cache reads whose access times are written in one transaction
+
+# Freshness lifetime per endpoint category (seconds). Fresh entries are served
+# without a request; stale entries are revalidated conditionally.
+DEFAULT_TTLS = {
+    'repos': 60 * 60,  # Repository listings
+    'releases': 60 * 60,  # Latest releases
+    'contents': 6 * 60 * 60,  # Manifest file contents and root tree listings
+    'registry': 60 * 60,  # npm and PyPI metadata and download statistics
+    'default': 0  # Everything else is always revalidated
+}
+
+# Hosts serving package registry metadata and download statistics
+REGISTRY_HOSTS = ('registry.npmjs.org', 'pypi.org', 'api.npmjs.org', 'pypistats.org')
+
+# Response headers kept with cached bodies
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+@dataclass
+class CachedResponse:
+    """Data class for a cached HTTP response and its validators."""
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = field(default_factory=time.time)
+    
+    @classmethod
+    def from_headers(cls, body: bytes, headers: Any) -> 'CachedResponse':
+        """
+        Build a cache entry from a response body and its headers.
+        
+        Args:
+            body: Raw response body
+            headers: Case-insensitive mapping of response headers
+        
+        Returns:
+            CachedResponse object
+        """
+        return cls(
+            body=body,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+            headers={name: headers[name] for name in CACHED_HEADERS if headers.get(name)}
+        )
+    
+    def is_revalidatable(self) -> bool:
+        """Return True if the entry carries a validator for conditional requests."""
+        return bool(self.etag or self.last_modified)
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return the If-None-Match/If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+def make_cache_key(url: str, params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> str:
+    """
+    Build the cache key for a request.
+    
+    The key combines the full URL (with sorted query parameters) and a hash
+    of the Authorization header, since GitHub responses vary by token.
+    
+    Args:
+        url: Request URL
+        params: Optional query string parameters
+        headers: Optional request headers
+    
+    Returns:
+        Cache key string
+    """
+    key = url
+    if params:
+        key += ('&' if '?' in url else '?') + urlencode(sorted(params.items()))
+    
+    authorization = (headers or {}).get('Authorization')
+    if authorization:
+        key += '#' + hashlib.sha256(authorization.encode('utf-8')).hexdigest()[:16]
+    
+    return key
+
+def connect_database(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database shared by threads and by other connections.
+    
+    Write-ahead logging lets readers proceed while another connection
+    writes, and the busy timeout makes concurrent writers wait for each other
+    instead of failing with "database is locked".
+    
+    Args:
+        path: Path of the database file
+    
+    Returns:
+        sqlite3.Connection usable from any thread (callers serialize access)
+    """
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def endpoint_category(url: str) -> str:
+    """
+    Classify a request URL into a TTL category.
+    
+    Args:
+        url: Request URL
+    
+    Returns:
+        One of 'repos', 'releases', 'contents', 'registry' or 'default'
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    
+    if parts.netloc in REGISTRY_HOSTS:
+        return 'registry'
+    if '/releases' in path:
+        return 'releases'
+    if '/contents/' in path or '/git/trees/' in path:
+        return 'contents'
+    if path.endswith('/repos'):
+        return 'repos'
+    return 'default'
+
+class ResponseCache:
+    """
+    Thread-safe in-memory response cache with LRU eviction.
+    
+    Attributes:
+        max_entries (int): Maximum number of cached responses
+        ttls (dict): Freshness lifetime in seconds per endpoint category
+        hits (int): Number of responses served from cache (fresh or after a 304)
+        misses (int): Number of responses fetched in full
+    
+    Example:
+        >>> cache = ResponseCache(max_entries=1000)
+        >>> tracker = GitHubVersionTracker(token="your_token", response_cache=cache)
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttls: Optional[Dict[str, int]] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses to keep
+            ttls: Optional overrides of DEFAULT_TTLS per endpoint category
+        """
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached response for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Store a response, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def ttl_for(self, url: str) -> int:
+        """Return the freshness lifetime in seconds for a URL."""
+        return self.ttls.get(endpoint_category(url), self.ttls['default'])
+    
+    def is_fresh(self, url: str, entry: CachedResponse) -> bool:
+        """Return True if the entry can be served without contacting the server."""
+        return time.time() - entry.stored_at < self.ttl_for(url)
+    
+    def should_store(self, url: str, entry: CachedResponse) -> bool:
+        """Return True if the entry is worth caching (revalidatable or has a TTL)."""
+        return entry.is_revalidatable() or self.ttl_for(url) > 0
+    
+    def refresh(self, key: str, entry: CachedResponse) -> None:
+        """Mark an entry as fresh again after a successful 304 revalidation."""
+        entry.stored_at = time.time()
+        self.set(key, entry)
+    
+    def record(self, hit: bool) -> None:
+        """Record whether a request was served from cache."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+    
+    def close(self) -> None:
+        """Release cache resources (nothing to do for the in-memory cache)."""
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Persistent response cache stored in a SQLite database.
+    
+    Entries survive process restarts. The cache is bounded both by entry
+    count and by total body size; least recently used entries are evicted
+    first. Access times of reads are written in batches, and running totals
+    of entries and bytes (recounted at every batch and eviction, so writes of
+    other connections are picked up) decide when to evict.
+    
+    Attributes:
+        path (str): Path of the SQLite database file
+        max_bytes (int): Maximum total size of cached bodies
+    
+    Example:
+        >>> cache = SQLiteResponseCache("~/.cache/github-version-tracker")
+        >>> tracker = GitHubVersionTracker(token="your_token", response_cache=cache)
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, int]] = None):
+        """
+        Open (or create) the on-disk cache.
+        
+        Args:
+            cache_dir: Directory holding the cache database
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached bodies in bytes
+            ttls: Optional overrides of DEFAULT_TTLS per endpoint category
+        """
+        super().__init__(max_entries=max_entries, ttls=ttls)
+        
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        self.path = os.path.join(cache_dir, CACHE_DB_NAME)
+        self.max_bytes = max_bytes
+        self._accessed: Dict[str, float] = {}  # Access times not written yet
+        self._conn = connect_database(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._count, self._total = self._totals()
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached response for a key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, headers, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_BATCH:
+                self._flush_accesses()
+                self._count, self._total = self._totals()
+                self._conn.commit()
+        
+        body, etag, last_modified, headers, stored_at = row
+        return CachedResponse(
+            body=bytes(body),
+            etag=etag,
+            last_modified=last_modified,
+            headers=json.loads(headers),
+            stored_at=stored_at
+        )
+    
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Store a response, evicting least recently used entries over the bounds."""
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.body, entry.etag, entry.last_modified, json.dumps(entry.headers),
+                 entry.stored_at, time.time(), len(entry.body))
+            )
+            self._accessed.pop(key, None)
+            if replaced is None:
+                self._count += 1
+            else:
+                self._total -= replaced[0]
+            self._total += len(entry.body)
+            
+            if self._count > self.max_entries or self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+    
+    def _totals(self) -> Tuple[int, int]:
+        """Count the stored entries and bytes (lock held)."""
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return count, total
+    
+    def _flush_accesses(self) -> None:
+        """Write the batched access times of reads (lock held, caller commits)."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until both bounds are met (lock held)."""
+        self._flush_accesses()
+        self._count, self._total = self._totals()
+        if self._count <= self.max_entries and self._total <= self.max_bytes:
+            return
+        
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self._count <= self.max_entries and self._total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count -= 1
+            self._total -= size
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._accessed.clear()
+            self._count, self._total = 0, 0
+    
+    def close(self) -> None:
+        """Write pending access times and close the database connection."""
+        with self._lock:
+            if self._accessed:
+                self._flush_accesses()
+                self._conn.commit()
+            self._conn.close()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Single-flight request coalescing for GitHub Version Tracker.
+
+Concurrent callers asking for the same request (URL, query parameters,
+credentials and Accept header) share one in-flight request and its result
+instead of each sending it. This keeps bursts of identical requests (several
+web visitors opening the same profile when its cache expires, or a report
+looking up the same registry package twice) from spending the GitHub quota
+several times over. Only requests that are in flight are shared; completed
+results are left to the response cache.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Any, Callable, Awaitable, Hashable, Tuple
+
+from response_cache import make_cache_key
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[str, Optional[str]]:
+    """
+    Build the coalescing key of a GET request.
+    
+    Args:
+        url: Request URL
+        params: Optional query string parameters
+        headers: Optional request headers
+    
+    Returns:
+        Key combining the cache key (URL, sorted parameters and a hash of the
+        Authorization header) with the Accept header, which selects the
+        representation (e.g. raw file contents)
+    """
+    return make_cache_key(url, params, headers), (headers or {}).get('Accept')
+
+class SingleFlight:
+    """
+    Thread-safe and asyncio-aware coalescing of identical concurrent calls.
+    
+    The first caller of a key runs the call; callers arriving while it is in
+    flight wait for it and receive the same result or exception. Coroutine
+    calls are shared within their event loop.
+    
+    Attributes:
+        calls (int): Number of calls that were run
+        coalesced (int): Number of callers served by a call already in flight
+    
+    Example:
+        >>> single_flight = SingleFlight()
+        >>> tracker = GitHubVersionTracker(token="your_token", single_flight=single_flight)
+    """
+    
+    def __init__(self):
+        """Initialize an empty set of in-flight calls."""
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._async_in_flight: Dict[Hashable, 'asyncio.Future'] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """
+        Run call, or wait for the identical call already in flight.
+        
+        Args:
+            key: Identity of the call (see request_key())
+            call: Function performing the request
+        
+        Returns:
+            Result of the call
+        
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        
+        if not is_owner:
+            # Another thread is sending the same request
+            return future.result()
+        
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        
+        return result
+    
+    async def do_async(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Coroutine version of do() for the asyncio tracker.
+        
+        Args:
+            key: Identity of the call (see request_key())
+            call: Coroutine function performing the request
+        
+        Returns:
+            Result of the call
+        """
+        # Imported here so the threaded tracker starts without asyncio
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        
+        with self._lock:
+            future = self._async_in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._async_in_flight[key] = loop.create_future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        
+        if not is_owner:
+            # Another task is sending the same request
+            return await asyncio.shield(future)
+        
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited failure is not reported by asyncio
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._async_in_flight.pop(key, None)
+        
+        return result
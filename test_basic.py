@@ -37,6 +37,12 @@ def test_tracker_initialization():
         tracker2 = GitHubVersionTracker(token="test_token")
         assert "Authorization" in tracker2.headers
         
+        # Pooled keep-alive session, optionally shared between trackers
+        tracker3 = GitHubVersionTracker(pool_maxsize=20, session=tracker1.session)
+        assert tracker3.session is tracker1.session
+        adapter = GitHubVersionTracker(pool_maxsize=20).session.get_adapter("https://api.github.com")
+        assert adapter._pool_maxsize == 20
+        
         print("  ✅ Tracker initialization successful")
         return True
     except Exception as e:
@@ -70,12 +76,1178 @@ def test_data_classes():
         )
         assert package.package_type == "npm"
         
+        # Records are slotted: no per-instance __dict__
+        assert not hasattr(release, '__dict__') and not hasattr(package, '__dict__')
+        
         print("  ✅ Data classes working correctly")
         return True
     except Exception as e:
         print(f"  ❌ Data class test failed: {e}")
         return False
 
+def test_compact_records():
+    """Test that listings are compacted and long release notes are truncated."""
+    print("✓ Testing compact records...")
+    listing = [
+        {"name": "repo", "fork": False, "language": "Go", "stargazers_count": 3, "topics": ["x"] * 50,
+         "owner": {"login": "test", "avatar_url": "https://example.com/a.png"}},
+        {"name": "forked", "fork": True, "owner": {"login": "test"}}
+    ]
+    tracker = GitHubVersionTracker()
+    repos = tracker._listing_repos(listing, include_forks=False)
+    assert repos == [{"name": "repo", "fork": False, "language": "Go", "stargazers_count": 3,
+                      "owner": {"login": "test"}}]
+    
+    notes = "Changes\n" + "- fix\n" * 500
+    release = tracker._build_release_info("test", "repo", {"body": notes}, {})
+    assert release.notes_truncated and len(release.description) <= 1000
+    assert notes.startswith(release.description)
+    
+    full = GitHubVersionTracker(release_notes_length=None)._build_release_info("test", "repo", {"body": notes}, {})
+    assert full.description == notes and not full.notes_truncated
+    
+    print("  ✅ Compact records working correctly")
+    return True
+
+def test_concurrent_processing():
+    """Test that concurrent repo processing keeps order and isolates failures."""
+    print("✓ Testing concurrent repository processing...")
+    import time
+    tracker = GitHubVersionTracker(max_workers=4)
+    
+    def fake_release(owner, name, repo_meta=None):
+        if name == "broken":
+            raise RuntimeError("boom")
+        time.sleep(0.01 * (5 - int(name[-1])))  # Finish out of order
+        return name
+    
+    tracker.get_latest_release = fake_release
+    tracker.get_packages = lambda owner, name, repo_meta=None: []
+    
+    repos = [{'owner': {'login': 'test'}, 'name': name}
+             for name in ["repo1", "broken", "repo2", "repo3", "repo4"]]
+    results = tracker.process_repos(repos)
+    assert [release for release, _ in results] == ["repo1", None, "repo2", "repo3", "repo4"]
+    
+    print("  ✅ Concurrent processing working correctly")
+    return True
+
+def test_streaming_results():
+    """Test that per-repository results are streamed as they complete."""
+    print("✓ Testing streaming repository results...")
+    import io
+    import json
+    import time
+    from contextlib import redirect_stdout
+    from version_tracker import ReleaseInfo, RepoResult
+    
+    tracker = GitHubVersionTracker(max_workers=4)
+    
+    def fake_release(owner, name, repo_meta=None):
+        time.sleep(0.02 * (4 - int(name[-1])))  # Later repositories finish first
+        return ReleaseInfo(f"{owner}/{name}", "v1.0.0", "2025-01-01", "", 10, False, "", "Go", 5, 1)
+    
+    tracker.get_latest_release = fake_release
+    tracker.get_packages = lambda owner, name, repo_meta=None: []
+    tracker.get_user_repos = lambda username, include_forks=False, repo_filter=None: [
+        {'owner': {'login': username}, 'name': f"repo{i}", 'language': "Go"} for i in range(1, 4)
+    ]
+    
+    # Completion order by default, listing order on request
+    results = list(tracker.iter_repo_results("test"))
+    assert all(isinstance(result, RepoResult) for result in results)
+    assert results[0].repo_name == "test/repo3"
+    ordered = list(tracker.iter_repo_results("test", ordered=True))
+    assert [result.index for result in ordered] == [0, 1, 2]
+    
+    # The JSON report is written incrementally but stays valid JSON
+    output = io.StringIO()
+    with redirect_stdout(output):
+        tracker._display_json_report(ordered)
+    report = json.loads(output.getvalue())
+    assert [r["repo_name"] for r in report["releases"]] == ["test/repo1", "test/repo2", "test/repo3"]
+    assert report["summary"]["total_downloads"] == 30
+    
+    print("  ✅ Streaming results working correctly")
+    return True
+
+def test_incremental_refresh():
+    """Test that unchanged repositories reuse their stored result."""
+    print("✓ Testing incremental refresh...")
+    import tempfile
+    from types import SimpleNamespace
+    from version_tracker import ReleaseInfo
+    from repo_state import RepoStateStore
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        tracker = GitHubVersionTracker(max_workers=2, state_store=RepoStateStore(cache_dir))
+        
+        probed = []
+        def fake_release(owner, name, repo_meta=None):
+            probed.append(name)
+            if name == "flaky":
+                # Retries exhausted on a 502: not a definitive "no release"
+                return GitHubVersionTracker.get_latest_release(tracker, owner, name, repo_meta)
+            return ReleaseInfo(f"{owner}/{name}", "v1.0.0", "2025-01-01", "", 0, False, "", "Go", 1, 0)
+        
+        tracker.get_latest_release = fake_release
+        tracker.get_packages = lambda owner, name, repo_meta=None: []
+        tracker._get_once = lambda url, body_reader=None, **kwargs: SimpleNamespace(status_code=502)
+        
+        repos = [{'owner': {'login': 'test'}, 'name': name, 'pushed_at': "2025-01-01T00:00:00Z",
+                  'updated_at': "2025-01-01T00:00:00Z", 'stargazers_count': 1}
+                 for name in ("repo1", "repo2", "flaky")]
+        tracker.process_repos(repos)
+        assert sorted(probed) == ["flaky", "repo1", "repo2"]
+        assert len(tracker.state_store) == 2
+        
+        # Only the pushed repository and the failed lookup are probed
+        # again; stars come from the new listing
+        probed.clear()
+        repos[1]['pushed_at'] = "2025-02-01T00:00:00Z"
+        repos[0]['stargazers_count'] = 42
+        results = tracker.process_repos(repos)
+        assert sorted(probed) == ["flaky", "repo2"]
+        assert results[0][0].latest_version == "v1.0.0" and results[0][0].stars == 42
+        assert tracker.state_store.hits == 1
+        
+        tracker.close()
+    
+    print("  ✅ Incremental refresh working correctly")
+    return True
+
+def test_registry_failure_not_stored():
+    """Test that results with a failed npm/PyPI lookup are not stored for incremental runs."""
+    print("✓ Testing incremental refresh with registry failures...")
+    import tempfile
+    from fake_server import FakeServer, fake_session
+    from repo_state import RepoStateStore
+    
+    with FakeServer() as server, tempfile.TemporaryDirectory() as cache_dir:
+        tracker = GitHubVersionTracker(session=fake_session(server.url), use_cache=False,
+                                       state_store=RepoStateStore(cache_dir))
+        # Both registries are down: their lookups fail with CircuitOpenError
+        for host in ("registry.npmjs.org", "pypi.org"):
+            for _ in range(tracker.transport.failure_threshold):
+                tracker.transport.after_request(host, "GET", "connection_error", tracker.transport.max_retries)
+        repos = tracker.get_user_repos("bench-20")
+        tracker.process_repos(repos)
+        
+        healthy = GitHubVersionTracker(session=fake_session(server.url), use_cache=False)
+        with_packages = {repo["name"] for repo, (_, packages) in zip(repos, healthy.process_repos(repos))
+                         if packages}
+        assert with_packages
+        # Only repositories that never needed a registry answer are stored
+        stored = {repo["name"] for repo in repos if tracker.state_store.lookup(repo) is not None}
+        assert stored and stored.isdisjoint(with_packages)
+        
+        tracker.close()
+        healthy.close()
+    
+    print("  ✅ Results of failed registry lookups are not stored")
+    return True
+
+def test_repo_meta_reuse():
+    """Test that listing metadata is reused instead of refetching the repository."""
+    print("✓ Testing repository metadata reuse...")
+    class FakeResponse:
+        status_code = 200
+        def json(self):
+            return {"tag_name": "v1.0.0", "published_at": "2025-01-01T00:00:00Z", "assets": []}
+    
+    requested = []
+    tracker = GitHubVersionTracker()
+    tracker._get = lambda url, **kwargs: requested.append(url) or FakeResponse()
+    
+    repo_meta = {"stargazers_count": 7, "forks_count": 2, "language": "Go"}
+    release = tracker.get_latest_release("test", "repo", repo_meta=repo_meta)
+    assert release.stars == 7 and release.language == "Go"
+    assert requested == ["https://api.github.com/repos/test/repo/releases/latest"]
+    
+    print("  ✅ Repository metadata reused correctly")
+    return True
+
+def test_manifest_probe():
+    """Test that only manifests listed in the root tree are fetched."""
+    print("✓ Testing manifest detection from the git tree...")
+    import base64
+    
+    class FakeResponse:
+        def __init__(self, status_code, payload=None):
+            self.status_code = status_code
+            self.payload = payload
+        def json(self):
+            return self.payload
+    
+    pyproject = base64.b64encode(b'[project]\nname = "demo"\n').decode()
+    responses = {
+        "https://api.github.com/repos/test/repo/git/trees/main": FakeResponse(200, {"tree": [
+            {"path": "README.md", "type": "blob"},
+            {"path": "pyproject.toml", "type": "blob"},
+            {"path": "package.json", "type": "tree"}
+        ]}),
+        "https://api.github.com/repos/test/repo/contents/pyproject.toml": FakeResponse(200, {"content": pyproject}),
+        "https://pypi.org/pypi/demo/json": FakeResponse(200, {"info": {"version": "1.2.3"}})
+    }
+    
+    requested = []
+    tracker = GitHubVersionTracker()
+    tracker._get = lambda url, **kwargs: requested.append(url) or responses.get(url, FakeResponse(404))
+    
+    packages = tracker.get_packages("test", "repo", repo_meta={"default_branch": "main"})
+    assert [(pkg.package_type, pkg.latest_version) for pkg in packages] == [("python", "1.2.3")]
+    assert requested == list(responses)
+    
+    # Known root files skip the tree request; empty repositories fetch nothing
+    requested.clear()
+    assert tracker.get_packages("test", "repo", root_files=["LICENSE"]) == []
+    assert requested == []
+    assert tracker._manifest_files(tracker._root_files(409, None)) == []
+    
+    print("  ✅ Manifest detection working correctly")
+    return True
+
+def test_registry_client():
+    """Test registry lookup deduplication and negative caching."""
+    print("✓ Testing registry client...")
+    import json
+    import threading
+    import time
+    from registry_client import RegistryClient, RegistryBodyReader
+    
+    registry = RegistryClient()
+    requested = []
+    def fetch(url):
+        requested.append(url)
+        time.sleep(0.05)
+        if "/missing/" in url:
+            return 404, None
+        if "/flaky/" in url:
+            return 500, None
+        return 200, {"latest": "2.0.0", "next": "3.0.0-rc.1"}
+    
+    # Concurrent lookups of one package share a single request
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.lookup('npm', 'demo', fetch)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"dist-tags": {"latest": "2.0.0"}}] * 4
+    assert requested == ["https://registry.npmjs.org/-/package/demo/dist-tags"]
+    assert registry.coalesced + registry.hits == 3
+    
+    # Unknown packages are cached, transient failures are not
+    assert registry.lookup('npm', 'missing', fetch) is None
+    assert registry.lookup('npm', 'missing', fetch) is None
+    assert registry.lookup('npm', 'flaky', fetch) is None
+    assert registry.lookup('npm', 'flaky', fetch) is None
+    assert requested.count("https://registry.npmjs.org/-/package/missing/dist-tags") == 1
+    assert requested.count("https://registry.npmjs.org/-/package/flaky/dist-tags") == 2
+    
+    # PyPI names are normalized before caching
+    requested.clear()
+    registry.lookup('pypi', 'My_Package', lambda url: (200, {"info": {"version": "1.0"}}))
+    assert registry.lookup('pypi', 'my-package', fetch) == {"info": {"version": "1.0"}}
+    assert requested == []
+    
+    # PyPI documents are read only up to their leading "info" member
+    document = json.dumps({"info": {"version": "1.0"}, "releases": {"1.0": []}}).encode()
+    reader = RegistryBodyReader('pypi')
+    assert reader.feed(document[:10]) is False
+    assert reader.feed(document[10:30]) is True
+    assert json.loads(reader.body()) == {"info": {"version": "1.0"}}
+    
+    print("  ✅ Registry client working correctly")
+    return True
+
+def test_package_downloads():
+    """Test that download counts are fetched in one batched pass."""
+    print("✓ Testing batched package downloads...")
+    class FakeResponse:
+        def __init__(self, status_code, payload=None):
+            self.status_code = status_code
+            self.payload = payload
+        def json(self):
+            return self.payload
+    
+    responses = {
+        "https://api.npmjs.org/downloads/point/last-month/left-pad,right-pad": FakeResponse(200, {
+            "left-pad": {"downloads": 10, "package": "left-pad"},
+            "right-pad": {"downloads": 20, "package": "right-pad"}
+        }),
+        "https://api.npmjs.org/downloads/point/last-month/@scope/pkg": FakeResponse(200, {"downloads": 5}),
+        "https://pypistats.org/api/packages/my-package/recent": FakeResponse(200, {"data": {"last_month": 7}})
+    }
+    
+    requested = []
+    tracker = GitHubVersionTracker()
+    tracker._get = lambda url, **kwargs: requested.append(url) or responses.get(url, FakeResponse(404))
+    
+    packages = [
+        tracker._npm_package_info("test", "a", "left-pad", {}),
+        tracker._npm_package_info("test", "b", "right-pad", {}),
+        tracker._npm_package_info("test", "c", "left-pad", {}),
+        tracker._npm_package_info("test", "d", "@scope/pkg", {}),
+        tracker._python_package_info("test", "e", "My_Package", {}),
+        tracker._python_package_info("test", "f")
+    ]
+    tracker.fill_package_downloads(packages)
+    assert [p.downloads for p in packages] == [10, 20, 10, 5, 7, 0]
+    assert sorted(requested) == sorted(responses)
+    
+    # Counts are cached; a failed bulk request falls back to single requests
+    requested.clear()
+    tracker.fill_package_downloads(packages)
+    assert requested == []
+    # Checking for cached counts is not a metadata cache hit
+    assert tracker.registry_client.hits == 0 and tracker.registry_client.download_requests == 3
+    
+    from registry_client import RegistryClient
+    answers = {"https://api.npmjs.org/downloads/point/last-month/one": (200, {"downloads": 1})}
+    counts = RegistryClient().download_counts(
+        [('npm', 'one'), ('npm', 'missing')], lambda url: answers.get(url, (404, None))
+    )
+    assert counts == {('npm', 'one'): 1, ('npm', 'missing'): 0}
+    
+    print("  ✅ Batched package downloads working correctly")
+    return True
+
+def test_parallel_pagination():
+    """Test that listing pages are fetched from the Link header and kept in order."""
+    print("✓ Testing parallel repository pagination...")
+    import time
+    
+    class FakeResponse:
+        status_code = 200
+        def __init__(self, page):
+            self.page = page
+            self.headers = {"Link": '<https://api.github.com/user/1/repos?page=2>; rel="next", '
+                                    '<https://api.github.com/user/1/repos?page=3>; rel="last"'}
+        def json(self):
+            return [{"name": f"p{self.page}-{i}", "fork": i == 0, "owner": {"login": "test"}} for i in range(100)]
+    
+    requested = []
+    def fake_get(url, params=None, **kwargs):
+        requested.append(params["page"])
+        time.sleep(0.01 * (4 - params["page"]))  # Later pages finish first
+        return FakeResponse(params["page"])
+    
+    tracker = GitHubVersionTracker(max_workers=4)
+    tracker._get = fake_get
+    
+    # Full pages with forks filtered out must not end the listing early
+    repos = tracker.get_user_repos("test")
+    assert sorted(requested) == [1, 2, 3]
+    assert len(repos) == 297
+    assert [repo["name"] for repo in repos[::99]] == ["p1-1", "p2-1", "p3-1"]
+    assert tracker._last_page(None) == 1
+    
+    print("  ✅ Parallel pagination working correctly")
+    return True
+
+def test_response_cache():
+    """Test the conditional request cache."""
+    print("✓ Testing response cache...")
+    from response_cache import ResponseCache, CachedResponse, make_cache_key
+    
+    # Keys vary by query parameters and token, not parameter order
+    key = make_cache_key("https://api.github.com/x", {"b": 2, "a": 1})
+    assert key == make_cache_key("https://api.github.com/x", {"a": 1, "b": 2})
+    assert key != make_cache_key("https://api.github.com/x", {"a": 1, "b": 2},
+                                 {"Authorization": "token test_token"})
+    
+    entry = CachedResponse.from_headers(b"{}", {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"
+    }
+    
+    # Least recently used entries are evicted
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", entry)
+    cache.set("b", entry)
+    cache.get("a")
+    cache.set("c", entry)
+    assert cache.get("b") is None and cache.get("a") is entry and len(cache) == 2
+    
+    assert GitHubVersionTracker(use_cache=False).response_cache is None
+    
+    # Persistent cache survives reopening and honours per-endpoint TTLs
+    import tempfile
+    from response_cache import SQLiteResponseCache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        disk_cache = SQLiteResponseCache(cache_dir, ttls={"releases": 60})
+        disk_cache.set("a", entry)
+        disk_cache.close()
+        
+        disk_cache = SQLiteResponseCache(cache_dir, ttls={"releases": 60})
+        cached = disk_cache.get("a")
+        assert cached.etag == '"abc"' and cached.body == b"{}"
+        assert disk_cache.is_fresh("https://api.github.com/repos/test/repo/releases/latest", cached)
+        assert not disk_cache.is_fresh("https://api.github.com/rate_limit", cached)
+        disk_cache.close()
+    
+    # Batched access times still drive LRU eviction; running totals honour the byte bound
+    with tempfile.TemporaryDirectory() as cache_dir:
+        disk_cache = SQLiteResponseCache(cache_dir, max_entries=2, max_bytes=5)
+        disk_cache.set("a", entry)
+        disk_cache.set("b", entry)
+        disk_cache.get("a")
+        disk_cache.set("c", entry)
+        assert disk_cache.get("b") is None and disk_cache.get("a") is not None and len(disk_cache) == 2
+        disk_cache.set("d", CachedResponse(b"12345"))
+        assert len(disk_cache) == 1 and disk_cache.get("d").body == b"12345"
+        disk_cache.close()
+    
+    # Connections to the same file write concurrently without "database is locked"
+    import threading
+    with tempfile.TemporaryDirectory() as cache_dir:
+        caches = [SQLiteResponseCache(cache_dir) for _ in range(3)]
+        errors = []
+        def write(cache, prefix):
+            try:
+                for i in range(50):
+                    cache.set(f"{prefix}{i}", entry)
+                    cache.get(f"{prefix}{i}")
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=write, args=(cache, str(n))) for n, cache in enumerate(caches)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors and len(caches[0]) == 150
+        for cache in caches:
+            cache.close()
+    
+    print("  ✅ Response cache working correctly")
+    return True
+
+def test_rate_limit_scheduler():
+    """Test that the scheduler tracks the budget and pauses instead of failing."""
+    print("✓ Testing rate-limit scheduler...")
+    import time
+    from rate_limiter import RateLimitScheduler, RateLimitExceeded
+    
+    reset_at = str(int(time.time()) + 600)
+    scheduler = RateLimitScheduler(max_wait=900)
+    
+    # Budget is read from the response headers
+    headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset_at}
+    assert scheduler.update("token", "core", 200, headers) is None
+    assert scheduler.reserve("token", "core") == 0
+    
+    # Exhausted budget: wait until the reset, then retry
+    headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_at}
+    wait = scheduler.update("token", "core", 403, headers)
+    assert 590 < wait <= 601
+    
+    # Secondary rate limits honour Retry-After
+    assert scheduler.update("token", "core", 403, {"Retry-After": "5"}) == 5
+    
+    # A plain 403 is not retried
+    assert scheduler.update("token", "core", 403, {}, "Resource not accessible") is None
+    
+    # Pausing longer than max_wait gives up
+    strict = RateLimitScheduler(max_wait=10)
+    strict.update("token", "core", 200, headers)
+    try:
+        strict.reserve("token", "core")
+        assert False, "expected RateLimitExceeded"
+    except RateLimitExceeded:
+        pass
+    
+    snapshot = scheduler.snapshot()
+    assert snapshot["buckets"][0]["remaining"] == 0
+    assert snapshot["rate_limited_responses"] == 2
+    
+    print("  ✅ Rate-limit scheduler working correctly")
+    return True
+
+def test_transport_policy():
+    """Test timeouts, bounded jittered retries and per-host circuit breakers."""
+    print("✓ Testing transport policy...")
+    import time
+    import requests
+    from transport import TransportPolicy, CircuitOpenError, CircuitBreaker, backoff_delay, classify_status
+    
+    assert [classify_status(code) for code in (200, 304, 404, 429, 503)] == [
+        "success", "success", "client_error", "rate_limited", "server_error"
+    ]
+    assert all(0 <= backoff_delay(attempt, 0.5, 8) <= min(8, 0.5 * 2 ** attempt) for attempt in range(10))
+    
+    # 5xx and timeouts are retried a bounded number of times
+    policy = TransportPolicy(connect_timeout=2, read_timeout=7, max_retries=2, backoff_base=0)
+    assert policy.timeout == (2, 7)
+    assert policy.after_request("registry.npmjs.org", "GET", "server_error", 0) == 0
+    assert policy.after_request("registry.npmjs.org", "GET", "timeout", 1) == 0
+    assert policy.after_request("registry.npmjs.org", "GET", "timeout", 2) is None
+    
+    # POSTs and 4xx are never retried; 429 honours Retry-After outside GitHub
+    assert policy.after_request("api.github.com", "POST", "server_error", 0) is None
+    assert policy.after_request("pypi.org", "GET", "client_error", 0) is None
+    assert policy.after_request("pypi.org", "GET", "rate_limited", 0, "3") == 3
+    assert policy.after_request("pypi.org", "GET", "rate_limited", 0, "3", retry_rate_limited=False) is None
+    
+    # The breaker opens after repeated failures and lets one probe through later
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record(False, 100)
+    assert breaker.allow(100) is None
+    breaker.record(False, 100)
+    assert breaker.allow(105) == 5
+    assert breaker.allow(110) is None and breaker.state == "half_open"
+    breaker.record(False, 110)
+    assert breaker.state == "open"
+    breaker.allow(120)
+    breaker.record(True, 120)
+    assert breaker.state == "closed" and breaker.allow(120) is None
+    breaker.record(False, 130)
+    breaker.record(False, 130)
+    assert breaker.allow(140) is None and breaker.allow(140) is not None
+    breaker.abandon(140)
+    assert breaker.allow(140) is None and breaker.state == "half_open"
+    
+    # An outage of one host does not affect the others
+    policy = TransportPolicy(max_retries=0, failure_threshold=2)
+    for _ in range(2):
+        policy.after_request("registry.npmjs.org", "GET", "connection_error", 0)
+    try:
+        policy.before_request("registry.npmjs.org")
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError as e:
+        assert e.host == "registry.npmjs.org"
+    policy.before_request("api.github.com")
+    snapshot = policy.snapshot()
+    assert snapshot["open_circuits"] == ["registry.npmjs.org"]
+    assert snapshot["outcomes"]["connection_error"] == 2 and snapshot["outcomes"]["circuit_open"] == 1
+    
+    # The tracker sends requests with timeouts and retries failed attempts
+    class FakeResponse:
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.headers = {}
+        def close(self):
+            pass
+    
+    class FakeSession:
+        def __init__(self, results):
+            self.results = list(results)
+            self.timeouts = []
+        def request(self, method, url, **kwargs):
+            self.timeouts.append(kwargs.get("timeout"))
+            result = self.results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return FakeResponse(result)
+    
+    session = FakeSession([requests.Timeout(), 503, 200])
+    tracker = GitHubVersionTracker(session=session, transport=TransportPolicy(backoff_base=0))
+    assert tracker._request("GET", "https://pypi.org/pypi/x/json").status_code == 200
+    assert session.timeouts == [tracker.transport.timeout] * 3
+    assert tracker.transport.snapshot()["retries"] == 2
+    
+    session = FakeSession([requests.ConnectionError()] * 2)
+    tracker = GitHubVersionTracker(session=session, transport=TransportPolicy(max_retries=1, backoff_base=0))
+    try:
+        tracker._request("GET", "https://pypi.org/pypi/x/json")
+        assert False, "expected ConnectionError"
+    except requests.ConnectionError:
+        pass
+    
+    # A probe failing with any other requests error reopens the circuit,
+    # and a probe that raised something else lets the next request probe
+    session = FakeSession([requests.ConnectionError(), requests.exceptions.ChunkedEncodingError(),
+                           RuntimeError("bug"), 200])
+    tracker = GitHubVersionTracker(session=session, transport=TransportPolicy(
+        max_retries=0, failure_threshold=1, reset_timeout=0.05))
+    url = "https://pypi.org/pypi/x/json"
+    for expected in (requests.ConnectionError, requests.exceptions.ChunkedEncodingError, RuntimeError):
+        time.sleep(0.06)
+        try:
+            tracker._request("GET", url)
+            assert False, f"expected {expected.__name__}"
+        except expected:
+            pass
+    assert tracker.transport.snapshot()["outcomes"]["connection_error"] == 2
+    assert tracker._request("GET", url).status_code == 200
+    
+    print("  ✅ Transport policy working correctly")
+    return True
+
+def test_single_flight():
+    """Test that identical in-flight requests share one request."""
+    print("✓ Testing single-flight request coalescing...")
+    import asyncio
+    import threading
+    import time
+    from types import SimpleNamespace
+    from single_flight import SingleFlight, request_key
+    
+    sent = []
+    lock = threading.Lock()
+    def fake_get_once(url, body_reader=None, **kwargs):
+        with lock:
+            sent.append((url, (kwargs.get("headers") or {}).get("Authorization")))
+        time.sleep(0.05)
+        return SimpleNamespace(status_code=200, call=len(sent))
+    
+    tracker = GitHubVersionTracker(max_workers=8)
+    tracker._get_once = fake_get_once
+    
+    # Concurrent identical requests are sent once and share the result
+    url = "https://api.github.com/users/test/repos"
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(tracker._get(url, headers=tracker.headers)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sent) == 1 and [response.call for response in results] == [1] * 5
+    assert tracker.single_flight.coalesced == 4
+    
+    # Completed requests are not reused, and credentials are part of the key
+    tracker._get(url, headers=tracker.headers)
+    assert len(sent) == 2
+    assert request_key(url, None, {"Authorization": "token a"}) != request_key(url, None, {"Authorization": "token b"})
+    assert request_key(url, {"page": 2}) != request_key(url, {"page": 3})
+    
+    # Coroutines share calls within their event loop, including failures
+    single_flight = SingleFlight()
+    calls = []
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "body"
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    async def run():
+        ok = await asyncio.gather(*(single_flight.do_async("a", fetch) for _ in range(3)))
+        failed = await asyncio.gather(*(single_flight.do_async("b", failing) for _ in range(3)),
+                                      return_exceptions=True)
+        return ok, failed
+    ok, failed = asyncio.run(run())
+    assert ok == ["body"] * 3 and len(calls) == 2
+    assert all(isinstance(result, ValueError) for result in failed)
+    
+    print("  ✅ Single-flight coalescing working correctly")
+    return True
+
+def test_token_pool():
+    """Test token rotation by remaining quota and token loading."""
+    print("✓ Testing token pool...")
+    import time
+    import tempfile
+    from unittest import mock
+    from rate_limiter import RateLimitScheduler, load_tokens
+    
+    reset_at = str(int(time.time()) + 600)
+    scheduler = RateLimitScheduler(max_wait=900)
+    pool = ["token-1", "token-2"]
+    
+    # Unknown budgets are tried first, then the token with the most quota
+    assert scheduler.acquire(pool, "core") == ("token-1", 0)
+    scheduler.update("token-1", "core", 200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "100", "X-RateLimit-Reset": reset_at})
+    assert scheduler.acquire(pool, "core") == ("token-2", 0)
+    scheduler.update("token-2", "core", 200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset_at})
+    assert scheduler.acquire(pool, "core")[0] == "token-2"
+    
+    # Exhausted tokens leave the rotation until their reset
+    scheduler.update("token-2", "core", 200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_at})
+    assert scheduler.acquire(pool, "core") == ("token-1", 0)
+    scheduler.update("token-1", "core", 200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_at})
+    token_id, delay = scheduler.acquire(pool, "core")
+    assert 590 < delay <= 601
+    
+    # Tokens come from the file and the environment, without duplicates
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("# CI tokens\nfile_a\n\nfile_b  # bot account\n")
+    with mock.patch.dict(os.environ, {"GITHUB_TOKENS": "env_a, file_a", "GITHUB_TOKEN": "env_b"}):
+        assert load_tokens("cli", f.name) == ["cli", "file_a", "file_b", "env_a", "env_b"]
+    os.unlink(f.name)
+    
+    # Requests are authenticated with the token picked by the scheduler
+    tracker = GitHubVersionTracker(tokens=["first", "second"])
+    assert tracker.token == "first" and tracker.token_ids == pool
+    assert tracker._with_token("token-2", tracker.headers)["Authorization"] == "token second"
+    assert tracker.headers["Authorization"] == "token first"
+    
+    print("  ✅ Token pool working correctly")
+    return True
+
+def test_graphql_mapping():
+    """Test GraphQL query building and mapping into ReleaseInfo."""
+    print("✓ Testing GraphQL backend mapping...")
+    tracker = GitHubVersionTracker(token="test_token", backend="graphql")
+    query, variables = tracker._build_graphql_release_query([("test", "repo"), ("test", "other")])
+    assert "r1: repository(owner: $o1, name: $n1)" in query
+    assert variables == {"o0": "test", "n0": "repo", "o1": "test", "n1": "other"}
+    
+    node = {
+        "stargazerCount": 50,
+        "forkCount": 10,
+        "primaryLanguage": {"name": "Python"},
+        "latestRelease": {
+            "tagName": "v1.0.0",
+            "publishedAt": "2025-01-01T12:00:00Z",
+            "isPrerelease": False,
+            "url": "https://github.com/test/repo/releases/tag/v1.0.0",
+            "description": "Test release",
+            "releaseAssets": {"nodes": [{"downloadCount": 60}, {"downloadCount": 40}]}
+        }
+    }
+    release = tracker._graphql_release_info("test", "repo", node)
+    assert release.release_date == "2025-01-01"
+    assert release.download_count == 100
+    assert release.stars == 50 and release.language == "Python"
+    assert tracker._graphql_release_info("test", "repo", {"latestRelease": None}) is None
+    
+    print("  ✅ GraphQL mapping working correctly")
+    return True
+
+def test_async_tracker():
+    """Test that the asyncio engine keeps order and isolates failures."""
+    print("✓ Testing async tracker...")
+    import asyncio
+    from async_tracker import AsyncGitHubVersionTracker
+    
+    tracker = AsyncGitHubVersionTracker(token="test_token", limit_per_host=2)
+    assert "Authorization" in tracker.headers
+    
+    async def fake_release(owner, name, repo_meta=None):
+        if name == "broken":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01 * (5 - int(name[-1])))  # Finish out of order
+        return name
+    
+    async def fake_packages(owner, name, repo_meta=None):
+        return []
+    
+    tracker.get_latest_release = fake_release
+    tracker.get_packages = fake_packages
+    
+    repos = [{'owner': {'login': 'test'}, 'name': name}
+             for name in ["repo1", "broken", "repo2", "repo3", "repo4"]]
+    results = asyncio.run(tracker.process_repos(repos))
+    assert [release for release, _ in results] == ["repo1", None, "repo2", "repo3", "repo4"]
+    
+    print("  ✅ Async tracker working correctly")
+    return True
+
+def test_async_package_parity():
+    """Test that the asyncio and threaded engines report the same packages."""
+    print("✓ Testing async and threaded package parity...")
+    import asyncio
+    import io
+    import json
+    from contextlib import redirect_stdout
+    from async_tracker import AsyncGitHubVersionTracker
+    from fake_server import FakeServer, FakeServerClientSession, fake_session
+    
+    def parse(output):
+        text = output.getvalue()
+        return json.loads(text[text.index("{"):])
+    
+    async def run_async(url):
+        session = FakeServerClientSession(url)
+        try:
+            async with AsyncGitHubVersionTracker(session=session) as tracker:
+                await tracker.generate_report("parity-50", output_format="json")
+        finally:
+            await session.close()
+    
+    with FakeServer() as server:
+        threaded_output, async_output = io.StringIO(), io.StringIO()
+        with redirect_stdout(threaded_output):
+            with GitHubVersionTracker(session=fake_session(server.url)) as tracker:
+                tracker.generate_report("parity-50", output_format="json")
+        with redirect_stdout(async_output):
+            asyncio.run(run_async(server.url))
+    
+    def packages(report):
+        return sorted((p["repo_name"], p["package_type"], p["latest_version"], p["package_url"], p["downloads"])
+                      for p in report["packages"])
+    
+    threaded, concurrent = parse(threaded_output), parse(async_output)
+    assert packages(threaded) and {p[1] for p in packages(threaded)} == {"npm", "python"}
+    assert packages(concurrent) == packages(threaded)
+    assert concurrent["summary"]["total_package_downloads"] == threaded["summary"]["total_package_downloads"] > 0
+    
+    print("  ✅ Async and threaded engines agree")
+    return True
+
+def test_graphql_backend():
+    """Test that both engines' GraphQL backends match the REST releases with fewer requests."""
+    print("✓ Testing GraphQL backend on both engines...")
+    import asyncio
+    import io
+    import json
+    from contextlib import redirect_stdout
+    from async_tracker import AsyncGitHubVersionTracker
+    from fake_server import FakeServer, FakeServerClientSession, fake_session
+    
+    def report(run):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            run()
+        text = output.getvalue()
+        return json.loads(text[text.index("{"):])["releases"]
+    
+    def run_threaded(url, backend):
+        with GitHubVersionTracker(token="test_token", backend=backend, session=fake_session(url)) as tracker:
+            tracker.generate_report("gql-150", output_format="json")
+    
+    async def run_async(url):
+        session = FakeServerClientSession(url)
+        try:
+            async with AsyncGitHubVersionTracker(token="test_token", backend="graphql", session=session) as tracker:
+                assert tracker.backend == "graphql"
+                await tracker.generate_report("gql-150", output_format="json")
+        finally:
+            await session.close()
+    
+    requests_made = {}
+    with FakeServer() as server:
+        releases = {}
+        for name, run in [("rest", lambda: run_threaded(server.url, "rest")),
+                          ("threads", lambda: run_threaded(server.url, "graphql")),
+                          ("async", lambda: asyncio.run(run_async(server.url)))]:
+            server.reset_stats()
+            releases[name] = report(run)
+            requests_made[name] = server.snapshot()["by_host"]["api.github.com"]
+    
+    assert releases["rest"] and releases["threads"] == releases["rest"]
+    assert releases["async"] == releases["rest"]
+    # 135 release lookups become two batched queries
+    assert requests_made["threads"] == requests_made["async"] == requests_made["rest"] - 133
+    
+    print("  ✅ GraphQL backend working on both engines")
+    return True
+
+def test_fake_server():
+    """Test a full report against the hermetic fake GitHub/npm/PyPI server."""
+    print("✓ Testing fake server end to end...")
+    import io
+    import json
+    from contextlib import redirect_stdout
+    from fake_server import FakeServer, fake_session
+    from transport import TransportPolicy
+    from benchmark import BenchmarkResult, find_regressions
+    
+    with FakeServer(error_rate=0.05, seed=1) as server:
+        tracker = GitHubVersionTracker(session=fake_session(server.url),
+                                       transport=TransportPolicy(backoff_base=0, max_retries=5))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            tracker.generate_report("bench-25", output_format="json")
+        stats = server.snapshot()
+    
+    report = json.loads(output.getvalue()[output.getvalue().index("{"):])
+    # 25 repositories, 2 forks skipped, 7 of every 10 with a release
+    assert report["summary"]["total_releases"] == 19
+    assert {p["package_type"] for p in report["packages"]} == {"npm", "python"}
+    assert report["summary"]["total_package_downloads"] > 0
+    # Injected 502s were retried
+    assert stats["errors"] > 0 and report["transport"]["retries"] >= stats["errors"]
+    assert stats["by_host"]["api.github.com"] > 0 and stats["bytes_sent"] > 0
+    
+    baseline = [{"scenario": "web", "repos": 10, "wall_time": 1.0, "requests": 60,
+                 "bytes_transferred": 1000, "peak_memory": 100}]
+    same = BenchmarkResult("web", 10, 1.05, 60, 1000, 100, 0)
+    slower = BenchmarkResult("web", 10, 2.0, 90, 1000, 100, 0)
+    assert find_regressions([same], baseline) == []
+    assert len(find_regressions([slower], baseline)) == 2
+    
+    print("  ✅ Fake server working correctly")
+    return True
+
+def test_web_refresh():
+    """Test that the web app's forced refresh bypasses the caches."""
+    print("✓ Testing web app refresh...")
+    import os
+    import tempfile
+    from fake_server import FakeServer, fake_session
+    
+    with FakeServer() as server, tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["VERSION_TRACKER_CACHE_DIR"] = cache_dir
+        try:
+            import web_app
+            token = "refresh-test-token"
+            web_app.get_tracker(token).session = fake_session(server.url)
+            first = web_app.get_github_stats("bench-10", token)
+            
+            # A second load is served from the caches
+            server.reset_stats()
+            web_app.get_github_stats("bench-10", token)
+            assert server.snapshot()["requests"] == 0
+            
+            # A refresh revalidates every cached response and queries every repository
+            server.reset_stats()
+            with web_app.refresh_tracker(token) as tracker:
+                tracker.session = fake_session(server.url)
+                refreshed = web_app.get_github_stats("bench-10", token, tracker)
+            stats = server.snapshot()
+            assert stats["by_host"]["api.github.com"] > 10 and stats["not_modified"] > 0
+            assert refreshed["summary"] == first["summary"]
+        finally:
+            del os.environ["VERSION_TRACKER_CACHE_DIR"]
+    
+    print("  ✅ Web app refresh working correctly")
+    return True
+
+def test_request_metrics():
+    """Test per-endpoint request accounting and latency histograms."""
+    print("✓ Testing request metrics...")
+    import io
+    import json
+    from contextlib import redirect_stdout
+    from fake_server import FakeServer, fake_session
+    from transport import RequestMetrics, TransportPolicy, endpoint_template
+    
+    assert endpoint_template("https://api.github.com/repos/a/b/releases/latest") == \
+        "api.github.com/repos/{owner}/{repo}/releases/latest"
+    assert endpoint_template("https://pypi.org/pypi/requests/json") == "pypi.org/pypi/{name}/json"
+    assert endpoint_template("https://example.com/anything") == "example.com/*"
+    
+    metrics = RequestMetrics()
+    for latency in (0.01, 0.02, 0.03, 0.5):
+        metrics.record_request("https://pypi.org/pypi/requests/json", "200", latency, size=100)
+    metrics.record_request("https://api.github.com/users/a/repos", "304", 0.01)
+    metrics.record_cache_hit("https://api.github.com/users/a/repos")
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 5 and snapshot["bytes"] == 400
+    assert snapshot["github_quota_used"] == 0 and snapshot["cache_hits"] == 1
+    pypi = snapshot["endpoints"][0]
+    assert pypi["endpoint"] == "pypi.org/pypi/{name}/json" and pypi["statuses"] == {"200": 4}
+    assert pypi["latency_ms"]["p50"] <= pypi["latency_ms"]["p99"] <= pypi["latency_ms"]["max"] == 500
+    assert sum(pypi["histogram"].values()) == 4
+    
+    with FakeServer() as server:
+        tracker = GitHubVersionTracker(session=fake_session(server.url),
+                                       transport=TransportPolicy(metrics=RequestMetrics()))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            tracker.generate_report("bench-10", output_format="json")
+        stats = server.snapshot()
+    
+    report = json.loads(output.getvalue()[output.getvalue().index("{"):])
+    performance = report["performance"]
+    assert performance["requests"] == stats["requests"]
+    assert performance["github_quota_used"] == stats["by_host"]["api.github.com"]
+    endpoints = {entry["endpoint"] for entry in performance["endpoints"]}
+    assert "api.github.com/repos/{owner}/{repo}/releases/latest" in endpoints
+    
+    print("  ✅ Request metrics working correctly")
+    return True
+
+def test_profiler():
+    """Test the phase profiler used by --profile."""
+    print("✓ Testing phase profiler...")
+    import io
+    import os
+    import pstats
+    import tempfile
+    import time
+    from contextlib import redirect_stdout
+    from fake_server import FakeServer, fake_session
+    from profiler import PhaseProfiler
+    
+    profiler = PhaseProfiler()
+    profiler.start()
+    with profiler.phase("manifest probing"):
+        time.sleep(0.02)
+        with profiler.phase("registry lookups"):
+            time.sleep(0.05)
+    profiler.stop()
+    phases = {phase["phase"]: phase for phase in profiler.summary()["phases"]}
+    # Nested phases are exclusive: the registry lookup is not counted twice
+    assert 0.05 <= phases["registry lookups"]["wall"] < 0.1
+    assert 0.02 <= phases["manifest probing"]["wall"] < 0.05
+    assert profiler.summary()["memory"]["peak"] > 0
+    
+    # Memory tracing stopped elsewhere (e.g. by a benchmark) is not an error
+    import tracemalloc
+    profiler = PhaseProfiler()
+    profiler.start()
+    tracemalloc.stop()
+    profiler.stop()
+    assert "memory" not in profiler.summary()
+    
+    with FakeServer() as server:
+        profiler = PhaseProfiler(trace_memory=False, profile_calls=True)
+        tracker = GitHubVersionTracker(session=fake_session(server.url), profiler=profiler)
+        profiler.start()
+        with redirect_stdout(io.StringIO()):
+            tracker.generate_report("bench-10", output_format="json")
+        profiler.stop()
+    
+    summary = profiler.summary()
+    assert [phase["phase"] for phase in summary["phases"]] == [
+        "repo listing", "release lookups", "manifest probing", "registry lookups", "output rendering"
+    ]
+    assert "memory" not in summary and "release lookups" in profiler.format_report()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "report.pstats")
+        profiler.dump_stats(path)
+        # Worker threads are profiled too
+        functions = {func[2] for func in pstats.Stats(path).stats}
+        assert "get_packages" in functions
+    
+    print("  ✅ Phase profiler working correctly")
+    return True
+
+def test_lazy_imports():
+    """Test that JSON reports and warnings run without the rich and tabulate renderers."""
+    print("✓ Testing lazy renderer imports...")
+    import subprocess
+    import sys
+    from benchmark import measure_import_time
+    
+    assert measure_import_time(runs=1)["eager_modules"] == []
+    
+    script = (
+        "import io, sys\n"
+        "from contextlib import redirect_stdout\n"
+        "from fake_server import FakeServer, fake_session\n"
+        "from version_tracker import GitHubVersionTracker\n"
+        "with FakeServer() as server, redirect_stdout(io.StringIO()) as output:\n"
+        "    GitHubVersionTracker(session=fake_session(server.url)).generate_report('bench-5', output_format='json')\n"
+        "assert 'Fetching repositories for bench-5...' in output.getvalue()\n"
+        "with redirect_stdout(io.StringIO()) as output:\n"
+        "    GitHubVersionTracker(backend='graphql')\n"
+        "assert output.getvalue() == 'GraphQL backend requires a token, falling back to REST.\\n'\n"
+        "print(sorted({name.split('.')[0] for name in sys.modules} & {'rich', 'tabulate'}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]", result.stdout
+    
+    print("  ✅ Lazy renderer imports working correctly")
+    return True
+
+def test_ndjson_report():
+    """Test the NDJSON report against the fake server."""
+    print("✓ Testing NDJSON report...")
+    import asyncio
+    import io
+    import json
+    from collections import Counter
+    from contextlib import redirect_stdout, redirect_stderr
+    import version_tracker
+    import async_tracker
+    from fake_server import FakeServer, FakeServerClientSession, fake_session
+    
+    async def run_async(url):
+        session = FakeServerClientSession(url)
+        try:
+            async with async_tracker.AsyncGitHubVersionTracker(session=session) as tracker:
+                await tracker.generate_report("bench-25", output_format="ndjson")
+        finally:
+            await session.close()
+    
+    batch_size = version_tracker.NDJSON_PACKAGE_BATCH
+    version_tracker.NDJSON_PACKAGE_BATCH = async_tracker.NDJSON_PACKAGE_BATCH = 3  # Several package batches
+    try:
+        with FakeServer() as server:
+            tracker = GitHubVersionTracker(session=fake_session(server.url))
+            output, messages = io.StringIO(), io.StringIO()
+            with redirect_stdout(output), redirect_stderr(messages):
+                tracker.generate_report("bench-25", output_format="ndjson")
+            async_output = io.StringIO()
+            with redirect_stdout(async_output), redirect_stderr(io.StringIO()):
+                asyncio.run(run_async(server.url))
+    finally:
+        version_tracker.NDJSON_PACKAGE_BATCH = async_tracker.NDJSON_PACKAGE_BATCH = batch_size
+    
+    # Every stdout line is JSON; progress messages go to stderr
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert "Fetching repositories for bench-25..." in messages.getvalue()
+    counts = Counter(line["type"] for line in lines)
+    assert counts["release"] == 19 and counts["summary"] == 1 and lines[-1]["type"] == "summary"
+    
+    summary = lines[-1]["summary"]
+    packages = [line for line in lines if line["type"] == "package"]
+    assert summary["total_packages"] == len(packages) > 3
+    assert summary["total_package_downloads"] == sum(p["downloads"] for p in packages) > 0
+    assert "performance" in lines[-1] and "transport" in lines[-1]
+    
+    # The async engine streams the same records
+    async_lines = [json.loads(line) for line in async_output.getvalue().splitlines()]
+    records = lambda report: sorted(json.dumps(line, sort_keys=True) for line in report if line["type"] != "summary")
+    assert records(async_lines) == records(lines) and async_lines[-1]["summary"] == summary
+    
+    print("  ✅ NDJSON report working correctly")
+    return True
+
+def test_org_listing():
+    """Test organization listings with type= and client-side pre-filters."""
+    print("✓ Testing organization listing and repository filters...")
+    import asyncio
+    from datetime import datetime, timezone
+    from async_tracker import AsyncGitHubVersionTracker
+    from fake_server import FakeServer, FakeServerClientSession, fake_session
+    from version_tracker import RepoFilter
+    
+    now = datetime(2024, 1, 31, tzinfo=timezone.utc)
+    repo = {'archived': False, 'size': 10, 'pushed_at': '2024-01-01T00:00:00Z'}
+    assert RepoFilter(skip_archived=True, skip_empty=True, max_inactive_days=60).matches(repo, now)
+    assert not RepoFilter(max_inactive_days=7).matches(repo, now)
+    assert not RepoFilter(skip_archived=True).matches({**repo, 'archived': True}, now)
+    assert not RepoFilter(skip_archived=True).matches({**repo, 'disabled': True}, now)
+    assert not RepoFilter(skip_empty=True).matches({**repo, 'size': 0}, now)
+    assert not RepoFilter(max_inactive_days=7).matches({**repo, 'pushed_at': None}, now)
+    
+    with FakeServer() as server:
+        tracker = GitHubVersionTracker(session=fake_session(server.url))
+        # 250 repositories, every tenth a fork: forks are filtered by GitHub (type=sources)
+        sources = tracker.get_org_repos("bench-250")
+        assert len(sources) == 225 and not any(r['fork'] for r in sources)
+        assert len(tracker.get_org_repos("bench-250", repo_type="forks", include_forks=True)) == 25
+        assert len(tracker.get_org_repos("bench-250", include_forks=True)) == 250
+        
+        server.reset_stats()
+        tracker = GitHubVersionTracker(session=fake_session(server.url), use_cache=False)
+        filtered = tracker.get_org_repos("bench-250", include_forks=True,
+                                         repo_filter=RepoFilter(skip_archived=True, skip_empty=True))
+        # Archived (every 50th) and empty (size 0) repositories are dropped from the listing
+        assert len(filtered) == 250 - 5 - 1
+        assert not any(r['archived'] or r['size'] == 0 for r in filtered)
+        # Only the listing pages were requested
+        assert server.snapshot()["requests"] == 3
+        
+        try:
+            tracker.get_org_repos("bench-250", repo_type="everything")
+            assert False, "unknown repo_type accepted"
+        except ValueError:
+            pass
+        
+        # Streaming results take the same listing options, on both engines
+        listing = {"org": True, "repo_type": "forks", "repo_filter": RepoFilter(skip_archived=True)}
+        streamed = sorted(result.repo_name for result in tracker.iter_repo_results("bench-250", True, **listing))
+        # 25 forks, of which 5 are archived
+        assert len(streamed) == 20 and all(name.startswith("bench-250/") for name in streamed)
+        assert streamed == sorted(r['full_name'] for r in tracker.get_org_repos("bench-250", True, "forks")
+                                  if not r['archived'])
+        
+        async def stream_async():
+            session = FakeServerClientSession(server.url)
+            try:
+                async with AsyncGitHubVersionTracker(session=session) as async_tracker:
+                    return sorted([result.repo_name async for result in
+                                   async_tracker.iter_repo_results("bench-250", True, **listing)])
+            finally:
+                await session.close()
+        
+        assert asyncio.run(stream_async()) == streamed
+    
+    print("  ✅ Organization listing working correctly")
+    return True
+
 def test_api_connection():
     """Test that we can connect to GitHub API."""
     print("✓ Testing GitHub API connection...")
@@ -142,7 +1314,33 @@ def main():
         test_imports,
         test_tracker_initialization,
         test_data_classes,
+        test_compact_records,
+        test_concurrent_processing,
+        test_async_tracker,
+        test_async_package_parity,
+        test_graphql_backend,
+        test_streaming_results,
+        test_incremental_refresh,
+        test_registry_failure_not_stored,
+        test_graphql_mapping,
+        test_repo_meta_reuse,
+        test_manifest_probe,
+        test_registry_client,
+        test_package_downloads,
+        test_parallel_pagination,
+        test_response_cache,
+        test_rate_limit_scheduler,
+        test_transport_policy,
+        test_single_flight,
+        test_token_pool,
         test_config_loading,
+        test_fake_server,
+        test_web_refresh,
+        test_request_metrics,
+        test_profiler,
+        test_lazy_imports,
+        test_ndjson_report,
+        test_org_listing,
         test_api_connection,
         test_user_repos,
     ]
@@ -153,6 +1351,10 @@ def main():
             result = test()
             results.append(result)
             print()
+        except AssertionError as e:
+            print(f"  ❌ {test.__name__} failed: {e}")
+            results.append(False)
+            print()
         except Exception as e:
             print(f"  ❌ Test crashed: {e}")
             results.append(False)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Transport policy for GitHub Version Tracker.
+
+Decides how every HTTP request is sent and retried: connect and read
+timeouts, bounded retries with exponential backoff and full jitter on
+timeouts, connection errors, 5xx and (outside GitHub, whose limits are
+handled by the rate-limit scheduler) 429 responses, and a circuit breaker
+per host, so an outage of one registry fails fast instead of slowing down
+requests to the other hosts. Every outcome is counted for reports.
+
+Like the rate-limit scheduler, the policy only computes decisions and
+delays; the caller sleeps (time.sleep or asyncio.sleep), so it is shared by
+the threaded and asyncio trackers.
+
+The policy also carries the request metrics: per endpoint template (e.g.
+api.github.com/repos/{owner}/{repo}/releases/latest) the number of requests,
+status codes, bytes, cache hits and a latency histogram, reported as the
+"performance" section of every report.
+"""
+
+import bisect
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlsplit
+
+# Transport defaults
+DEFAULT_CONNECT_TIMEOUT = 5  # Seconds to establish a connection
+DEFAULT_READ_TIMEOUT = 30  # Seconds without receiving data before giving up
+DEFAULT_MAX_RETRIES = 3  # Retries on timeouts, connection errors, 5xx and 429 responses
+DEFAULT_BACKOFF_BASE = 0.5  # First retry waits up to this long (seconds), doubling per attempt
+DEFAULT_BACKOFF_MAX = 8  # Upper bound of a single backoff (seconds)
+DEFAULT_FAILURE_THRESHOLD = 5  # Consecutive failures that open a host's circuit
+DEFAULT_RESET_TIMEOUT = 30  # Seconds an open circuit waits before a probe request
+MAX_RETRY_AFTER = 60  # Longest Retry-After honored on a 429 outside GitHub (seconds)
+
+# Methods that are safe to send again
+RETRY_METHODS = ('GET', 'HEAD')
+
+# Request outcomes counted by the policy
+OUTCOMES = ('success', 'client_error', 'rate_limited', 'server_error',
+            'timeout', 'connection_error', 'circuit_open')
+
+# Upper bounds (milliseconds) of the latency histogram buckets; slower requests go to a last, open bucket
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+LATENCY_PERCENTILES = (50, 90, 99)
+
+# Endpoint templates of the APIs the tracker calls: (host, path pattern, template)
+ENDPOINT_TEMPLATES = [
+    ('api.github.com', r'/users/[^/]+/repos', '/users/{user}/repos'),
+    ('api.github.com', r'/orgs/[^/]+/repos', '/orgs/{org}/repos'),
+    ('api.github.com', r'/repos/[^/]+/[^/]+/releases/latest', '/repos/{owner}/{repo}/releases/latest'),
+    ('api.github.com', r'/repos/[^/]+/[^/]+/contents/.+', '/repos/{owner}/{repo}/contents/{path}'),
+    ('api.github.com', r'/repos/[^/]+/[^/]+/git/trees/.+', '/repos/{owner}/{repo}/git/trees/{ref}'),
+    ('api.github.com', r'/repos/[^/]+/[^/]+', '/repos/{owner}/{repo}'),
+    ('api.github.com', r'/(graphql|rate_limit)', None),
+    ('registry.npmjs.org', r'/-/package/.+/dist-tags', '/-/package/{name}/dist-tags'),
+    ('registry.npmjs.org', r'/.+', '/{name}'),
+    ('pypi.org', r'/pypi/[^/]+/json', '/pypi/{name}/json'),
+    ('api.npmjs.org', r'/downloads/point/last-month/.+', '/downloads/point/last-month/{names}'),
+    ('pypistats.org', r'/api/packages/[^/]+/recent', '/api/packages/{name}/recent'),
+]
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because its host's circuit is open."""
+    
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host} after repeated failures, retrying in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_MAX) -> float:
+    """
+    Return a randomized exponential backoff ("full jitter").
+    
+    Spreading retries uniformly over [0, min(cap, base * 2^attempt)] keeps
+    clients that failed together from retrying together.
+    
+    Args:
+        attempt: Number of the retry, starting at 0
+        base: Upper bound of the first backoff
+        cap: Upper bound of any backoff
+    
+    Returns:
+        Delay in seconds
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def classify_status(status_code: int) -> str:
+    """Return the outcome of a response status code."""
+    if status_code == 429:
+        return 'rate_limited'
+    if status_code >= 500:
+        return 'server_error'
+    if status_code >= 400:
+        return 'client_error'
+    return 'success'
+
+def endpoint_template(url: str) -> str:
+    """
+    Return the endpoint template of a URL, used to group request metrics.
+    
+    Args:
+        url: Absolute request URL
+    
+    Returns:
+        Host and path with names replaced by placeholders, e.g.
+        "api.github.com/repos/{owner}/{repo}/releases/latest"; unknown paths
+        are grouped as "{host}/*"
+    """
+    parts = urlsplit(url)
+    for host, pattern, template in ENDPOINT_TEMPLATES:
+        if parts.netloc == host and re.fullmatch(pattern, parts.path):
+            return host + (template or parts.path)
+    return f"{parts.netloc}/*"
+
+class EndpointMetrics:
+    """Counters and latency histogram of one endpoint template."""
+    
+    __slots__ = ('requests', 'statuses', 'bytes', 'cache_hits', 'latency_total', 'latency_max', 'buckets')
+    
+    def __init__(self):
+        self.requests = 0
+        self.statuses: Dict[str, int] = {}
+        self.bytes = 0
+        self.cache_hits = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a latency percentile (milliseconds) from the histogram.
+        
+        The rank is interpolated linearly inside its bucket; the open last
+        bucket is bounded by the slowest request seen.
+        """
+        timed = sum(self.buckets)
+        if not timed:
+            return 0.0
+        
+        rank = percent / 100 * timed
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS_MS[index - 1] if index else 0
+                upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.latency_max * 1000
+                upper = min(upper, self.latency_max * 1000)
+                return round(lower + (upper - lower) * (rank - seen) / count, 1)
+            seen += count
+        return round(self.latency_max * 1000, 1)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Return the counters, latency percentiles and non-empty histogram buckets."""
+        timed = sum(self.buckets)
+        histogram = {
+            (f"<={bound}ms" if index < len(LATENCY_BUCKETS_MS) else f">{LATENCY_BUCKETS_MS[-1]}ms"): count
+            for index, (bound, count) in enumerate(zip(LATENCY_BUCKETS_MS + (None,), self.buckets))
+            if count
+        }
+        return {
+            'requests': self.requests,
+            'statuses': dict(sorted(self.statuses.items())),
+            'bytes': self.bytes,
+            'cache_hits': self.cache_hits,
+            'latency_ms': {
+                **{f"p{percent}": self.percentile(percent) for percent in LATENCY_PERCENTILES},
+                'mean': round(self.latency_total * 1000 / timed, 1) if timed else 0.0,
+                'max': round(self.latency_max * 1000, 1),
+                'total': round(self.latency_total * 1000, 1)
+            },
+            'histogram': histogram
+        }
+
+class RequestMetrics:
+    """
+    Thread-safe per-endpoint request accounting.
+    
+    Records, per endpoint template, every response (status code and
+    latency), timeouts and connection errors, the body bytes received and
+    the responses served from the response cache. GitHub requests answered
+    with anything but 304 Not Modified are counted as quota used.
+    
+    Example:
+        >>> metrics = tracker.transport.metrics
+        >>> metrics.snapshot()['endpoints'][0]['latency_ms']['p99']
+    """
+    
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.started_at = datetime.now().isoformat()
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._quota_used = 0
+        self._lock = threading.Lock()
+    
+    def _endpoint(self, url: str) -> EndpointMetrics:
+        """Return the metrics of a URL's endpoint template (call with the lock held)."""
+        template = endpoint_template(url)
+        endpoint = self._endpoints.get(template)
+        if endpoint is None:
+            endpoint = self._endpoints[template] = EndpointMetrics()
+        return endpoint
+    
+    def record_request(self, url: str, status: str, latency: float, size: int = 0) -> None:
+        """
+        Record a request sent over the network.
+        
+        Args:
+            url: Request URL
+            status: Status code, or the outcome ('timeout', 'connection_error')
+                    of a request that got no response
+            latency: Seconds until the response headers arrived
+            size: Body bytes received, if already known (see record_bytes())
+        """
+        with self._lock:
+            endpoint = self._endpoint(url)
+            endpoint.requests += 1
+            endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+            endpoint.bytes += size
+            endpoint.latency_total += latency
+            endpoint.latency_max = max(endpoint.latency_max, latency)
+            endpoint.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency * 1000)] += 1
+            if urlsplit(url).netloc == 'api.github.com' and status != '304':
+                self._quota_used += 1
+    
+    def record_bytes(self, url: str, size: int) -> None:
+        """Add body bytes of a streamed response read after record_request()."""
+        with self._lock:
+            self._endpoint(url).bytes += size
+    
+    def record_cache_hit(self, url: str) -> None:
+        """Record a response served from the response cache (fresh or revalidated)."""
+        with self._lock:
+            self._endpoint(url).cache_hits += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the metrics for reports.
+        
+        Returns:
+            Dictionary with totals and the per-endpoint summaries, slowest
+            (by total latency) first
+        """
+        with self._lock:
+            endpoints = [
+                {'endpoint': template, **endpoint.summary()}
+                for template, endpoint in self._endpoints.items()
+            ]
+            quota_used = self._quota_used
+        
+        endpoints.sort(key=lambda endpoint: endpoint['latency_ms']['total'], reverse=True)
+        return {
+            'since': self.started_at,
+            'requests': sum(endpoint['requests'] for endpoint in endpoints),
+            'cache_hits': sum(endpoint['cache_hits'] for endpoint in endpoints),
+            'bytes': sum(endpoint['bytes'] for endpoint in endpoints),
+            'github_quota_used': quota_used,
+            'endpoints': endpoints
+        }
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one host.
+    
+    Closed: requests pass. After failure_threshold consecutive failures the
+    circuit opens and requests are refused for reset_timeout seconds. Then
+    one probe request is let through (half-open): its success closes the
+    circuit, its failure opens it again, and a probe that ends without an
+    outcome (see abandon()) lets the next request probe instead. Not
+    thread-safe on its own; the TransportPolicy lock guards it.
+    """
+    
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+    
+    def allow(self, now: float) -> Optional[float]:
+        """Return None if a request may be sent, else the seconds until the next probe."""
+        if self.state == 'closed':
+            return None
+        
+        retry_in = self.opened_at + self.reset_timeout - now
+        if self.state == 'open' and retry_in <= 0:
+            # Let a single probe request through
+            self.state = 'half_open'
+            return None
+        return max(retry_in, 0.0)
+    
+    def record(self, success: bool, now: float) -> None:
+        """Record the result of a request sent to the host."""
+        if success:
+            self.state = 'closed'
+            self.failures = 0
+            return
+        
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.state = 'open'
+            self.opened_at = now
+    
+    def abandon(self, now: float) -> None:
+        """Let the next request probe again after a probe ended without a recorded outcome."""
+        if self.state == 'half_open':
+            self.state = 'open'
+            self.opened_at = now - self.reset_timeout
+
+class TransportPolicy:
+    """
+    Thread-safe timeouts, retry decisions, circuit breakers and outcome counters.
+    
+    Attributes:
+        connect_timeout (float): Seconds to establish a connection
+        read_timeout (float): Seconds without receiving data before giving up
+        max_retries (int): Retries of a failed idempotent request
+        backoff_base (float): Upper bound of the first backoff
+        backoff_max (float): Upper bound of any backoff
+        outcomes (Dict[str, int]): Number of requests per outcome (see OUTCOMES)
+        retries (int): Number of requests sent again
+        metrics (RequestMetrics): Per-endpoint request accounting
+    
+    Example:
+        >>> transport = TransportPolicy(read_timeout=10, max_retries=2)
+        >>> tracker = GitHubVersionTracker(token="your_token", transport=transport)
+    """
+    
+    def __init__(self, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 metrics: Optional[RequestMetrics] = None):
+        """
+        Initialize the policy.
+        
+        Args:
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds without receiving data before giving up
+            max_retries: Retries of a failed idempotent request
+            backoff_base: Upper bound of the first backoff (seconds)
+            backoff_max: Upper bound of any backoff (seconds)
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds an open circuit waits before a probe request
+            metrics: Optional RequestMetrics to record into. When omitted
+                     metrics are created.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.retries = 0
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """(connect, read) timeout tuple in the form requests expects."""
+        return (self.connect_timeout, self.read_timeout)
+    
+    def before_request(self, host: str) -> None:
+        """
+        Check the host's circuit before sending a request.
+        
+        Args:
+            host: Host the request is sent to
+        
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            retry_in = breaker.allow(time.time()) if breaker is not None else None
+            if retry_in is not None:
+                self.outcomes['circuit_open'] += 1
+                raise CircuitOpenError(host, retry_in)
+    
+    def abandon_request(self, host: str) -> None:
+        """
+        Release the host's circuit after a request ended without an outcome.
+        
+        Called when sending a request raised something other than a
+        transport error (a cancelled task, a bug while reading the body, ...),
+        so a half-open probe does not keep the circuit closed to every later
+        request.
+        
+        Args:
+            host: Host the request was sent to
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is not None:
+                breaker.abandon(time.time())
+    
+    def after_request(self, host: str, method: str, outcome: str, attempt: int,
+                      retry_after: Optional[str] = None, retry_rate_limited: bool = True) -> Optional[float]:
+        """
+        Record the outcome of a request and decide whether to send it again.
+        
+        Args:
+            host: Host the request was sent to
+            method: HTTP method of the request
+            outcome: One of OUTCOMES (see classify_status())
+            attempt: Number of retries already made for the request
+            retry_after: Retry-After header of the response, if any
+            retry_rate_limited: False if 429 responses are handled elsewhere
+                                (GitHub requests go through the rate-limit
+                                scheduler)
+        
+        Returns:
+            Seconds to wait before sending the request again, or None if the
+            outcome is final
+        """
+        failed = outcome in ('server_error', 'timeout', 'connection_error')
+        
+        with self._lock:
+            self.outcomes[outcome] += 1
+            if outcome != 'rate_limited':
+                breaker = self._breakers.get(host)
+                if breaker is None:
+                    breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                breaker.record(not failed, time.time())
+            
+            retryable = failed or (outcome == 'rate_limited' and retry_rate_limited)
+            if not retryable or method.upper() not in RETRY_METHODS or attempt >= self.max_retries:
+                return None
+            
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            if outcome == 'rate_limited' and retry_after is not None and retry_after.isdigit():
+                if int(retry_after) > MAX_RETRY_AFTER:
+                    return None
+                delay = float(retry_after)
+            
+            self.retries += 1
+            return delay
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the outcome counters and open circuits for reports.
+        
+        Returns:
+            Dictionary with the number of requests per outcome, the number
+            of retries and the hosts whose circuit is not closed
+        """
+        with self._lock:
+            open_circuits: List[str] = sorted(
+                host for host, breaker in self._breakers.items() if breaker.state != 'closed'
+            )
+            return {
+                'outcomes': dict(self.outcomes),
+                'retries': self.retries,
+                'open_circuits': open_circuits
+            }
@@ -5,20 +5,155 @@ A tool to generate reports of latest published versions across GitHub repositori
 """
 
 import os
+import sys
 import requests
 import json
 import base64
 import re
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-from tabulate import tabulate
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple, Set, Iterable, Iterator, TYPE_CHECKING
+from dataclasses import dataclass, field, fields, asdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 import click
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import quote, urlsplit
+from response_cache import ResponseCache, SQLiteResponseCache, CachedResponse, make_cache_key, DEFAULT_CACHE_DIR
+from repo_state import RepoStateStore
+from registry_client import RegistryClient, RegistryBodyReader, REGISTRY_CHUNK_SIZE, NPM_BULK_MAX_PACKAGES
+from rate_limiter import (
+    RateLimitScheduler, RateLimitExceeded, resource_for_url, load_tokens, token_ids,
+    MAX_RATE_LIMIT_RETRIES
+)
+from transport import TransportPolicy, CircuitOpenError, classify_status, DEFAULT_MAX_RETRIES
+from single_flight import SingleFlight, request_key
+from profiler import PhaseProfiler, profiled
 
+if TYPE_CHECKING:
+    # rich and tabulate are imported by the renderers that use them, so JSON
+    # reports and library use (e.g. the web app) start without them
+    from rich.console import Console
+    from rich.panel import Panel
+
+# HTTP connection pool defaults (shared keep-alive session per tracker)
+DEFAULT_POOL_CONNECTIONS = 4  # Number of per-host pools kept (GitHub, npm, PyPI, ...)
+DEFAULT_POOL_MAXSIZE = 10  # Keep-alive connections kept open per host
+
+# Concurrent report engine defaults
+DEFAULT_MAX_WORKERS = 8  # Repositories processed in parallel per report
+
+# Host whose requests are governed by the GitHub rate limit
+GITHUB_API_HOST = "api.github.com"
+
+# GitHub and registry answers a stored repository result may be based on (see
+# VersionTrackerBase._tracking_lookups()); anything else, such as a 5xx left
+# after retries, a rate-limited 403 or a failed registry lookup, is not stored
+DEFINITIVE_STATUSES = (200, 304, 404)
+
+# URLs of the repository being processed whose answer was not definitive
+# (a context variable, so it follows threads and asyncio tasks)
+_INCOMPLETE_LOOKUPS: ContextVar[Optional[List[str]]] = ContextVar('incomplete_lookups', default=None)
+
+# Repository listing page size (GitHub maximum)
+REPOS_PER_PAGE = 100
+
+# Server-side type= filters of organization listings (/orgs/{org}/repos);
+# without one, 'sources' (no forks) or 'all' is used depending on include_forks
+ORG_REPO_TYPES = ('all', 'public', 'private', 'forks', 'sources', 'member')
+
+# GraphQL backend settings (batched release lookups, requires a token)
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 100  # Repositories fetched per GraphQL query
+GRAPHQL_RELEASE_FIELDS = """
+fragment ReleaseFields on Repository {
+  stargazerCount
+  forkCount
+  primaryLanguage { name }
+  latestRelease {
+    tagName
+    publishedAt
+    isPrerelease
+    url
+    description
+    releaseAssets(first: 100) { nodes { downloadCount } }
+  }
+}
+"""
+
+# Python manifest files checked for published packages, in priority order
+PYTHON_MANIFEST_FILES = ['setup.py', 'pyproject.toml', 'setup.cfg']
+
+# Package manifests looked up in the repository root, per ecosystem
+PACKAGE_MANIFEST_FILES = {
+    'npm': ['package.json'],
+    'python': PYTHON_MANIFEST_FILES
+}
+
+# Registry ecosystem of each package type, for download statistics
+PACKAGE_REGISTRIES = {
+    'npm': 'npm',
+    'python': 'pypi'
+}
+
+# Packages whose download counts are fetched and written together in NDJSON
+# reports (one npm bulk request), so memory stays bounded however large the account
+NDJSON_PACKAGE_BATCH = NPM_BULK_MAX_PACKAGES
+
+# Report output formats
+OUTPUT_FORMATS = ['table', 'rich', 'json', 'ndjson']
+
+# Characters of release notes kept per release (full notes: get_release_notes())
+RELEASE_NOTES_LENGTH = 1000
+
+# Rich markup tags (e.g. [bold blue], [/red]) removed from plain-text messages
+RICH_MARKUP = re.compile(r"\[/?[a-z][a-z0-9 _#.,=-]*\]")
+
+# Repository listing fields kept by get_user_repos(); the ~100 other fields
+# of every listing entry are dropped as soon as a page is parsed
+REPO_FIELDS = (
+    'name', 'full_name', 'description', 'html_url', 'fork', 'archived', 'size', 'language',
+    'stargazers_count', 'forks_count', 'default_branch', 'pushed_at', 'updated_at'
+)
+
+def slotted(cls: type) -> type:
+    """
+    Rebuild a dataclass with __slots__, so its instances carry no __dict__.
+    
+    Equivalent to @dataclass(slots=True), which needs Python 3.10. Apply it
+    on top of @dataclass.
+    """
+    namespace = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    for name in field_names + ('__dict__', '__weakref__'):
+        # Defaults live in the generated __init__, not as class attributes
+        namespace.pop(name, None)
+    namespace['__slots__'] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+def truncate_release_notes(notes: str, limit: int = RELEASE_NOTES_LENGTH) -> Tuple[str, bool]:
+    """
+    Shorten release notes, preferably at a line break.
+    
+    Args:
+        notes: Release notes (markdown)
+        limit: Maximum number of characters kept
+    
+    Returns:
+        Tuple of (notes, True if they were shortened)
+    """
+    if len(notes) <= limit:
+        return notes, False
+    
+    truncated = notes[:limit]
+    last_newline = truncated.rfind('\n')
+    if last_newline > limit * 0.8:  # If there's a reasonable break point
+        return truncated[:last_newline], True
+    return truncated + "...", True
+
+@slotted
 @dataclass
 class ReleaseInfo:
     """Data class for repository release information."""
@@ -32,7 +167,9 @@ class ReleaseInfo:
     language: str
     stars: int
     forks: int
+    notes_truncated: bool = False  # description holds only the start of the release notes
 
+@slotted
 @dataclass
 class PackageInfo:
     """Data class for package information."""
@@ -40,139 +177,250 @@ class PackageInfo:
     package_type: str
     latest_version: str
     package_url: str
-    downloads: int
+    downloads: int  # Downloads over the last month (see fill_package_downloads())
+    package_name: Optional[str] = None  # Name in the registry, if published
+
+@slotted
+@dataclass
+class RepoResult:
+    """Data class for the processed result of one repository."""
+    index: int  # Position of the repository in the listing
+    repo_name: str
+    language: Optional[str]
+    release: Optional[ReleaseInfo] = None
+    packages: List[PackageInfo] = field(default_factory=list)
+
+@slotted
+@dataclass
+class RepoFilter:
+    """Client-side filters applied to repository listings before any per-repository request."""
+    skip_archived: bool = False  # Skip archived and disabled repositories
+    skip_empty: bool = False  # Skip repositories without content (size 0)
+    max_inactive_days: Optional[int] = None  # Skip repositories not pushed to in this many days
+    
+    def matches(self, repo: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+        """
+        Return whether a repository passes the filters.
+        
+        Args:
+            repo: Repository dictionary of a listing
+            now: Optional reference time for max_inactive_days (default: now)
+        
+        Returns:
+            True if the repository should be processed
+        """
+        if self.skip_archived and (repo.get('archived') or repo.get('disabled')):
+            return False
+        if self.skip_empty and repo.get('size') == 0:
+            return False
+        if self.max_inactive_days is not None:
+            pushed_at = repo.get('pushed_at')
+            if not pushed_at:
+                # Never pushed to
+                return False
+            pushed = datetime.fromisoformat(pushed_at.replace('Z', '+00:00'))
+            if pushed < (now or datetime.now(timezone.utc)) - timedelta(days=self.max_inactive_days):
+                return False
+        return True
 
-class GitHubVersionTracker:
+class PlainConsole:
     """
-    Main class for tracking GitHub repository versions.
+    Minimal stand-in for rich's Console that prints messages without markup.
     
-    This class provides methods to fetch repository information, releases,
-    and published packages from GitHub and package registries.
+    Used for progress messages of table, JSON and NDJSON reports, so they do
+    not import rich.
+    """
+    
+    def __init__(self, file: Optional[Any] = None):
+        """
+        Initialize the console.
+        
+        Args:
+            file: Optional stream to write to (default: sys.stdout at print time)
+        """
+        self.file = file
+    
+    def print(self, message: Any = "", **kwargs) -> None:
+        """Print a message with its rich markup tags removed."""
+        print(RICH_MARKUP.sub("", str(message)), file=self.file)
+
+class VersionTrackerBase:
+    """
+    Shared state, payload parsing and report rendering for version trackers.
+    
+    Holds everything that does not depend on the HTTP client, so the
+    synchronous GitHubVersionTracker and the asyncio-based
+    AsyncGitHubVersionTracker build identical results and reports.
     
     Attributes:
         token (Optional[str]): GitHub personal access token for authentication
+        tokens (List[str]): Pool of tokens rotated by remaining rate-limit budget
+        token_ids (List[str]): Labels of the pooled tokens used in budgets and reports
+        release_notes_length (Optional[int]): Characters of release notes kept per release
         headers (dict): HTTP headers for GitHub API requests
-        console (Console): Rich console for formatted output
-    
-    Example:
-        >>> tracker = GitHubVersionTracker(token="your_github_token")
-        >>> repos = tracker.get_user_repos("fabriziosalmi")
-        >>> tracker.generate_report("fabriziosalmi", output_format="rich")
+        profiler (Optional[PhaseProfiler]): Phase timer of the report, if profiling
+        console (Console): Rich console for formatted output, created on first use
     """
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, tokens: Optional[List[str]] = None,
+                 release_notes_length: Optional[int] = RELEASE_NOTES_LENGTH):
         """
-        Initialize the GitHub Version Tracker.
+        Initialize shared tracker state.
         
         Args:
             token: Optional GitHub personal access token for higher API rate limits.
-                   Without token: 60 requests/hour
-                   With token: 5,000 requests/hour
+            tokens: Optional additional tokens pooled with token. Each request
+                    uses the token with the most remaining quota.
+            release_notes_length: Characters of release notes kept per release,
+                                  or None to keep them in full.
         """
-        self.token = token
+        self.tokens = list(dict.fromkeys(t for t in [token, *(tokens or [])] if t))
+        self.token = self.tokens[0] if self.tokens else None
+        self.token_ids = token_ids(self.tokens)
+        self._tokens_by_id = dict(zip(self.token_ids, self.tokens))
+        self.release_notes_length = release_notes_length
         self.headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'GitHub-Version-Tracker'
         }
-        if token:
-            self.headers['Authorization'] = f'token {token}'
+        if self.token:
+            self.headers['Authorization'] = f'token {self.token}'
         
-        self.console = Console()
+        self.profiler: Optional[PhaseProfiler] = None
+        self._console: Optional['Console'] = None
+    
+    @property
+    def console(self) -> 'Console':
+        """Rich console for formatted output, created (and rich imported) on first use."""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+    
+    @console.setter
+    def console(self, console: 'Console') -> None:
+        self._console = console
     
-    def get_user_repos(self, username: str, include_forks: bool = False) -> List[Dict[str, Any]]:
+    def _report_console(self, output_format: str) -> Any:
         """
-        Get all repositories for a GitHub user.
+        Return the console for the progress messages of a report.
         
-        Fetches all public repositories for the specified user using pagination.
-        Repositories are sorted by last update date in descending order.
+        Rich reports use the rich console; table and JSON reports print plain
+        messages unless the rich console is already in use. NDJSON reports
+        print them to stderr, so stdout carries only JSON lines.
+        """
+        if output_format == 'ndjson':
+            return PlainConsole(sys.stderr)
+        if output_format == 'rich':
+            return self.console
+        return self._message_console()
+    
+    def _select_backend(self, backend: str) -> str:
+        """
+        Validate the release lookup backend.
         
-        Args:
-            username: GitHub username to fetch repositories for
-            include_forks: If True, includes forked repositories. Default is False.
+        The GraphQL API requires a token; without one REST is used instead.
         
-        Returns:
-            List of repository dictionaries containing repository metadata
-            from GitHub API. Returns empty list if user not found or on error.
+        Raises:
+            ValueError: If the backend is neither 'rest' nor 'graphql'
+        """
+        if backend not in ('rest', 'graphql'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == 'graphql' and not self.tokens:
+            self._message_console().print("[yellow]GraphQL backend requires a token, falling back to REST.[/yellow]")
+            return 'rest'
+        return backend
+    
+    def _message_console(self) -> Any:
+        """
+        Return the console for warnings printed outside a report's renderer.
         
-        Example:
-            >>> tracker = GitHubVersionTracker()
-            >>> repos = tracker.get_user_repos("fabriziosalmi", include_forks=False)
-            >>> for repo in repos:
-            ...     print(f"{repo['name']}: {repo['stargazers_count']} stars")
+        Uses the rich console only if it is already in use, so rate-limit
+        pauses, fallbacks and skipped repositories never import rich.
+        """
+        return self.console if self._console is not None else PlainConsole()
+    
+    def _phase(self, name: str):
+        """Time the enclosed code as a profiler phase (no-op without a profiler)."""
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+    
+    @contextmanager
+    def _tracking_lookups(self) -> Iterator[List[str]]:
         """
-        repos = []
-        page = 1
-        per_page = 100
+        Collect the URLs answered with a non-definitive status in the block.
         
-        while True:
-            url = f"https://api.github.com/users/{username}/repos"
-            params = {
-                'page': page,
-                'per_page': per_page,
-                'sort': 'updated',
-                'direction': 'desc'
-            }
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            
-            if response.status_code != 200:
-                self.console.print(f"[red]Error fetching repositories: {response.status_code}[/red]")
-                break
-            
-            page_repos = response.json()
-            if not page_repos:
-                break
-            
-            if not include_forks:
-                page_repos = [repo for repo in page_repos if not repo['fork']]
-            
-            repos.extend(page_repos)
-            page += 1
-            
-            # GitHub API pagination limit
-            if len(page_repos) < per_page:
-                break
+        Results are only saved to the state store when the collected list is
+        empty, so a lookup that failed is not reused as "no release" or as a
+        package without a version.
+        """
+        incomplete: List[str] = []
+        reset_token = _INCOMPLETE_LOOKUPS.set(incomplete)
+        try:
+            yield incomplete
+        finally:
+            _INCOMPLETE_LOOKUPS.reset(reset_token)
+    
+    def _record_lookup(self, url: str, status: int) -> None:
+        """Note an answer that a stored result must not be based on (see _tracking_lookups())."""
+        if status not in DEFINITIVE_STATUSES:
+            self._mark_incomplete(url)
+    
+    def _mark_incomplete(self, url: str) -> None:
+        """Keep the result of the repository being processed out of the state store."""
+        incomplete = _INCOMPLETE_LOOKUPS.get()
+        if incomplete is not None:
+            incomplete.append(url)
+    
+    def _check_registry_answer(self, ecosystem: str, package_name: str,
+                               metadata: Optional[Dict[str, Any]]) -> None:
+        """
+        Mark a registry lookup without metadata as incomplete unless the package is known to be missing.
         
-        return repos
+        Lookups that waited for another thread's request never see its
+        status, so the registry client's cache decides: only 200 and 404
+        answers are cached.
+        """
+        if metadata is None and not self.registry_client.is_known(ecosystem, package_name):
+            self._mark_incomplete(self.registry_client.url_for(ecosystem, package_name))
     
-    def get_latest_release(self, repo_owner: str, repo_name: str) -> Optional[ReleaseInfo]:
+    def _with_token(self, token_id: str, headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
         """
-        Get the latest release information for a repository.
+        Return request headers authenticated with a pooled token.
         
-        Fetches the most recent GitHub release and combines it with repository
-        metadata like stars, forks, and programming language.
+        Args:
+            token_id: Label of the token picked by the rate-limit scheduler
+            headers: Request headers (usually self.headers)
+        
+        Returns:
+            Headers with the Authorization of the picked token
+        """
+        token = self._tokens_by_id.get(token_id)
+        if token is None:
+            return headers
+        return {**(headers or {}), 'Authorization': f'token {token}'}
+    
+    def _build_release_info(self, repo_owner: str, repo_name: str,
+                            release_data: Dict[str, Any], repo_info: Dict[str, Any]) -> ReleaseInfo:
+        """
+        Build a ReleaseInfo from GitHub release and repository payloads.
         
         Args:
             repo_owner: Repository owner's GitHub username
             repo_name: Name of the repository
+            release_data: JSON payload of /repos/{owner}/{repo}/releases/latest
+            repo_info: JSON payload of /repos/{owner}/{repo} (may be empty)
         
         Returns:
-            ReleaseInfo object containing release details, or None if no release
-            exists or if the repository is not found.
-        
-        Example:
-            >>> tracker = GitHubVersionTracker()
-            >>> release = tracker.get_latest_release("fabriziosalmi", "versiontracker")
-            >>> if release:
-            ...     print(f"Version: {release.latest_version}")
-            ...     print(f"Downloads: {release.download_count}")
+            ReleaseInfo object
         """
-        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-        
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code != 200:
-            return None
-        
-        release_data = response.json()
-        
         # Calculate total download count
         download_count = sum(asset.get('download_count', 0) for asset in release_data.get('assets', []))
         
-        # Get repository info
-        repo_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
-        repo_response = requests.get(repo_url, headers=self.headers)
-        repo_info = repo_response.json() if repo_response.status_code == 200 else {}
+        # Keep only the start of long release notes (see get_release_notes())
+        description = release_data.get('body', '') or 'No description'
+        notes_truncated = False
+        if self.release_notes_length is not None:
+            description, notes_truncated = truncate_release_notes(description, self.release_notes_length)
         
         return ReleaseInfo(
             repo_name=f"{repo_owner}/{repo_name}",
@@ -181,143 +429,237 @@ class GitHubVersionTracker:
             release_url=release_data.get('html_url', ''),
             download_count=download_count,
             is_prerelease=release_data.get('prerelease', False),
-            description=release_data.get('body', '') or 'No description',
+            description=description,
             language=repo_info.get('language') or 'Unknown',
             stars=repo_info.get('stargazers_count', 0),
-            forks=repo_info.get('forks_count', 0)
+            forks=repo_info.get('forks_count', 0),
+            notes_truncated=notes_truncated
         )
     
-    def get_packages(self, repo_owner: str, repo_name: str) -> List[PackageInfo]:
+    def _build_graphql_release_query(self, repo_names: List[Tuple[str, str]]) -> Tuple[str, Dict[str, str]]:
         """
-        Get published packages for a repository.
+        Build an aliased GraphQL query fetching releases for many repositories.
         
-        Detects and fetches information about packages published from this
-        repository to package registries (npm, PyPI, etc.).
+        Each repository becomes an aliased field (r0, r1, ...) with its owner
+        and name passed as variables, so names never need escaping.
+        
+        Args:
+            repo_names: List of (owner, name) tuples
+        
+        Returns:
+            Tuple of (query string, variables dictionary)
+        """
+        params = []
+        fields = []
+        variables = {}
+        
+        for index, (repo_owner, repo_name) in enumerate(repo_names):
+            params.append(f"$o{index}: String!, $n{index}: String!")
+            fields.append(f"  r{index}: repository(owner: $o{index}, name: $n{index}) {{ ...ReleaseFields }}")
+            variables[f"o{index}"] = repo_owner
+            variables[f"n{index}"] = repo_name
+        
+        query = f"query({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n" + GRAPHQL_RELEASE_FIELDS
+        return query, variables
+    
+    def _graphql_release_info(self, repo_owner: str, repo_name: str, node: Dict[str, Any]) -> Optional[ReleaseInfo]:
+        """
+        Map a GraphQL repository node to a ReleaseInfo.
         
         Args:
             repo_owner: Repository owner's GitHub username
             repo_name: Name of the repository
+            node: Repository node with the ReleaseFields fragment
         
         Returns:
-            List of PackageInfo objects for detected packages. Returns empty
-            list if no packages are found or on error.
+            ReleaseInfo object, or None if the repository has no release
+        """
+        release = node.get('latestRelease')
+        if not release:
+            return None
         
-        Note:
-            Currently supports:
-            - npm packages (via package.json)
-            - Python packages (via setup.py, pyproject.toml, setup.cfg)
+        # Map GraphQL fields onto the REST payload shapes
+        release_data = {
+            'tag_name': release.get('tagName') or 'N/A',
+            'published_at': release.get('publishedAt'),
+            'html_url': release.get('url'),
+            'prerelease': release.get('isPrerelease', False),
+            'body': release.get('description'),
+            'assets': [
+                {'download_count': asset.get('downloadCount', 0)}
+                for asset in (release.get('releaseAssets') or {}).get('nodes', [])
+            ]
+        }
+        repo_info = {
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'stargazers_count': node.get('stargazerCount', 0),
+            'forks_count': node.get('forkCount', 0)
+        }
         
-        Example:
-            >>> tracker = GitHubVersionTracker()
-            >>> packages = tracker.get_packages("fabriziosalmi", "versiontracker")
-            >>> for pkg in packages:
-            ...     print(f"{pkg.package_type}: {pkg.latest_version}")
+        return self._build_release_info(repo_owner, repo_name, release_data, repo_info)
+    
+    def _repo_page_params(self, page: int, repo_type: Optional[str] = None) -> Dict[str, Any]:
+        """Return the query parameters for one page of a repository listing (type= for organizations)."""
+        params = {
+            'page': page,
+            'per_page': REPOS_PER_PAGE,
+            'sort': 'updated',
+            'direction': 'desc'
+        }
+        if repo_type is not None:
+            params['type'] = repo_type
+        return params
+    
+    def _org_repo_type(self, include_forks: bool, repo_type: Optional[str]) -> str:
         """
-        packages = []
+        Return the type= filter of an organization listing.
         
-        # Check for npm packages
-        npm_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/package.json"
-        npm_response = requests.get(npm_url, headers=self.headers)
+        Without an explicit type, forks that would be dropped anyway are
+        filtered by GitHub ('sources') instead of being downloaded.
+        """
+        if repo_type is None:
+            return 'all' if include_forks else 'sources'
+        if repo_type not in ORG_REPO_TYPES:
+            raise ValueError(f"Unknown repository type: {repo_type}")
+        return repo_type
+    
+    def _last_page(self, link_header: Optional[str]) -> int:
+        """
+        Return the number of the last page from a Link response header.
         
-        if npm_response.status_code == 200:
-            try:
-                # Get package.json content
-                content = base64.b64decode(npm_response.json()['content']).decode('utf-8')
-                package_data = json.loads(content)
-                package_name = package_data.get('name')
-                
-                if package_name:
-                    # Try to get npm package info
-                    npm_api_url = f"https://registry.npmjs.org/{package_name}"
-                    npm_pkg_response = requests.get(npm_api_url)
-                    
-                    if npm_pkg_response.status_code == 200:
-                        npm_data = npm_pkg_response.json()
-                        latest_version = npm_data.get('dist-tags', {}).get('latest', 'Unknown')
-                        
-                        packages.append(PackageInfo(
-                            repo_name=f"{repo_owner}/{repo_name}",
-                            package_type="npm",
-                            latest_version=latest_version,
-                            package_url=f"https://www.npmjs.com/package/{package_name}",
-                            downloads=0  # Would need additional API call to get download stats
-                        ))
-            except Exception:
-                pass
+        Args:
+            link_header: Value of the Link header, or None
         
-        # Check for Python packages (setup.py, pyproject.toml)
-        python_files = ['setup.py', 'pyproject.toml', 'setup.cfg']
-        for file in python_files:
-            py_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file}"
-            py_response = requests.get(py_url, headers=self.headers)
-            
-            if py_response.status_code == 200:
-                try:
-                    # Try to get package name from the file
-                    package_name = None
-                    
-                    if file == 'setup.py':
-                        # Try to extract package name from setup.py
-                        content = base64.b64decode(py_response.json()['content']).decode('utf-8')
-                        # Simple regex to find name parameter
-                        name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-                        if name_match:
-                            package_name = name_match.group(1)
-                    
-                    elif file == 'pyproject.toml':
-                        # Try to extract package name from pyproject.toml
-                        content = base64.b64decode(py_response.json()['content']).decode('utf-8')
-                        name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-                        if name_match:
-                            package_name = name_match.group(1)
-                    
-                    if package_name:
-                        # Try to get PyPI package info
-                        pypi_url = f"https://pypi.org/pypi/{package_name}/json"
-                        pypi_response = requests.get(pypi_url)
-                        
-                        if pypi_response.status_code == 200:
-                            pypi_data = pypi_response.json()
-                            latest_version = pypi_data.get('info', {}).get('version', 'Unknown')
-                            
-                            packages.append(PackageInfo(
-                                repo_name=f"{repo_owner}/{repo_name}",
-                                package_type="python",
-                                latest_version=latest_version,
-                                package_url=f"https://pypi.org/project/{package_name}/",
-                                downloads=0
-                            ))
-                        else:
-                            # Fallback if PyPI lookup fails
-                            packages.append(PackageInfo(
-                                repo_name=f"{repo_owner}/{repo_name}",
-                                package_type="python",
-                                latest_version="Unknown",
-                                package_url=f"https://github.com/{repo_owner}/{repo_name}",
-                                downloads=0
-                            ))
-                    else:
-                        # Fallback if we can't extract package name
-                        packages.append(PackageInfo(
-                            repo_name=f"{repo_owner}/{repo_name}",
-                            package_type="python",
-                            latest_version="Unknown",
-                            package_url=f"https://github.com/{repo_owner}/{repo_name}",
-                            downloads=0
-                        ))
-                        
-                except Exception:
-                    # Fallback on any error
-                    packages.append(PackageInfo(
-                        repo_name=f"{repo_owner}/{repo_name}",
-                        package_type="python",
-                        latest_version="Unknown",
-                        package_url=f"https://github.com/{repo_owner}/{repo_name}",
-                        downloads=0
-                    ))
-                break
+        Returns:
+            Page number of the rel="last" link, or 1 if there is none
+        """
+        for link in (link_header or '').split(','):
+            if 'rel="last"' in link:
+                match = re.search(r'[?&]page=(\d+)', link)
+                if match:
+                    return int(match.group(1))
+        return 1
+    
+    def _listing_repos(self, page_repos: List[Dict[str, Any]], include_forks: bool,
+                       repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """
+        Return the compact repositories of a listing page.
         
-        return packages
+        Forks are dropped unless they are included, as are repositories
+        rejected by repo_filter, and every repository is reduced to
+        REPO_FIELDS (and the owner to its login).
+        """
+        now = datetime.now(timezone.utc)
+        return [
+            {**{key: repo[key] for key in REPO_FIELDS if key in repo}, 'owner': {'login': repo['owner']['login']}}
+            for repo in page_repos
+            if (include_forks or not repo['fork']) and (repo_filter is None or repo_filter.matches(repo, now))
+        ]
+    
+    def _tree_url(self, repo_owner: str, repo_name: str, repo_meta: Optional[Dict[str, Any]] = None) -> str:
+        """Return the git tree URL of a repository's default branch root."""
+        ref = (repo_meta or {}).get('default_branch') or 'HEAD'
+        return f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/trees/{quote(ref)}"
+    
+    def _root_files(self, status_code: int, payload: Any) -> Optional[Set[str]]:
+        """
+        Extract the file names in a repository root from a git tree response.
+        
+        Args:
+            status_code: HTTP status code of the tree request
+            payload: Decoded JSON body of the tree request
+        
+        Returns:
+            Set of root file names, an empty set for empty repositories, or
+            None if the tree could not be read (manifests are then probed)
+        """
+        if status_code == 200 and isinstance(payload, dict):
+            return {entry['path'] for entry in payload.get('tree', []) if entry.get('type') == 'blob'}
+        if status_code == 409:
+            # Git repository is empty
+            return set()
+        return None
+    
+    def _manifest_files(self, root_files: Optional[Set[str]]) -> List[str]:
+        """
+        Return the manifest files worth fetching for a repository.
+        
+        Args:
+            root_files: File names in the repository root, or None if unknown
+        
+        Returns:
+            Manifests present in the root, or every candidate if the root
+            listing is unknown
+        """
+        candidates = [file for files in PACKAGE_MANIFEST_FILES.values() for file in files]
+        if root_files is None:
+            return candidates
+        return [file for file in candidates if file in root_files]
+    
+    def _decode_content(self, payload: Dict[str, Any]) -> str:
+        """Decode the base64 file content of a GitHub contents API response."""
+        return base64.b64decode(payload['content']).decode('utf-8')
+    
+    def _extract_package_name(self, file: str, content: str) -> Optional[str]:
+        """
+        Extract the published package name from a manifest file.
+        
+        Args:
+            file: Manifest file name (package.json, setup.py, pyproject.toml, setup.cfg)
+            content: Decoded file content
+        
+        Returns:
+            Package name, or None if it cannot be determined
+        """
+        if file == 'package.json':
+            return json.loads(content).get('name')
+        
+        if file in ('setup.py', 'pyproject.toml'):
+            # Simple regex to find name parameter
+            name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
+            if name_match:
+                return name_match.group(1)
+        
+        return None
+    
+    def _npm_package_info(self, repo_owner: str, repo_name: str,
+                          package_name: str, npm_data: Dict[str, Any]) -> PackageInfo:
+        """Build a PackageInfo from an npm registry document."""
+        return PackageInfo(
+            repo_name=f"{repo_owner}/{repo_name}",
+            package_type="npm",
+            latest_version=npm_data.get('dist-tags', {}).get('latest', 'Unknown'),
+            package_url=f"https://www.npmjs.com/package/{package_name}",
+            downloads=0,  # Filled in by fill_package_downloads()
+            package_name=package_name
+        )
+    
+    def _python_package_info(self, repo_owner: str, repo_name: str,
+                             package_name: Optional[str] = None,
+                             pypi_data: Optional[Dict[str, Any]] = None) -> PackageInfo:
+        """
+        Build a PackageInfo for a Python package.
+        
+        Falls back to an "Unknown" version pointing at the GitHub repository
+        when the package name could not be extracted or the PyPI lookup failed.
+        """
+        if package_name and pypi_data is not None:
+            return PackageInfo(
+                repo_name=f"{repo_owner}/{repo_name}",
+                package_type="python",
+                latest_version=pypi_data.get('info', {}).get('version', 'Unknown'),
+                package_url=f"https://pypi.org/project/{package_name}/",
+                downloads=0,
+                package_name=package_name
+            )
+        
+        return PackageInfo(
+            repo_name=f"{repo_owner}/{repo_name}",
+            package_type="python",
+            latest_version="Unknown",
+            package_url=f"https://github.com/{repo_owner}/{repo_name}",
+            downloads=0
+        )
     
     def _format_date(self, date_str: str) -> str:
         """
@@ -338,64 +680,248 @@ class GitHubVersionTracker:
         except Exception:
             return date_str
     
-    def generate_report(self, username: str, include_forks: bool = False, output_format: str = 'table') -> None:
-        """
-        Generate and display a comprehensive version report.
-        
-        Fetches all repositories for the user, gets release information,
-        detects published packages, and displays a formatted report.
+    def _rate_limit_summary(self) -> Optional[Dict[str, Any]]:
+        """Return the API budget state to include in reports, if tracked."""
+        rate_limiter = getattr(self, 'rate_limiter', None)
+        return rate_limiter.snapshot() if rate_limiter is not None else None
+    
+    def _rate_limit_lines(self) -> List[str]:
+        """Return human-readable lines describing the API budget state."""
+        summary = self._rate_limit_summary()
+        if not summary:
+            return []
         
-        Args:
-            username: GitHub username to analyze
-            include_forks: If True, includes forked repositories. Default is False.
-            output_format: Output format - 'rich' (colored tables), 'table' (plain text),
-                          or 'json' (machine-readable). Default is 'table'.
+        lines = [
+            f"{bucket['resource']} ({bucket['token']}): {bucket['remaining']:,}/{bucket['limit']:,} "
+            f"remaining, resets at {bucket['reset_at']}"
+            for bucket in summary['buckets']
+        ]
+        if summary['paused_seconds'] or summary['rate_limited_responses']:
+            lines.append(f"Paused {summary['paused_seconds']}s for rate limits "
+                         f"({summary['rate_limited_responses']} rate-limited responses)")
+        return lines
+    
+    def _transport_summary(self) -> Optional[Dict[str, Any]]:
+        """Return the request outcome counters to include in reports, if tracked."""
+        transport = getattr(self, 'transport', None)
+        return transport.snapshot() if transport is not None else None
+    
+    def _transport_lines(self) -> List[str]:
+        """Return human-readable lines describing request failures, retries and open circuits."""
+        summary = self._transport_summary()
+        if not summary:
+            return []
         
-        Note:
-            - This method outputs directly to console or file, doesn't return data
-            - For programmatic access, use get_user_repos(), get_latest_release(),
-              and get_packages() methods directly
+        failures = {outcome: count for outcome, count in summary['outcomes'].items()
+                    if outcome != 'success' and count}
+        lines = []
+        if failures or summary['retries']:
+            counts = ", ".join(f"{count} {outcome.replace('_', ' ')}" for outcome, count in failures.items())
+            lines.append(f"{summary['outcomes']['success']} successful requests, {summary['retries']} retries"
+                         + (f" ({counts})" if counts else ""))
+        if summary['open_circuits']:
+            lines.append(f"Circuit open for {', '.join(summary['open_circuits'])}")
+        return lines
+    
+    def _performance_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the request accounting to include in reports, if tracked.
         
-        Example:
-            >>> tracker = GitHubVersionTracker(token="your_token")
-            >>> tracker.generate_report("fabriziosalmi", output_format="rich")
+        Per endpoint template: requests, status codes, bytes, response cache
+        hits and latency percentiles (see RequestMetrics), plus the GitHub
+        quota used, npm/PyPI lookups answered by the registry cache and the
+        requests coalesced with an identical one in flight.
         """
-        self.console.print(f"[bold blue]Fetching repositories for {username}...[/bold blue]")
+        transport = getattr(self, 'transport', None)
+        if transport is None:
+            return None
         
-        repos = self.get_user_repos(username, include_forks)
+        summary = transport.metrics.snapshot()
+        registry_client = getattr(self, 'registry_client', None)
+        if registry_client is not None:
+            summary['registry_cache'] = {
+                'hits': registry_client.hits,
+                'misses': registry_client.misses,
+                'coalesced': registry_client.coalesced
+            }
+        single_flight = getattr(self, 'single_flight', None)
+        if single_flight is not None:
+            summary['coalesced_requests'] = single_flight.coalesced
+        return summary
+    
+    def _performance_panel(self) -> Optional['Panel']:
+        """Return the rich footer panel with per-endpoint request accounting, if tracked."""
+        summary = self._performance_summary()
+        if not summary or not (summary['requests'] or summary['cache_hits']):
+            return None
         
-        if not repos:
-            self.console.print("[red]No repositories found or error occurred.[/red]")
-            return
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.table import Table
         
-        self.console.print(f"[green]Found {len(repos)} repositories. Checking for releases...[/green]")
+        totals = (f"[bold]Requests:[/bold] {summary['requests']:,}  "
+                  f"[bold]Cache hits:[/bold] {summary['cache_hits']:,}  "
+                  f"[bold]Received:[/bold] {summary['bytes'] / 1024:,.0f} KB  "
+                  f"[bold]GitHub quota used:[/bold] {summary['github_quota_used']:,}")
         
-        releases = []
-        packages = []
+        table = Table(show_header=True, header_style="bold magenta", box=None)
+        table.add_column("Endpoint", style="cyan")
+        table.add_column("Requests", justify="right")
+        table.add_column("Statuses")
+        table.add_column("Cache hits", justify="right")
+        table.add_column("KB", justify="right")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p90 ms", justify="right")
+        table.add_column("p99 ms", justify="right", style="yellow")
         
-        for repo in repos:
-            repo_owner = repo['owner']['login']
-            repo_name = repo['name']
-            
-            # Get latest release
-            release = self.get_latest_release(repo_owner, repo_name)
-            if release:
-                releases.append(release)
-            
-            # Get packages
-            repo_packages = self.get_packages(repo_owner, repo_name)
-            packages.extend(repo_packages)
+        for endpoint in summary['endpoints']:
+            latency = endpoint['latency_ms']
+            table.add_row(
+                endpoint['endpoint'],
+                f"{endpoint['requests']:,}",
+                " ".join(f"{status}:{count}" for status, count in endpoint['statuses'].items()),
+                f"{endpoint['cache_hits']:,}",
+                f"{endpoint['bytes'] / 1024:,.0f}",
+                f"{latency['p50']:,.0f}",
+                f"{latency['p90']:,.0f}",
+                f"{latency['p99']:,.0f}"
+            )
         
-        # Display results
-        if output_format == 'rich':
+        return Panel(Group(totals, table), title="Performance", border_style="dim")
+    
+    def _repo_result(self, index: int, repo: Dict[str, Any], release: Optional[ReleaseInfo],
+                     packages: List[PackageInfo]) -> RepoResult:
+        """Wrap the release and packages of a listed repository into a RepoResult."""
+        return RepoResult(
+            index=index,
+            repo_name=f"{repo['owner']['login']}/{repo['name']}",
+            language=repo.get('language'),
+            release=release,
+            packages=packages
+        )
+    
+    def _state_record(self, release: Optional[ReleaseInfo], packages: List[PackageInfo]) -> Dict[str, Any]:
+        """Serialize a repository result for the state store."""
+        return {
+            'release': asdict(release) if release else None,
+            'packages': [asdict(package) for package in packages]
+        }
+    
+    def _result_from_state(self, repo: Dict[str, Any],
+                           record: Dict[str, Any]) -> Tuple[Optional[ReleaseInfo], List[PackageInfo]]:
+        """
+        Rebuild a stored repository result, refreshed with the current listing.
+        
+        Stars, forks and language change without a push, so they are taken
+        from the new listing payload rather than from the stored result.
+        """
+        release = None
+        if record.get('release'):
+            release = ReleaseInfo(**record['release'])
+            release.language = repo.get('language', release.language)
+            release.stars = repo.get('stargazers_count', release.stars)
+            release.forks = repo.get('forks_count', release.forks)
+        
+        return release, [PackageInfo(**package) for package in record.get('packages', [])]
+    
+    def _collect_results(self, results: Iterable[RepoResult]) -> Tuple[List[ReleaseInfo], List[PackageInfo]]:
+        """Gather the releases and packages of streamed results, in arrival order."""
+        releases = []
+        packages = []
+        
+        for result in results:
+            if result.release:
+                releases.append(result.release)
+            packages.extend(result.packages)
+        
+        return releases, packages
+    
+    def _download_targets(self, packages: List[PackageInfo]) -> List[Optional[Tuple[str, str]]]:
+        """Return the (ecosystem, name) registry key of every package, or None if it is not published."""
+        return [
+            (PACKAGE_REGISTRIES[package.package_type], package.package_name)
+            if package.package_name and package.package_type in PACKAGE_REGISTRIES else None
+            for package in packages
+        ]
+    
+    def _apply_downloads(self, packages: List[PackageInfo], targets: List[Optional[Tuple[str, str]]],
+                         counts: Dict[Tuple[str, str], int]) -> None:
+        """Set the download counts fetched for packages."""
+        for package, target in zip(packages, targets):
+            if target in counts:
+                package.downloads = counts[target]
+    
+    def _fill_report_downloads(self, packages: List[PackageInfo]) -> None:
+        """
+        Fill package download counts while a report is rendered.
+        
+        The threaded tracker fetches them here, once every repository has
+        been processed; the async tracker fills them before rendering.
+        """
+    
+    def _release_record(self, release: ReleaseInfo) -> Dict[str, Any]:
+        """Return the JSON representation of a release."""
+        return {
+            "repo_name": release.repo_name,
+            "latest_version": release.latest_version,
+            "release_date": release.release_date,
+            "release_url": release.release_url,
+            "download_count": release.download_count,
+            "is_prerelease": release.is_prerelease,
+            "description": release.description,
+            "language": release.language,
+            "stars": release.stars,
+            "forks": release.forks
+        }
+    
+    def _package_record(self, package: PackageInfo) -> Dict[str, Any]:
+        """Return the JSON representation of a package."""
+        return {
+            "repo_name": package.repo_name,
+            "package_type": package.package_type,
+            "latest_version": package.latest_version,
+            "package_url": package.package_url,
+            "downloads": package.downloads
+        }
+    
+    def _render_report(self, results: Iterable[RepoResult], username: str, output_format: str,
+                       total: Optional[int] = None) -> None:
+        """
+        Display streamed results in the requested output format.
+        
+        JSON and NDJSON output is written while results arrive. The rich and
+        table reports are sorted by stars, so they keep only the compact
+        release and package records until every result is in.
+        
+        Args:
+            results: Per-repository results, e.g. from iter_repo_results()
+            username: GitHub username the report is for
+            output_format: 'rich', 'table', 'json' or 'ndjson'
+            total: Optional number of repositories, shown in the rich progress line
+        """
+        if output_format == 'json':
+            self._display_json_report(results)
+        elif output_format == 'ndjson':
+            self._display_ndjson_report(results)
+        elif output_format == 'rich':
+            with self.console.status("Processing repositories...") as status:
+                def progress() -> Iterator[RepoResult]:
+                    for done, result in enumerate(results, 1):
+                        status.update(f"Processed {done}/{total or '?'} repositories...")
+                        yield result
+                releases, packages = self._collect_results(progress())
+            self._fill_report_downloads(packages)
             self._display_rich_report(releases, packages, username)
-        elif output_format == 'json':
-            self._display_json_report(releases, packages)
         else:
+            releases, packages = self._collect_results(results)
+            self._fill_report_downloads(packages)
             self._display_table_report(releases, packages)
     
+    @profiled('output rendering')
     def _display_rich_report(self, releases: List[ReleaseInfo], packages: List[PackageInfo], username: str) -> None:
         """Display report using Rich formatting."""
+        from rich.panel import Panel
+        from rich.table import Table
         
         # Summary panel
         total_downloads = sum(r.download_count for r in releases)
@@ -410,6 +936,13 @@ class GitHubVersionTracker:
 [bold]Report Generated:[/bold] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """
         
+        budget_lines = self._rate_limit_lines()
+        if budget_lines:
+            summary_text += "[bold]API Budget:[/bold]\n" + "\n".join(f"  {line}" for line in budget_lines) + "\n"
+        network_lines = self._transport_lines()
+        if network_lines:
+            summary_text += "[bold]Network:[/bold]\n" + "\n".join(f"  {line}" for line in network_lines) + "\n"
+        
         self.console.print(Panel(summary_text, title=f"GitHub Version Report - {username}", border_style="blue"))
         
         if releases:
@@ -443,6 +976,7 @@ class GitHubVersionTracker:
             pkg_table.add_column("Repository", style="cyan")
             pkg_table.add_column("Package Type", style="magenta")
             pkg_table.add_column("Latest Version", style="green")
+            pkg_table.add_column("Downloads (30d)", justify="right", style="green")
             pkg_table.add_column("Package URL", style="blue")
             
             for package in packages:
@@ -450,13 +984,20 @@ class GitHubVersionTracker:
                     package.repo_name,
                     package.package_type,
                     package.latest_version,
+                    f"{package.downloads:,}",
                     package.package_url
                 )
             
             self.console.print(pkg_table)
+        
+        performance = self._performance_panel()
+        if performance is not None:
+            self.console.print(performance)
     
+    @profiled('output rendering')
     def _display_table_report(self, releases: List[ReleaseInfo], packages: List[PackageInfo]) -> None:
         """Display report using simple tables."""
+        from tabulate import tabulate
         
         if releases:
             print("\n" + "="*80)
@@ -484,7 +1025,7 @@ class GitHubVersionTracker:
             print("PUBLISHED PACKAGES")
             print("="*80)
             
-            headers = ["Repository", "Type", "Version", "URL"]
+            headers = ["Repository", "Type", "Version", "Downloads (30d)", "URL"]
             rows = []
             
             for package in packages:
@@ -492,6 +1033,7 @@ class GitHubVersionTracker:
                     package.repo_name,
                     package.package_type,
                     package.latest_version,
+                    package.downloads,
                     package.package_url
                 ])
             
@@ -508,61 +1050,1155 @@ class GitHubVersionTracker:
         print(f"Published packages: {len(packages)}")
         print(f"Total download count: {total_downloads:,}")
         print(f"Total stars: {total_stars:,}")
+        
+        for line in self._rate_limit_lines():
+            print(f"API budget: {line}")
+        for line in self._transport_lines():
+            print(f"Network: {line}")
     
-    def _display_json_report(self, releases: List[ReleaseInfo], packages: List[PackageInfo]) -> None:
-        """Display report in JSON format."""
-        
-        report_data = {
-            "generated_at": datetime.now().isoformat(),
-            "summary": {
-                "total_releases": len(releases),
-                "total_packages": len(packages),
-                "total_downloads": sum(r.download_count for r in releases),
-                "total_stars": sum(r.stars for r in releases),
-                "total_forks": sum(r.forks for r in releases)
-            },
-            "releases": [
-                {
-                    "repo_name": r.repo_name,
-                    "latest_version": r.latest_version,
-                    "release_date": r.release_date,
-                    "release_url": r.release_url,
-                    "download_count": r.download_count,
-                    "is_prerelease": r.is_prerelease,
-                    "description": r.description,
-                    "language": r.language,
-                    "stars": r.stars,
-                    "forks": r.forks
-                } for r in releases
-            ],
-            "packages": [
-                {
-                    "repo_name": p.repo_name,
-                    "package_type": p.package_type,
-                    "latest_version": p.latest_version,
-                    "package_url": p.package_url,
-                    "downloads": p.downloads
-                } for p in packages
-            ]
+    def _json_field(self, key: str, value: Any, indent: str = '  ') -> str:
+        """Format one member of the JSON report, indented like json.dumps(indent=2)."""
+        return f"{indent}{json.dumps(key)}: " + json.dumps(value, indent=2).replace('\n', '\n' + indent)
+    
+    def _display_json_report(self, results: Iterable[RepoResult]) -> None:
+        """
+        Display report in JSON format.
+        
+        Releases are written as soon as their result arrives; packages (with
+        their download counts) and the summary follow once every repository
+        has been processed.
+        """
+        packages = []
+        summary = {
+            "total_releases": 0,
+            "total_packages": 0,
+            "total_downloads": 0,
+            "total_package_downloads": 0,
+            "total_stars": 0,
+            "total_forks": 0
         }
         
-        print(json.dumps(report_data, indent=2))
+        print("{")
+        print(self._json_field("generated_at", datetime.now().isoformat()) + ",")
+        print('  "releases": [', end='')
+        
+        for result in results:
+            packages.extend(result.packages)
+            release = result.release
+            if not release:
+                continue
+            
+            with self._phase('output rendering'):
+                separator = ",\n" if summary["total_releases"] else "\n"
+                record = json.dumps(self._release_record(release), indent=2).replace('\n', '\n    ')
+                print(f"{separator}    {record}", end='', flush=True)
+            
+            summary["total_releases"] += 1
+            summary["total_downloads"] += release.download_count
+            summary["total_stars"] += release.stars
+            summary["total_forks"] += release.forks
+        
+        print("\n  ]," if summary["total_releases"] else "],")
+        self._fill_report_downloads(packages)
+        summary["total_packages"] = len(packages)
+        summary["total_package_downloads"] = sum(p.downloads for p in packages)
+        
+        with self._phase('output rendering'):
+            members = [("packages", [self._package_record(p) for p in packages]), ("summary", summary)]
+            for key, value in (("rate_limit", self._rate_limit_summary()), ("transport", self._transport_summary()),
+                               ("performance", self._performance_summary())):
+                if value is not None:
+                    members.append((key, value))
+            print(",\n".join(self._json_field(key, value) for key, value in members))
+            print("}")
+    
+    def _display_ndjson_report(self, results: Iterable[RepoResult]) -> None:
+        """
+        Display report as newline-delimited JSON.
+        
+        Writes one line per release as soon as its result arrives and one
+        line per package once NDJSON_PACKAGE_BATCH packages are waiting (their
+        download counts are fetched together), then a summary line. Only the
+        waiting packages are held, so memory use does not grow with the
+        number of repositories.
+        """
+        pending: List[PackageInfo] = []
+        summary = self._ndjson_summary()
+        
+        for result in results:
+            self._write_ndjson_release(result.release, summary)
+            pending.extend(result.packages)
+            if len(pending) >= NDJSON_PACKAGE_BATCH:
+                self._fill_report_downloads(pending)
+                self._write_ndjson_packages(pending, summary)
+        
+        if pending:
+            self._fill_report_downloads(pending)
+            self._write_ndjson_packages(pending, summary)
+        
+        self._write_ndjson_summary(summary)
+    
+    def _ndjson_summary(self) -> Dict[str, int]:
+        """Return the zeroed running totals of an NDJSON report."""
+        return {
+            "total_releases": 0,
+            "total_packages": 0,
+            "total_downloads": 0,
+            "total_package_downloads": 0,
+            "total_stars": 0,
+            "total_forks": 0
+        }
+    
+    def _write_ndjson_release(self, release: Optional[ReleaseInfo], summary: Dict[str, int]) -> None:
+        """Write the NDJSON line of a release, if any, and add it to the totals."""
+        if not release:
+            return
+        with self._phase('output rendering'):
+            print(json.dumps({"type": "release", **self._release_record(release)}), flush=True)
+        summary["total_releases"] += 1
+        summary["total_downloads"] += release.download_count
+        summary["total_stars"] += release.stars
+        summary["total_forks"] += release.forks
+    
+    def _write_ndjson_packages(self, packages: List[PackageInfo], summary: Dict[str, int]) -> None:
+        """Write the NDJSON lines of packages with filled download counts, then forget them."""
+        with self._phase('output rendering'):
+            for package in packages:
+                print(json.dumps({"type": "package", **self._package_record(package)}), flush=True)
+                summary["total_package_downloads"] += package.downloads
+        summary["total_packages"] += len(packages)
+        packages.clear()
+    
+    def _write_ndjson_summary(self, summary: Dict[str, int]) -> None:
+        """Write the closing NDJSON summary line."""
+        with self._phase('output rendering'):
+            record = {"type": "summary", "generated_at": datetime.now().isoformat(), "summary": summary}
+            for key, value in (("rate_limit", self._rate_limit_summary()), ("transport", self._transport_summary()),
+                               ("performance", self._performance_summary())):
+                if value is not None:
+                    record[key] = value
+            print(json.dumps(record), flush=True)
 
-@click.command()
-@click.option('--username', '-u', required=True, help='GitHub username to analyze')
-@click.option('--token', '-t', help='GitHub personal access token (optional, for higher rate limits)')
-@click.option('--include-forks', '-f', is_flag=True, help='Include forked repositories')
-@click.option('--format', '-F', type=click.Choice(['table', 'rich', 'json']), default='rich', help='Output format')
-@click.option('--save', '-s', help='Save report to file')
-def main(username: str, token: str, include_forks: bool, format: str, save: str):
-    """Generate a GitHub version report for a user's repositories."""
+class GitHubVersionTracker(VersionTrackerBase):
+    """
+    Main class for tracking GitHub repository versions.
+    
+    This class provides methods to fetch repository information, releases,
+    and published packages from GitHub and package registries.
+    
+    Attributes:
+        token (Optional[str]): GitHub personal access token for authentication
+        headers (dict): HTTP headers for GitHub API requests
+        session (requests.Session): Pooled keep-alive HTTP session used for all requests
+        max_workers (int): Number of repositories processed concurrently per report
+        backend (str): API backend used for release lookups ('rest' or 'graphql')
+        response_cache (Optional[ResponseCache]): ETag/Last-Modified cache for conditional requests
+        rate_limiter (RateLimitScheduler): Scheduler pacing requests by the remaining API budget
+        state_store (Optional[RepoStateStore]): Stored per-repository results for incremental refreshes
+        registry_client (RegistryClient): Deduplicating npm/PyPI metadata cache
+        transport (TransportPolicy): Timeouts, retries and per-host circuit breakers
+        single_flight (SingleFlight): Coalescing of identical in-flight GET requests
+        profiler (Optional[PhaseProfiler]): Phase timer of the report, if profiling
+        console (Console): Rich console for formatted output
+    
+    Example:
+        >>> tracker = GitHubVersionTracker(token="your_github_token")
+        >>> repos = tracker.get_user_repos("fabriziosalmi")
+        >>> tracker.generate_report("fabriziosalmi", output_format="rich")
+    """
+    
+    def __init__(self, token: Optional[str] = None,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 session: Optional[requests.Session] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 backend: str = 'rest',
+                 response_cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True,
+                 rate_limiter: Optional[RateLimitScheduler] = None,
+                 tokens: Optional[List[str]] = None,
+                 state_store: Optional[RepoStateStore] = None,
+                 registry_client: Optional[RegistryClient] = None,
+                 release_notes_length: Optional[int] = RELEASE_NOTES_LENGTH,
+                 transport: Optional[TransportPolicy] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 profiler: Optional[PhaseProfiler] = None):
+        """
+        Initialize the GitHub Version Tracker.
+        
+        Args:
+            token: Optional GitHub personal access token for higher API rate limits.
+                   Without token: 60 requests/hour
+                   With token: 5,000 requests/hour
+            pool_connections: Number of per-host connection pools to keep.
+            pool_maxsize: Maximum keep-alive connections kept open per host.
+            max_retries: Retries on timeouts, connection errors, 5xx and
+                         registry 429 responses (ignored when transport is
+                         given).
+            session: Optional pre-configured requests.Session to share between
+                     trackers. When omitted a pooled session is created.
+            max_workers: Number of repositories processed concurrently when
+                         building a report. Use 1 for sequential processing.
+            backend: 'rest' (default) or 'graphql'. The GraphQL backend fetches
+                     latest releases and repository metadata for up to 100
+                     repositories per query and requires a token.
+            response_cache: Optional ResponseCache (or persistent
+                            SQLiteResponseCache) to share between trackers.
+                            When omitted an in-memory cache is created.
+            use_cache: If False, disables conditional requests and caching.
+            rate_limiter: Optional RateLimitScheduler to share between trackers.
+                          When omitted a scheduler is created.
+            tokens: Optional additional tokens (see load_tokens()). Requests
+                    rotate across the pool, always using the token with the
+                    most remaining quota; exhausted tokens are skipped until
+                    their reset.
+            state_store: Optional RepoStateStore enabling incremental
+                         refreshes: repositories whose pushed_at/updated_at
+                         did not change since the last run reuse their
+                         stored result instead of being queried again.
+            registry_client: Optional RegistryClient caching npm and PyPI
+                             lookups, to share between trackers. When
+                             omitted a client is created.
+            release_notes_length: Characters of release notes kept per
+                                  release (None keeps them in full). Full
+                                  notes remain available through
+                                  get_release_notes().
+            transport: Optional TransportPolicy (timeouts, jittered retries
+                       and per-host circuit breakers) to share between
+                       trackers. When omitted a policy is created.
+            single_flight: Optional SingleFlight to share between trackers:
+                           concurrent identical GET requests (same URL and
+                           credentials) share one in-flight request. When
+                           omitted one is created.
+            profiler: Optional PhaseProfiler timing the repository listing,
+                      release lookups, manifest probing, registry lookups
+                      and output rendering of reports.
+        """
+        super().__init__(token, tokens, release_notes_length)
+        self.profiler = profiler
+        
+        self.backend = self._select_backend(backend)
+        
+        self.max_workers = max(1, max_workers)
+        # Keep at least one pooled connection per worker so none are discarded
+        pool_maxsize = max(pool_maxsize, self.max_workers)
+        self.session = session or self._create_session(pool_connections, pool_maxsize)
+        self.transport = transport if transport is not None else TransportPolicy(max_retries=max_retries)
+        self.single_flight = single_flight if single_flight is not None else SingleFlight()
+        self.response_cache = None
+        if use_cache:
+            self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimitScheduler()
+        self.state_store = state_store
+        self.registry_client = registry_client if registry_client is not None else RegistryClient()
+    
+    def _create_session(self, pool_connections: int, pool_maxsize: int) -> requests.Session:
+        """
+        Create a keep-alive HTTP session with a per-host connection pool.
+        
+        Connections to api.github.com, registry.npmjs.org and pypi.org are
+        reused across calls instead of paying a TCP+TLS handshake per request.
+        Retries are left to the transport policy (see _request()).
+        
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum keep-alive connections kept open per host
+        
+        Returns:
+            Configured requests.Session
+        """
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _request(self, method: str, url: str, retry_rate_limited: bool = True, **kwargs) -> requests.Response:
+        """
+        Send a request under the transport policy.
+        
+        Applies connect/read timeouts, refuses requests to a host whose
+        circuit is open and retries idempotent requests that timed out, failed
+        to connect or got a 5xx (or 429) response after a jittered backoff.
+        Every attempt is recorded in the transport's request metrics.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            retry_rate_limited: False to return 429 responses instead of
+                                retrying them
+            **kwargs: Extra arguments forwarded to requests
+        
+        Returns:
+            requests.Response object
+        
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            requests.RequestException: If the last attempt timed out, failed
+                                       to connect or got a broken response
+        """
+        host = urlsplit(url).netloc
+        kwargs.setdefault('timeout', self.transport.timeout)
+        
+        metrics = self.transport.metrics
+        attempt = 0
+        while True:
+            self.transport.before_request(host)
+            response = None
+            error = None
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                outcome = classify_status(response.status_code)
+                # Streamed bodies are counted while they are read (see _read_body())
+                size = 0 if kwargs.get('stream') else len(getattr(response, 'content', b''))
+                metrics.record_request(url, str(response.status_code), time.perf_counter() - start, size)
+            except requests.Timeout as e:
+                error, outcome = e, 'timeout'
+            except requests.RequestException as e:
+                # Connection errors and broken responses (ChunkedEncodingError, TooManyRedirects, ...)
+                error, outcome = e, 'connection_error'
+            except BaseException:
+                self.transport.abandon_request(host)
+                raise
+            if error is not None:
+                metrics.record_request(url, outcome, time.perf_counter() - start)
+            
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            delay = self.transport.after_request(host, method, outcome, attempt, retry_after, retry_rate_limited)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session, respecting GitHub rate limits.
+        
+        GitHub API requests are paced by the rate-limit scheduler, which also
+        picks the pooled token with the most remaining quota. When every
+        token is exhausted or a secondary rate limit is hit, the request
+        pauses until it may be retried instead of failing. Timeouts, retries
+        and circuit breaking apply to every request (see _request()).
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Extra arguments forwarded to requests
+        
+        Returns:
+            requests.Response object
+        
+        Raises:
+            RateLimitExceeded: If the required pause exceeds the scheduler's max_wait
+            CircuitOpenError: If the host's circuit is open
+        """
+        if urlsplit(url).netloc != GITHUB_API_HOST:
+            return self._request(method, url, **kwargs)
+        
+        resource = resource_for_url(url)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            token_id, delay = self.rate_limiter.acquire(self.token_ids, resource)
+            if delay > 0:
+                time.sleep(delay)
+            
+            headers = self._with_token(token_id, kwargs.get('headers'))
+            response = self._request(method, url, retry_rate_limited=False, **{**kwargs, 'headers': headers})
+            
+            body = response.text if response.status_code in (403, 429) else ''
+            wait = self.rate_limiter.update(token_id, resource, response.status_code, response.headers, body)
+            if wait is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                return response
+            
+            self._message_console().print(f"[yellow]GitHub rate limit reached, pausing {wait:.0f}s...[/yellow]")
+            time.sleep(wait)
+        
+        return response
+    
+    def _get(self, url: str, body_reader: Optional[RegistryBodyReader] = None,
+             **kwargs) -> requests.Response:
+        """
+        Perform a GET request through the pooled session.
+        
+        Cached copies younger than their endpoint TTL are served without a
+        request. Older copies are revalidated conditionally
+        (If-None-Match/If-Modified-Since). A 304 Not Modified answer, which
+        does not count against the GitHub rate limit, is turned into a 200
+        response carrying the cached body, so callers never see the 304.
+        Concurrent calls for the same URL and credentials share one request
+        and its (fully read) response.
+        
+        Args:
+            url: Absolute URL to fetch
+            body_reader: Optional reader for registry documents; the body is
+                         streamed through it, only read as far as needed and
+                         replaced (and cached) by its compact form
+            **kwargs: Extra arguments forwarded to requests (headers, params, ...)
+        
+        Returns:
+            requests.Response object
+        """
+        key = request_key(url, kwargs.get('params'), kwargs.get('headers'))
+        response = self.single_flight.do(key, lambda: self._get_once(url, body_reader, **kwargs))
+        self._record_lookup(url, response.status_code)
+        return response
+    
+    def _get_once(self, url: str, body_reader: Optional[RegistryBodyReader] = None,
+                  **kwargs) -> requests.Response:
+        """Perform a GET request that is not coalesced (see _get())."""
+        if body_reader is not None:
+            kwargs['stream'] = True
+        
+        if self.response_cache is None:
+            return self._read_body(url, self._send('GET', url, **kwargs), body_reader)
+        
+        cache_key = make_cache_key(url, kwargs.get('params'), kwargs.get('headers'))
+        cached = self.response_cache.get(cache_key)
+        
+        if cached is not None:
+            if self.response_cache.is_fresh(url, cached):
+                self.response_cache.record(hit=True)
+                self.transport.metrics.record_cache_hit(url)
+                return self._response_from_cache(url, cached)
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **cached.conditional_headers()}
+        
+        response = self._read_body(url, self._send('GET', url, **kwargs), body_reader)
+        
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.record(hit=True)
+            self.transport.metrics.record_cache_hit(url)
+            self.response_cache.refresh(cache_key, cached)
+            return self._response_from_cache(url, cached, response)
+        
+        self.response_cache.record(hit=False)
+        if response.status_code == 200:
+            entry = CachedResponse.from_headers(response.content, response.headers)
+            if self.response_cache.should_store(url, entry):
+                self.response_cache.set(cache_key, entry)
+        
+        return response
+    
+    def _read_body(self, url: str, response: requests.Response,
+                   body_reader: Optional[RegistryBodyReader]) -> requests.Response:
+        """Read a streamed response through a body reader, stopping once it has what it needs."""
+        if body_reader is None:
+            return response
+        
+        if response.status_code != 200:
+            # Error bodies are short: read them in full so the connection is reused
+            self.transport.metrics.record_bytes(url, len(response.content))
+            return response
+        
+        size = 0
+        try:
+            for chunk in response.iter_content(REGISTRY_CHUNK_SIZE):
+                size += len(chunk)
+                if body_reader.feed(chunk):
+                    break
+            response._content = body_reader.body()
+        finally:
+            # Drops the connection if the rest of the document was skipped
+            response.close()
+            self.transport.metrics.record_bytes(url, size)
+        
+        return response
+    
+    def _response_from_cache(self, url: str, cached: CachedResponse,
+                             not_modified: Optional[requests.Response] = None) -> requests.Response:
+        """
+        Build a 200 response from a cached body.
+        
+        Args:
+            url: Requested URL
+            cached: Cached response for the request
+            not_modified: The 304 Not Modified response, if the entry was revalidated
+        
+        Returns:
+            requests.Response with the cached body (and the fresh 304 headers)
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response._content = cached.body
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response.url = url
+        response.encoding = 'utf-8'
+        
+        if not_modified is not None:
+            response.headers.update(not_modified.headers)
+            response.url = not_modified.url
+            response.request = not_modified.request
+        
+        return response
+    
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Perform a POST request through the pooled session.
+        
+        Args:
+            url: Absolute URL to post to
+            **kwargs: Extra arguments forwarded to requests (headers, json, ...)
+        
+        Returns:
+            requests.Response object
+        """
+        return self._send('POST', url, **kwargs)
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session, the response cache and the state store."""
+        self.session.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+        if self.state_store is not None:
+            self.state_store.close()
+    
+    def __enter__(self) -> 'GitHubVersionTracker':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def get_user_repos(self, username: str, include_forks: bool = False,
+                       repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """
+        Get all repositories for a GitHub user.
+        
+        Fetches all public repositories for the specified user. After the
+        first page, the remaining pages (known from its Link header) are
+        fetched concurrently. Repositories are sorted by last update date in
+        descending order.
+        
+        Args:
+            username: GitHub username to fetch repositories for
+            include_forks: If True, includes forked repositories. Default is False.
+            repo_filter: Optional RepoFilter dropping archived, empty or
+                         inactive repositories from the listing.
+        
+        Returns:
+            List of repository dictionaries containing repository metadata
+            from GitHub API. Returns empty list if user not found or on error.
+        
+        Example:
+            >>> tracker = GitHubVersionTracker()
+            >>> repos = tracker.get_user_repos("fabriziosalmi", include_forks=False)
+            >>> for repo in repos:
+            ...     print(f"{repo['name']}: {repo['stargazers_count']} stars")
+        """
+        url = f"https://api.github.com/users/{username}/repos"
+        return self._list_repos(url, include_forks, repo_filter)
+    
+    def get_org_repos(self, org: str, include_forks: bool = False, repo_type: Optional[str] = None,
+                      repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """
+        Get all repositories of a GitHub organization.
+        
+        Lists /orgs/{org}/repos, which (unlike the user listing) includes the
+        private and internal repositories visible to the token. GitHub applies
+        the type filter; repo_filter is applied to every page as it arrives,
+        so skipped repositories never cost a per-repository request.
+        
+        Args:
+            org: Organization login
+            include_forks: If True, includes forked repositories. Default is False.
+            repo_type: Optional type= filter, one of ORG_REPO_TYPES. Defaults
+                       to 'sources' (no forks) or 'all' with include_forks.
+            repo_filter: Optional RepoFilter dropping archived, empty or
+                         inactive repositories from the listing.
+        
+        Returns:
+            List of repository dictionaries, sorted by last update date in
+            descending order. Returns empty list if the organization is not
+            found or on error.
+        
+        Raises:
+            ValueError: If repo_type is not one of ORG_REPO_TYPES
+        
+        Example:
+            >>> tracker = GitHubVersionTracker(token="your_token")
+            >>> repos = tracker.get_org_repos("my-org", repo_filter=RepoFilter(skip_archived=True,
+            ...                                                                max_inactive_days=365))
+        """
+        url = f"https://api.github.com/orgs/{org}/repos"
+        return self._list_repos(url, include_forks, repo_filter, self._org_repo_type(include_forks, repo_type))
+    
+    def _account_repos(self, account: str, include_forks: bool = False, org: bool = False,
+                       repo_type: Optional[str] = None,
+                       repo_filter: Optional[RepoFilter] = None) -> List[Dict[str, Any]]:
+        """List the repositories of a report's user or organization."""
+        if org:
+            return self.get_org_repos(account, include_forks, repo_type, repo_filter)
+        return self.get_user_repos(account, include_forks, repo_filter)
+    
+    @profiled('repo listing')
+    def _list_repos(self, url: str, include_forks: bool, repo_filter: Optional[RepoFilter] = None,
+                    repo_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a repository listing.
+        
+        The Link header of the first page tells how many pages there are, so
+        the remaining pages are fetched concurrently and concatenated in page
+        order. Forks and repositories rejected by repo_filter are dropped per
+        page. If a page fails, the pages before it are returned.
+        
+        Args:
+            url: Repository listing URL
+            include_forks: If True, keeps forked repositories
+            repo_filter: Optional client-side RepoFilter
+            repo_type: Optional type= filter (organization listings)
+        
+        Returns:
+            List of repository dictionaries in listing order
+        """
+        first_page = self._fetch_repo_page(url, 1, include_forks, repo_filter, repo_type)
+        if first_page is None:
+            return []
+        
+        page_repos, last_page = first_page
+        repos = list(page_repos)
+        if last_page <= 1:
+            return repos
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = executor.map(lambda page: self._fetch_repo_page(url, page, include_forks, repo_filter, repo_type),
+                                 range(2, last_page + 1))
+            for result in pages:
+                if result is None:
+                    break
+                repos.extend(result[0])
+        
+        return repos
+    
+    @profiled('repo listing')
+    def _fetch_repo_page(self, url: str, page: int, include_forks: bool,
+                         repo_filter: Optional[RepoFilter] = None,
+                         repo_type: Optional[str] = None) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Fetch one page of a repository listing.
+        
+        Args:
+            url: Repository listing URL
+            page: Page number (1-based)
+            include_forks: If True, keeps forked repositories
+            repo_filter: Optional client-side RepoFilter
+            repo_type: Optional type= filter (organization listings)
+        
+        Returns:
+            Tuple of (repositories on the page, last page number), or None on error
+        """
+        try:
+            response = self._get(url, headers=self.headers, params=self._repo_page_params(page, repo_type))
+        except (RateLimitExceeded, CircuitOpenError, requests.RequestException) as e:
+            self._message_console().print(f"[red]Error fetching repositories: {e}[/red]")
+            return None
+        
+        if response.status_code != 200:
+            self._message_console().print(f"[red]Error fetching repositories: {response.status_code}[/red]")
+            return None
+        
+        page_repos = self._listing_repos(response.json(), include_forks, repo_filter)
+        return page_repos, self._last_page(response.headers.get('Link'))
+    
+    @profiled('release lookups')
+    def get_latest_release(self, repo_owner: str, repo_name: str,
+                           repo_meta: Optional[Dict[str, Any]] = None) -> Optional[ReleaseInfo]:
+        """
+        Get the latest release information for a repository.
+        
+        Fetches the most recent GitHub release and combines it with repository
+        metadata like stars, forks, and programming language.
+        
+        Args:
+            repo_owner: Repository owner's GitHub username
+            repo_name: Name of the repository
+            repo_meta: Optional repository dictionary already known to the caller
+                       (e.g. from get_user_repos()). When given, the extra
+                       /repos/{owner}/{repo} request is skipped.
+        
+        Returns:
+            ReleaseInfo object containing release details, or None if no release
+            exists or if the repository is not found.
+        
+        Example:
+            >>> tracker = GitHubVersionTracker()
+            >>> release = tracker.get_latest_release("fabriziosalmi", "versiontracker")
+            >>> if release:
+            ...     print(f"Version: {release.latest_version}")
+            ...     print(f"Downloads: {release.download_count}")
+        """
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        
+        response = self._get(url, headers=self.headers)
+        
+        if response.status_code != 200:
+            return None
+        
+        release_data = response.json()
+        
+        # Get repository info, unless the caller already has it
+        if repo_meta is not None:
+            repo_info = repo_meta
+        else:
+            repo_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+            repo_response = self._get(repo_url, headers=self.headers)
+            repo_info = repo_response.json() if repo_response.status_code == 200 else {}
+        
+        return self._build_release_info(repo_owner, repo_name, release_data, repo_info)
+    
+    def get_release_notes(self, repo_owner: str, repo_name: str) -> Optional[str]:
+        """
+        Get the full notes of a repository's latest release.
+        
+        Reports keep only the start of long release notes
+        (ReleaseInfo.notes_truncated); this loads them in full on demand.
+        
+        Args:
+            repo_owner: Repository owner's GitHub username
+            repo_name: Name of the repository
+        
+        Returns:
+            Release notes (markdown), or None if the repository has no release
+        
+        Example:
+            >>> if release.notes_truncated:
+            ...     print(tracker.get_release_notes("fabriziosalmi", "versiontracker"))
+        """
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+        
+        response = self._get(url, headers=self.headers)
+        
+        if response.status_code != 200:
+            return None
+        
+        return response.json().get('body') or ''
+    
+    @profiled('release lookups')
+    def get_latest_releases(self, repos: List[Dict[str, Any]]) -> Dict[str, Optional[ReleaseInfo]]:
+        """
+        Get latest releases for many repositories using batched GraphQL queries.
+        
+        Fetches the latest release together with stars, forks and language for
+        up to GRAPHQL_BATCH_SIZE repositories per query, replacing two REST
+        calls per repository with one call per batch. Requires a token.
+        
+        Args:
+            repos: Repository dictionaries as returned by get_user_repos()
+        
+        Returns:
+            Dictionary mapping "owner/name" to ReleaseInfo (or None when the
+            repository has no release). Repositories from batches that failed
+            are omitted so callers can fall back to get_latest_release().
+        
+        Example:
+            >>> tracker = GitHubVersionTracker(token="your_token", backend="graphql")
+            >>> releases = tracker.get_latest_releases(tracker.get_user_repos("fabriziosalmi"))
+        """
+        repo_names = [(repo['owner']['login'], repo['name']) for repo in repos]
+        releases = {}
+        
+        for start in range(0, len(repo_names), GRAPHQL_BATCH_SIZE):
+            batch = repo_names[start:start + GRAPHQL_BATCH_SIZE]
+            query, variables = self._build_graphql_release_query(batch)
+            
+            response = self._post(GRAPHQL_URL, headers=self.headers, json={'query': query, 'variables': variables})
+            
+            if response.status_code != 200:
+                self._message_console().print(f"[yellow]GraphQL batch failed ({response.status_code}), using REST fallback.[/yellow]")
+                continue
+            
+            data = response.json().get('data') or {}
+            
+            for index, (repo_owner, repo_name) in enumerate(batch):
+                node = data.get(f"r{index}")
+                if node is None:
+                    # Repository not accessible, let REST handle it
+                    continue
+                releases[f"{repo_owner}/{repo_name}"] = self._graphql_release_info(repo_owner, repo_name, node)
+        
+        return releases
+    
+    @profiled('manifest probing')
+    def get_packages(self, repo_owner: str, repo_name: str,
+                     repo_meta: Optional[Dict[str, Any]] = None,
+                     root_files: Optional[Iterable[str]] = None) -> List[PackageInfo]:
+        """
+        Get published packages for a repository.
+        
+        Detects and fetches information about packages published from this
+        repository to package registries (npm, PyPI, etc.). The repository
+        root is listed with a single git tree request and only the manifests
+        present in it are fetched.
+        
+        Args:
+            repo_owner: Repository owner's GitHub username
+            repo_name: Name of the repository
+            repo_meta: Optional repository dictionary from get_user_repos();
+                       its default_branch is used for the tree request.
+            root_files: Optional file names in the repository root, if
+                        already known. Skips the tree request.
+        
+        Returns:
+            List of PackageInfo objects for detected packages. Returns empty
+            list if no packages are found or on error.
+        
+        Note:
+            Currently supports:
+            - npm packages (via package.json)
+            - Python packages (via setup.py, pyproject.toml, setup.cfg)
+        
+        Example:
+            >>> tracker = GitHubVersionTracker()
+            >>> packages = tracker.get_packages("fabriziosalmi", "versiontracker")
+            >>> for pkg in packages:
+            ...     print(f"{pkg.package_type}: {pkg.latest_version}")
+        """
+        packages = []
+        
+        if root_files is None:
+            tree_response = self._get(self._tree_url(repo_owner, repo_name, repo_meta), headers=self.headers)
+            tree = tree_response.json() if tree_response.status_code == 200 else None
+            manifests = self._manifest_files(self._root_files(tree_response.status_code, tree))
+        else:
+            manifests = self._manifest_files(set(root_files))
+        
+        # Check for npm packages
+        npm_response = None
+        if 'package.json' in manifests:
+            npm_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/package.json"
+            npm_response = self._get(npm_url, headers=self.headers)
+        
+        if npm_response is not None and npm_response.status_code == 200:
+            try:
+                # Get package name from package.json
+                content = self._decode_content(npm_response.json())
+                package_name = self._extract_package_name('package.json', content)
+                
+                if package_name:
+                    # Try to get npm package info
+                    npm_data = self._registry_lookup('npm', package_name)
+                    
+                    if npm_data is not None:
+                        packages.append(self._npm_package_info(repo_owner, repo_name, package_name, npm_data))
+            except Exception:
+                pass
+        
+        # Check for Python packages (setup.py, pyproject.toml, setup.cfg)
+        python_manifests = [file for file in PYTHON_MANIFEST_FILES if file in manifests]
+        for file in python_manifests:
+            py_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file}"
+            py_response = self._get(py_url, headers=self.headers)
+            
+            if py_response.status_code == 200:
+                try:
+                    # Try to get package name from the file
+                    content = self._decode_content(py_response.json())
+                    package_name = self._extract_package_name(file, content)
+                    pypi_data = None
+                    
+                    if package_name:
+                        # Try to get PyPI package info
+                        pypi_data = self._registry_lookup('pypi', package_name)
+                    
+                    packages.append(self._python_package_info(repo_owner, repo_name, package_name, pypi_data))
+                except Exception:
+                    # Fallback on any error
+                    packages.append(self._python_package_info(repo_owner, repo_name))
+                break
+        
+        return packages
+    
+    @profiled('registry lookups')
+    def _registry_lookup(self, ecosystem: str, package_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up package metadata through the deduplicating registry client.
+        
+        Args:
+            ecosystem: 'npm' or 'pypi'
+            package_name: Name of the package in the registry
+        
+        Returns:
+            Package metadata, or None if the package is unknown or unavailable
+        """
+        def fetch(url: str) -> Tuple[int, Any]:
+            response = self._get(url, body_reader=RegistryBodyReader(ecosystem))
+            return response.status_code, response.json() if response.status_code == 200 else None
+        
+        try:
+            metadata = self.registry_client.lookup(ecosystem, package_name, fetch)
+        except Exception:
+            # Timeouts and open circuits are swallowed by get_packages(): not a missing package
+            self._mark_incomplete(self.registry_client.url_for(ecosystem, package_name))
+            raise
+        
+        self._check_registry_answer(ecosystem, package_name, metadata)
+        return metadata
     
-    # Load token from environment if not provided
-    if not token:
-        token = os.getenv('GITHUB_TOKEN')
+    @profiled('registry lookups')
+    def fill_package_downloads(self, packages: List[PackageInfo]) -> None:
+        """
+        Fill in the download counts of packages in one batched pass.
+        
+        npm counts are requested in bulk (up to 128 packages per request);
+        scoped npm packages and PyPI packages are requested one at a time,
+        concurrently. Packages whose count cannot be fetched keep 0.
+        
+        Args:
+            packages: Packages to update in place, e.g. from collect_report_data()
+        
+        Example:
+            >>> releases, packages = tracker.collect_report_data(repos)
+            >>> sum(p.downloads for p in packages)
+        """
+        targets = self._download_targets(packages)
+        published = [target for target in targets if target is not None]
+        if not published:
+            return
+        
+        def fetch(url: str) -> Tuple[int, Any]:
+            try:
+                response = self._get(url)
+            except (requests.RequestException, CircuitOpenError):
+                return 0, None
+            return response.status_code, response.json() if response.status_code == 200 else None
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            counts = self.registry_client.download_counts(published, fetch, executor.map)
+        
+        self._apply_downloads(packages, targets, counts)
     
-    tracker = GitHubVersionTracker(token)
+    def _fill_report_downloads(self, packages: List[PackageInfo]) -> None:
+        """Fetch package download counts once every repository of a report is processed."""
+        self.fill_package_downloads(packages)
     
+    def process_repo(self, repo: Dict[str, Any],
+                     prefetched_releases: Optional[Dict[str, Optional[ReleaseInfo]]] = None
+                     ) -> Tuple[Optional[ReleaseInfo], List[PackageInfo]]:
+        """
+        Get the latest release and published packages for a single repository.
+        
+        Errors are isolated to the repository: any exception is reported and
+        an empty result is returned so the rest of the report is unaffected.
+        Results whose GitHub answers were all definitive (200, 304 or 404)
+        are saved to the state store, if one is set.
+        
+        Args:
+            repo: Repository dictionary as returned by get_user_repos()
+            prefetched_releases: Optional releases from get_latest_releases();
+                                 the REST lookup is skipped for repositories
+                                 found in it.
+        
+        Returns:
+            Tuple of (ReleaseInfo or None, list of PackageInfo)
+        """
+        repo_owner = repo['owner']['login']
+        repo_name = repo['name']
+        full_name = f"{repo_owner}/{repo_name}"
+        
+        try:
+            with self._tracking_lookups() as incomplete:
+                if prefetched_releases and full_name in prefetched_releases:
+                    release = prefetched_releases[full_name]
+                else:
+                    # The listing payload already carries stars, forks and language
+                    release = self.get_latest_release(repo_owner, repo_name, repo_meta=repo)
+                packages = self.get_packages(repo_owner, repo_name, repo_meta=repo)
+        except Exception as e:
+            self._message_console().print(f"[yellow]Skipping {repo_owner}/{repo_name}: {e}[/yellow]")
+            return None, []
+        
+        if self.state_store is not None and not incomplete:
+            self.state_store.save(repo, self._state_record(release, packages))
+        
+        return release, packages
+    
+    def process_repos(self, repos: List[Dict[str, Any]]) -> List[Tuple[Optional[ReleaseInfo], List[PackageInfo]]]:
+        """
+        Process repositories concurrently with a bounded thread pool.
+        
+        Up to max_workers repositories are queried in parallel. Results are
+        returned in the same order as the input, so reports stay deterministic.
+        With the GraphQL backend, releases are prefetched in batches first.
+        
+        Args:
+            repos: Repository dictionaries as returned by get_user_repos()
+        
+        Returns:
+            List of (ReleaseInfo or None, list of PackageInfo) tuples, one per
+            repository and in input order.
+        
+        Example:
+            >>> tracker = GitHubVersionTracker(max_workers=16)
+            >>> repos = tracker.get_user_repos("fabriziosalmi")
+            >>> for repo, (release, packages) in zip(repos, tracker.process_repos(repos)):
+            ...     print(repo['name'], release.latest_version if release else '-')
+        """
+        return [(result.release, result.packages) for result in self.iter_process_repos(repos, ordered=True)]
+    
+    def iter_process_repos(self, repos: List[Dict[str, Any]], ordered: bool = False) -> Iterator[RepoResult]:
+        """
+        Process repositories concurrently, yielding each result as it is ready.
+        
+        With a state store, repositories unchanged since the last run reuse
+        their stored result and only the changed ones are queried.
+        
+        Args:
+            repos: Repository dictionaries as returned by get_user_repos()
+            ordered: If True, results are yielded in input order (each one as
+                     soon as it and all earlier ones are done); otherwise in
+                     completion order.
+        
+        Yields:
+            RepoResult for every repository
+        """
+        stored = {}
+        if self.state_store is not None:
+            for index, repo in enumerate(repos):
+                record = self.state_store.lookup(repo)
+                if record is not None:
+                    stored[index] = record
+        
+        prefetched_releases = None
+        changed = [repo for index, repo in enumerate(repos) if index not in stored]
+        if self.backend == 'graphql' and changed:
+            prefetched_releases = self.get_latest_releases(changed)
+        
+        def process(item: Tuple[int, Dict[str, Any]]) -> RepoResult:
+            index, repo = item
+            if index in stored:
+                release, packages = self._result_from_state(repo, stored[index])
+            else:
+                release, packages = self.process_repo(repo, prefetched_releases)
+            return self._repo_result(index, repo, release, packages)
+        
+        if self.max_workers == 1 or len(repos) <= 1:
+            for item in enumerate(repos):
+                yield process(item)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repos))) as executor:
+            if ordered:
+                yield from executor.map(process, enumerate(repos))
+            else:
+                # No list of futures is kept, so yielded results can be freed
+                for future in as_completed(executor.submit(process, item) for item in enumerate(repos)):
+                    yield future.result()
+    
+    def iter_repo_results(self, username: str, include_forks: bool = False,
+                          ordered: bool = False, org: bool = False, repo_type: Optional[str] = None,
+                          repo_filter: Optional[RepoFilter] = None) -> Iterator[RepoResult]:
+        """
+        Stream the release and packages of every repository of a user or organization.
+        
+        Repositories are listed first, then processed concurrently; each
+        result is yielded as soon as it is ready, so callers can render or
+        store it without waiting for the whole report.
+        
+        Args:
+            username: GitHub username (or organization, with org=True) to analyze
+            include_forks: If True, includes forked repositories. Default is False.
+            ordered: If True, yields results in listing order instead of
+                     completion order.
+            org: If True, lists the repositories of the organization username
+                 (see get_org_repos()).
+            repo_type: Optional type= filter of organization listings.
+            repo_filter: Optional RepoFilter skipping archived, empty or
+                         inactive repositories before they are processed.
+        
+        Yields:
+            RepoResult for every repository
+        
+        Example:
+            >>> tracker = GitHubVersionTracker(token="your_token")
+            >>> for result in tracker.iter_repo_results("fabriziosalmi"):
+            ...     if result.release:
+            ...         print(result.repo_name, result.release.latest_version)
+        """
+        repos = self._account_repos(username, include_forks, org, repo_type, repo_filter)
+        yield from self.iter_process_repos(repos, ordered=ordered)
+    
+    def collect_report_data(self, repos: List[Dict[str, Any]]) -> Tuple[List[ReleaseInfo], List[PackageInfo]]:
+        """
+        Collect releases and packages for a list of repositories.
+        
+        Args:
+            repos: Repository dictionaries as returned by get_user_repos()
+        
+        Returns:
+            Tuple of (releases, packages) in repository order, with package
+            download counts filled in
+        """
+        releases, packages = self._collect_results(self.iter_process_repos(repos, ordered=True))
+        self.fill_package_downloads(packages)
+        return releases, packages
+    
+    def generate_report(self, username: str, include_forks: bool = False, output_format: str = 'table',
+                        org: bool = False, repo_type: Optional[str] = None,
+                        repo_filter: Optional[RepoFilter] = None) -> None:
+        """
+        Generate and display a comprehensive version report.
+        
+        Fetches all repositories for the user, gets release information,
+        detects published packages, and displays a formatted report.
+        
+        Args:
+            username: GitHub username (or organization, with org=True) to analyze
+            include_forks: If True, includes forked repositories. Default is False.
+            output_format: Output format - 'rich' (colored tables), 'table' (plain text),
+                          'json' (machine-readable) or 'ndjson' (one JSON line per
+                          release and package, then a summary line; streamed in
+                          completion order). Default is 'table'.
+            org: If True, lists the repositories of the organization username
+                 (see get_org_repos()).
+            repo_type: Optional type= filter of organization listings.
+            repo_filter: Optional RepoFilter skipping archived, empty or
+                         inactive repositories before they are processed.
+        
+        Note:
+            - This method outputs directly to console or file, doesn't return data
+            - For programmatic access, use iter_repo_results(), get_user_repos()
+              with collect_report_data(), or get_latest_release() and
+              get_packages() methods directly
+            - Repositories are processed concurrently (see max_workers) and
+              JSON and NDJSON output is written as results arrive
+            - Progress messages of NDJSON reports go to stderr; errors go to
+              the tracker's console (set tracker.console = PlainConsole(sys.stderr)
+              to keep stdout pure NDJSON)
+        
+        Example:
+            >>> tracker = GitHubVersionTracker(token="your_token")
+            >>> tracker.generate_report("fabriziosalmi", output_format="rich")
+        """
+        console = self._report_console(output_format)
+        console.print(f"[bold blue]Fetching repositories for {username}...[/bold blue]")
+        
+        repos = self._account_repos(username, include_forks, org, repo_type, repo_filter)
+        
+        if not repos:
+            console.print("[red]No repositories found or error occurred.[/red]")
+            return
+        
+        console.print(f"[green]Found {len(repos)} repositories. Checking for releases...[/green]")
+        
+        # Display results as they are processed; NDJSON lines are written in
+        # completion order, so no finished result waits for a slower one
+        results = self.iter_process_repos(repos, ordered=output_format != 'ndjson')
+        self._render_report(results, username, output_format, total=len(repos))
+
+def _run_report(tracker: GitHubVersionTracker, username: str, include_forks: bool, format: str, save: str,
+                **listing) -> None:
+    """
+    Generate the report with an open tracker, optionally saving it to a file.
+    
+    listing holds the org, repo_type and repo_filter arguments of generate_report().
+    """
     if save:
         # Redirect output to file
         import sys
@@ -571,30 +2207,99 @@ def main(username: str, token: str, include_forks: bool, format: str, save: str)
             if format == 'rich':
                 # For rich format, we'll use table format when saving to file
                 sys.stdout = f
-                repos = tracker.get_user_repos(username, include_forks)
-                releases = []
-                packages = []
-                
-                for repo in repos:
-                    repo_owner = repo['owner']['login']
-                    repo_name = repo['name']
-                    
-                    release = tracker.get_latest_release(repo_owner, repo_name)
-                    if release:
-                        releases.append(release)
-                    
-                    repo_packages = tracker.get_packages(repo_owner, repo_name)
-                    packages.extend(repo_packages)
+                repos = tracker._account_repos(username, include_forks, **listing)
+                releases, packages = tracker.collect_report_data(repos)
                 
                 tracker._display_table_report(releases, packages)
             else:
                 sys.stdout = f
-                tracker.generate_report(username, include_forks, format)
+                tracker.generate_report(username, include_forks, format, **listing)
         
         sys.stdout = original_stdout
         print(f"Report saved to {save}")
     else:
-        tracker.generate_report(username, include_forks, format)
+        tracker.generate_report(username, include_forks, format, **listing)
+
+@click.command()
+@click.option('--username', '-u', help='GitHub username to analyze')
+@click.option('--org', '-o', help='GitHub organization to analyze (includes private and internal '
+              'repositories visible to the token)')
+@click.option('--repo-type', type=click.Choice(ORG_REPO_TYPES),
+              help='Organization repositories to list (default: sources, or all with --include-forks)')
+@click.option('--skip-archived', is_flag=True, help='Skip archived and disabled repositories')
+@click.option('--skip-empty', is_flag=True, help='Skip empty repositories')
+@click.option('--max-inactive-days', type=click.IntRange(min=0),
+              help='Skip repositories not pushed to in this many days')
+@click.option('--token', '-t', help='GitHub personal access token (optional, for higher rate limits)')
+@click.option('--token-file', type=click.Path(exists=True, dir_okay=False),
+              help='File with one GitHub token per line, rotated by remaining rate limit')
+@click.option('--include-forks', '-f', is_flag=True, help='Include forked repositories')
+@click.option('--format', '-F', type=click.Choice(OUTPUT_FORMATS), default='rich',
+              help='Output format (ndjson: one JSON line per release and package, then a summary line)')
+@click.option('--save', '-s', help='Save report to file')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True,
+              help='Number of repositories processed in parallel')
+@click.option('--backend', type=click.Choice(['rest', 'graphql']), default='rest', show_default=True,
+              help='API backend for release lookups (graphql batches 100 repos per query, needs a token)')
+@click.option('--cache-dir', type=click.Path(file_okay=False), envvar='VERSION_TRACKER_CACHE_DIR',
+              default=DEFAULT_CACHE_DIR, show_default=True, help='Directory of the persistent response cache')
+@click.option('--no-cache', is_flag=True, help='Disable the response cache (always fetch fresh data)')
+@click.option('--incremental', is_flag=True,
+              help='Only re-query repositories whose pushed_at/updated_at changed since the last run')
+@click.option('--full-notes', is_flag=True,
+              help=f'Keep release notes in full instead of their first {RELEASE_NOTES_LENGTH} characters')
+@click.option('--profile', is_flag=True,
+              help='Print wall/CPU time per phase and peak memory to stderr after the report')
+@click.option('--profile-output', type=click.Path(dir_okay=False),
+              help='Also write a cProfile call profile (pstats format) to this file; implies --profile')
+def main(username: str, org: str, repo_type: str, skip_archived: bool, skip_empty: bool,
+         max_inactive_days: Optional[int], token: str, token_file: str, include_forks: bool, format: str,
+         save: str, jobs: int, backend: str, cache_dir: str, no_cache: bool, incremental: bool,
+         full_notes: bool, profile: bool, profile_output: str):
+    """Generate a GitHub version report for a user's or an organization's repositories."""
+    
+    if bool(username) == bool(org):
+        raise click.UsageError("Pass exactly one of --username and --org.")
+    if repo_type and not org:
+        raise click.UsageError("--repo-type only applies to --org.")
+    
+    # Skipped repositories are dropped from each listing page, before any per-repository request
+    repo_filter = None
+    if skip_archived or skip_empty or max_inactive_days is not None:
+        repo_filter = RepoFilter(skip_archived, skip_empty, max_inactive_days)
+    listing = {'org': bool(org), 'repo_type': repo_type, 'repo_filter': repo_filter}
+    
+    # Phase timings go to stderr, so JSON reports on stdout stay parseable
+    profiler = PhaseProfiler(profile_calls=bool(profile_output)) if profile or profile_output else None
+    if profiler is not None:
+        profiler.start()
+    
+    # Pool the given token, the token file and GITHUB_TOKENS/GITHUB_TOKEN
+    tokens = load_tokens(token, token_file)
+    
+    # Persistent cache so repeated (e.g. cron-driven) runs start warm
+    response_cache = None if no_cache else SQLiteResponseCache(cache_dir)
+    
+    # Per-repository results of the last run, kept next to the response cache
+    state_store = RepoStateStore(cache_dir) if incremental else None
+    
+    with GitHubVersionTracker(max_workers=jobs, backend=backend, response_cache=response_cache,
+                              use_cache=not no_cache, tokens=tokens, state_store=state_store,
+                              release_notes_length=None if full_notes else RELEASE_NOTES_LENGTH,
+                              profiler=profiler) as tracker:
+        if format == 'ndjson':
+            # Keep stdout pure NDJSON: messages and errors go to stderr
+            tracker.console = PlainConsole(sys.stderr)
+        try:
+            _run_report(tracker, username or org, include_forks, format, save, **listing)
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                click.echo(profiler.format_report(), err=True)
+                if profile_output:
+                    profiler.dump_stats(profile_output)
+                    click.echo(f"Call profile written to {profile_output} "
+                               f"(view with: python -m pstats {profile_output})", err=True)
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,7 @@ Modern Web Interface for GitHub Version Tracker
 A sleek, minimalist web app to showcase your published software and stats.
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -15,8 +15,14 @@ import re
 import bleach
 import logging
 from datetime import datetime, timedelta
-from version_tracker import GitHubVersionTracker
-from typing import Dict, List, Any
+from version_tracker import GitHubVersionTracker, ReleaseInfo, PackageInfo, truncate_release_notes
+from response_cache import SQLiteResponseCache, DEFAULT_CACHE_DIR, DEFAULT_TTLS
+from rate_limiter import RateLimitScheduler, load_tokens
+from repo_state import RepoStateStore
+from registry_client import RegistryClient
+from transport import TransportPolicy
+from single_flight import SingleFlight
+from typing import Dict, List, Any, Optional
 import threading
 import time
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -142,8 +148,133 @@ cache = {
     'username': None
 }
 
-def get_github_stats(username: str, token: str = None) -> Dict[str, Any]:
-    """Get comprehensive GitHub statistics."""
+# Longest pause for GitHub rate limits inside a web request (seconds)
+RATE_LIMIT_MAX_WAIT = 30
+
+# Forced refreshes revalidate every cached response (unchanged ones come back
+# as 304 and cost no rate limit) instead of serving it while fresh
+REFRESH_TTLS = {category: 0 for category in DEFAULT_TTLS}
+
+# Shared trackers, one pooled keep-alive HTTP session per token
+_trackers: Dict[str, GitHubVersionTracker] = {}
+_trackers_lock = threading.Lock()
+
+# npm/PyPI metadata cache shared by all trackers
+_registry_client = RegistryClient()
+
+# Tighter timeouts and retries inside a web request
+WEB_READ_TIMEOUT = 10  # Seconds without receiving data before giving up
+WEB_MAX_RETRIES = 2  # Retries of a failed idempotent request
+
+# Timeouts, retries, per-host circuit breakers and request metrics shared by all
+# trackers (the "performance" section covers every request since startup)
+_transport = TransportPolicy(read_timeout=WEB_READ_TIMEOUT, max_retries=WEB_MAX_RETRIES)
+
+# Visitors asking for the same profile at once share its in-flight requests
+_single_flight = SingleFlight()
+
+def get_tracker(token: str = None) -> GitHubVersionTracker:
+    """
+    Return the shared tracker for a token so connections are reused across requests.
+    
+    Responses are cached on disk (VERSION_TRACKER_CACHE_DIR, or the default
+    cache directory) so the app starts warm after a restart. Refreshes are
+    incremental: only repositories pushed or updated since the last refresh
+    are queried again. Tokens listed in GITHUB_TOKENS are pooled with the
+    given token. Registry lookups are cached, and host circuit breakers and
+    in-flight requests shared, across all trackers.
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(token)
+        if tracker is None:
+            cache_dir = os.getenv('VERSION_TRACKER_CACHE_DIR', DEFAULT_CACHE_DIR)
+            tracker = GitHubVersionTracker(
+                response_cache=SQLiteResponseCache(cache_dir),
+                rate_limiter=RateLimitScheduler(max_wait=RATE_LIMIT_MAX_WAIT),
+                tokens=load_tokens(token),
+                state_store=RepoStateStore(cache_dir),
+                registry_client=_registry_client,
+                transport=_transport,
+                single_flight=_single_flight
+            )
+            _trackers[token] = tracker
+        return tracker
+
+def refresh_tracker(token: str = None) -> GitHubVersionTracker:
+    """
+    Return a new tracker for a forced refresh; close it when done.
+    
+    It shares the on-disk caches of get_tracker() but bypasses their reuse:
+    every cached response is revalidated with its ETag, stored
+    per-repository results are replaced rather than reused (max_age=0), and
+    registry metadata is looked up again by a registry client of its own.
+    """
+    cache_dir = os.getenv('VERSION_TRACKER_CACHE_DIR', DEFAULT_CACHE_DIR)
+    return GitHubVersionTracker(
+        response_cache=SQLiteResponseCache(cache_dir, ttls=REFRESH_TTLS),
+        rate_limiter=RateLimitScheduler(max_wait=RATE_LIMIT_MAX_WAIT),
+        tokens=load_tokens(token),
+        state_store=RepoStateStore(cache_dir, max_age=0),
+        registry_client=RegistryClient(),
+        transport=_transport
+    )
+
+def release_to_dict(release: ReleaseInfo) -> Dict[str, Any]:
+    """Convert a release to its API representation with sanitized HTML notes."""
+    # Convert markdown description to HTML with safe settings
+    md = markdown.Markdown(
+        extensions=['nl2br', 'fenced_code', 'codehilite'],
+        extension_configs={
+            'codehilite': {
+                'css_class': 'highlight'
+            }
+        }
+    )
+    
+    if release.description and release.description != "No description":
+        # Truncate if too long but preserve markdown structure (notes may
+        # already have been shortened when the release was fetched)
+        description, truncated = truncate_release_notes(release.description)
+        if truncated or release.notes_truncated:
+            description += "\n\n*[Truncated - see full release notes]*"
+        
+        html_description = md.convert(description)
+        # Sanitize HTML to prevent XSS
+        html_description = sanitize_html_content(html_description)
+    else:
+        html_description = "<em>No description available</em>"
+    
+    return {
+        'repo_name': release.repo_name,
+        'latest_version': release.latest_version,
+        'release_date': release.release_date,
+        'release_url': release.release_url,
+        'download_count': release.download_count,
+        'is_prerelease': release.is_prerelease,
+        'description': html_description,
+        'language': release.language,
+        'stars': release.stars,
+        'forks': release.forks
+    }
+
+def package_to_dict(pkg: PackageInfo) -> Dict[str, Any]:
+    """Convert a package to its API representation."""
+    return {
+        'repo_name': pkg.repo_name,
+        'package_type': pkg.package_type,
+        'latest_version': pkg.latest_version,
+        'package_url': pkg.package_url,
+        'downloads': pkg.downloads
+    }
+
+def get_github_stats(username: str, token: str = None,
+                     tracker: Optional[GitHubVersionTracker] = None) -> Dict[str, Any]:
+    """
+    Get comprehensive GitHub statistics.
+    
+    Uses the shared tracker of the token unless a tracker is given (e.g. a
+    refresh_tracker()).
+    """
     if not validate_username(username):
         log_security_event("INVALID_USERNAME", f"Invalid username attempted: {username}")
         raise ValueError("Invalid GitHub username format")
@@ -151,79 +282,29 @@ def get_github_stats(username: str, token: str = None) -> Dict[str, Any]:
     logger.info(f"Fetching GitHub stats for user: {username}")
     
     try:
-        tracker = GitHubVersionTracker(token)
-        
-        # Get repositories
-        repos = tracker.get_user_repos(username, include_forks=False)
+        if tracker is None:
+            tracker = get_tracker(token)
         
         releases = []
         packages = []
         languages = {}
-        total_commits = 0
+        total_repositories = 0
         
-        for repo in repos:
-            repo_owner = repo['owner']['login']
-            repo_name = repo['name']
-            
-            # Get latest release
-            release = tracker.get_latest_release(repo_owner, repo_name)
-            if release:
-                # Convert markdown description to HTML with safe settings
-                md = markdown.Markdown(
-                    extensions=['nl2br', 'fenced_code', 'codehilite'],
-                    extension_configs={
-                        'codehilite': {
-                            'css_class': 'highlight'
-                        }
-                    }
-                )
-                
-                if release.description and release.description != "No description":
-                    # Truncate if too long but preserve markdown structure
-                    description = release.description
-                    if len(description) > 1000:
-                        # Find a good breaking point
-                        truncated = description[:1000]
-                        last_newline = truncated.rfind('\n')
-                        if last_newline > 800:  # If there's a reasonable break point
-                            description = truncated[:last_newline] + "\n\n*[Truncated - see full release notes]*"
-                        else:
-                            description = truncated + "...\n\n*[Truncated - see full release notes]*"
-                    
-                    html_description = md.convert(description)
-                    # Sanitize HTML to prevent XSS
-                    html_description = sanitize_html_content(html_description)
-                else:
-                    html_description = "<em>No description available</em>"
-                
-                releases.append({
-                    'repo_name': release.repo_name,
-                    'latest_version': release.latest_version,
-                    'release_date': release.release_date,
-                    'release_url': release.release_url,
-                    'download_count': release.download_count,
-                    'is_prerelease': release.is_prerelease,
-                    'description': html_description,
-                    'language': release.language,
-                    'stars': release.stars,
-                    'forks': release.forks
-                })
+        # Consume per-repository results as they complete
+        for result in tracker.iter_repo_results(username, include_forks=False):
+            total_repositories += 1
+            if result.release:
+                releases.append(release_to_dict(result.release))
             
-            # Get packages
-            repo_packages = tracker.get_packages(repo_owner, repo_name)
-            for pkg in repo_packages:
-                packages.append({
-                    'repo_name': pkg.repo_name,
-                    'package_type': pkg.package_type,
-                    'latest_version': pkg.latest_version,
-                    'package_url': pkg.package_url,
-                    'downloads': pkg.downloads
-                })
+            packages.extend(result.packages)
             
             # Count languages
-            if repo.get('language'):
-                lang = repo['language']
-                languages[lang] = languages.get(lang, 0) + 1
+            if result.language:
+                languages[result.language] = languages.get(result.language, 0) + 1
+        
+        # Download counts of all packages in one batched pass
+        tracker.fill_package_downloads(packages)
+        packages = [package_to_dict(pkg) for pkg in packages]
         
         # Sort all releases by date (most recent first) for better display
         releases.sort(key=lambda x: x['release_date'], reverse=True)
@@ -249,10 +330,11 @@ def get_github_stats(username: str, token: str = None) -> Dict[str, Any]:
             'username': username,
             'generated_at': datetime.now().isoformat(),
             'summary': {
-                'total_repositories': len(repos),
+                'total_repositories': total_repositories,
                 'total_releases': len(releases),
                 'total_packages': len(packages),
                 'total_downloads': total_downloads,
+                'total_package_downloads': sum(p['downloads'] for p in packages),
                 'total_stars': total_stars,
                 'total_forks': total_forks,
                 'recent_releases': len(recent_releases),
@@ -262,7 +344,10 @@ def get_github_stats(username: str, token: str = None) -> Dict[str, Any]:
             'packages': packages,
             'languages': top_languages,
             'categories': categories,
-            'recent_activity': recent_releases[:10]  # Last 10 recent releases
+            'recent_activity': recent_releases[:10],  # Last 10 recent releases
+            'rate_limit': tracker._rate_limit_summary(),
+            'transport': tracker._transport_summary(),
+            'performance': tracker._performance_summary()
         }
     
     except Exception as e:
@@ -390,6 +475,48 @@ def api_stats(username):
     }
     return jsonify(response_data)
 
+@app.route('/api/stats/<username>/stream')
+@limiter.limit("30 per minute")  # Rate limiting
+def api_stats_stream(username):
+    """
+    Stream per-repository results as newline-delimited JSON while they are fetched.
+    
+    Package download counts are fetched in one batched pass at the end and
+    sent as a final line with every package.
+    """
+    token = os.getenv('GITHUB_TOKEN')
+    
+    # Validate username format
+    if not validate_username(username):
+        log_security_event("INVALID_USERNAME", f"Invalid username attempted in stream: {username}")
+        return jsonify({'error': 'Invalid username format'}), 400
+    
+    tracker = get_tracker(token)
+    
+    def generate():
+        try:
+            packages = []
+            for result in tracker.iter_repo_results(username, include_forks=False):
+                packages.extend(result.packages)
+                yield json.dumps({
+                    'repo_name': result.repo_name,
+                    'language': result.language,
+                    'release': release_to_dict(result.release) if result.release else None,
+                    'packages': [package_to_dict(pkg) for pkg in result.packages]
+                }) + '\n'
+            tracker.fill_package_downloads(packages)
+            yield json.dumps({'packages': [package_to_dict(pkg) for pkg in packages]}) + '\n'
+            yield json.dumps({
+                'rate_limit': tracker._rate_limit_summary(),
+                'transport': tracker._transport_summary(),
+                'performance': tracker._performance_summary()
+            }) + '\n'
+        except Exception as e:
+            logger.error(f"Error streaming stats for {username}: {e}")
+            yield json.dumps({'error': 'Unable to fetch data'}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/refresh/<username>')
 @limiter.limit("5 per minute")  # Stricter rate limiting for refresh
 def api_refresh(username):
@@ -402,7 +529,9 @@ def api_refresh(username):
         return jsonify({'error': 'Invalid username format'}), 400
     
     try:
-        data = get_github_stats(username, token)
+        # Bypass the response cache TTLs, stored results and registry cache
+        with refresh_tracker(token) as tracker:
+            data = get_github_stats(username, token, tracker)
         cache['data'] = data
         cache['last_updated'] = datetime.now()
         cache['username'] = username